@@ -3,6 +3,9 @@
 Streamlink Downloader - Aero Edition (Complete Modular)
 Application entry point with all modular UI tabs
 """
+import time
+_STARTED = time.perf_counter()  # startup report measures imports from here
+
 import tkinter as tk
 from tkinter import ttk
 
@@ -11,6 +14,7 @@ from aero_style import AeroStyle
 
 from ui.ui_base import BaseUI
 from ui.ui_main_tab import MainTab
+from ui.ui_dashboard_tab import DashboardTab
 from ui.ui_log_tab import LogTab
 from ui.ui_csv_tools_tab import CSVToolsTab
 from ui.ui_settings_tab import SettingsTab
@@ -20,27 +24,49 @@ from downloader import DownloaderCore
 from csv_tools import CSVTools
 from video_tools import VideoTools
 from logger import Logger
+from profiler import SamplingProfiler, PhaseTimer
+from job_runner import JobRunner
+from fleet_metrics import FleetMetrics
 
 class StreamlinkDownloader(BaseUI):
     def __init__(self):
+        # Phase-by-phase startup timing, logged once the first frame is drawn
+        self.startup = PhaseTimer(_STARTED)
+        self.startup.mark('imports')
+
         super().__init__()
+        self.startup.mark('tk root')
         
         # Setup window
         self.setup_window()
         self.create_status_bar()
+        self.startup.mark('window')
         
         # Initialize modules
         self.init_modules()
+        self.startup.mark('modules')
         
         # Setup UI tabs
         self.setup_tabs()
+        self.startup.mark('main tab')
         
         # Setup event bindings
         self.setup_event_bindings()
         
         # Start animation and logging
         self.animate_startup()
+        self.update_resource_gauges()
         self.logger.log_to_console(f"Application started. Output folder: {self.output_folder}")
+        self.startup.mark('bindings')
+        self.root.after_idle(self.report_startup)
+
+    def report_startup(self):
+        """Log the startup timing report after the first frame has been drawn"""
+        self.root.update_idletasks()
+        self.startup.mark('first frame')
+        self.logger.log_to_console(f"Startup took {self.startup.total * 1000:.0f} ms")
+        for line in self.startup.report().splitlines():
+            self.logger.log_to_console(f"  {line}")
 
     def init_modules(self):
         """Initialize all modules"""
@@ -50,6 +76,7 @@ class StreamlinkDownloader(BaseUI):
             app_log_widget=None,  # Will be set when log tab is created
             streamlink_log_widget=None
         )
+        self.logger.attach(self.root)
 
         # Initialize downloader
         self.downloader = DownloaderCore(
@@ -68,21 +95,29 @@ class StreamlinkDownloader(BaseUI):
             audio_bitrate=self.compression_audio_bitrate.get()
         )
 
-        # Initialize CSV tools
+        # Initialize CSV tools (run as jobs on worker threads, so status goes through the log pump)
         self.csv_tools = CSVTools(
             logger=self.logger.log_to_console,
-            status_updater=self.update_status
+            status_updater=self.logger.post_status
         )
 
         # Initialize video tools
-        from tkinter import filedialog, messagebox
+        from tkinter import filedialog
         self.video_tools = VideoTools(
             logger=self.logger.log_to_console,
-            status_updater=self.update_status,
-            file_picker=lambda: filedialog.askdirectory(title="Select folder with MP4 files"),
-            messagebox=messagebox
+            status_updater=self.logger.post_status,
+            file_picker=lambda: filedialog.askdirectory(title="Select folder with MP4 files")
         )
 
+        # Fleet health samples for the Dashboard tab (collected even before the tab is opened)
+        self.fleet_metrics = FleetMetrics(self.downloader, interval=2.0, logger=self.logger.log_to_console).start()
+
+        # Worker pool for CSV & Video Tools operations
+        self.job_runner = JobRunner(max_workers=2, logger=self.logger.log_to_console)
+
+        # Initialize sampling profiler (toggled from the Settings tab)
+        self.profiler = SamplingProfiler(logger=self.logger.log_to_console)
+
         # Initialize handlers
         self.handlers = UIHandlers(self, self.downloader, self.logger)
 
@@ -100,27 +135,57 @@ class StreamlinkDownloader(BaseUI):
         
         # Create tab frames
         self.main_tab_frame = self.components.create_glass_frame(self.tab_control)
+        self.dashboard_tab_frame = self.components.create_glass_frame(self.tab_control)
         self.log_tab_frame = self.components.create_glass_frame(self.tab_control)
         self.csv_tools_tab_frame = self.components.create_glass_frame(self.tab_control)
         self.settings_tab_frame = self.components.create_glass_frame(self.tab_control)
 
         # Add tabs to notebook
         self.tab_control.add(self.main_tab_frame, text='📺 Main')
+        self.tab_control.add(self.dashboard_tab_frame, text='📈 Dashboard')
         self.tab_control.add(self.log_tab_frame, text='📋 Log')
         self.tab_control.add(self.csv_tools_tab_frame, text='📊 CSV & Video Tools')
         self.tab_control.add(self.settings_tab_frame, text='⚙️ Settings')
         
         self.tab_control.pack(fill='both', expand=True, padx=5, pady=5)
 
-        # Initialize individual tab modules
+        # Initialize individual tab modules - only the visible Main tab is built now;
+        # the others are built when first selected (settings are loaded and applied right away)
         self.main_tab = MainTab(self.main_tab_frame, self, self.downloader, self.logger)
-        self.log_tab = LogTab(self.log_tab_frame, self, self.logger)
-        self.csv_tools_tab = CSVToolsTab(self.csv_tools_tab_frame, self, self.csv_tools, self.video_tools)
-        self.settings_tab = SettingsTab(self.settings_tab_frame, self, self.logger)
+        self.settings_tab = SettingsTab(self.settings_tab_frame, self, self.logger, defer_ui=True)
+        self.dashboard_tab = None
+        self.log_tab = None
+        self.csv_tools_tab = None
+        self.tab_builders = {
+            str(self.dashboard_tab_frame): self.build_dashboard_tab,
+            str(self.log_tab_frame): self.build_log_tab,
+            str(self.csv_tools_tab_frame): self.build_csv_tools_tab,
+            str(self.settings_tab_frame): self.settings_tab.build,
+        }
+        self.tab_control.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
         
         # Make settings tab accessible to main tab for auto-start functionality
         self.main_tab.settings_tab = self.settings_tab
 
+    def on_tab_changed(self, event=None):
+        """Build a deferred tab the first time it is selected"""
+        builder = self.tab_builders.pop(self.tab_control.select(), None)
+        if builder is not None:
+            started = time.perf_counter()
+            builder()
+            tab_name = self.tab_control.tab(self.tab_control.select(), 'text')
+            self.logger.log_to_console(f"Built {tab_name} tab in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def build_dashboard_tab(self):
+        self.dashboard_tab = DashboardTab(self.dashboard_tab_frame, self, self.fleet_metrics)
+
+    def build_log_tab(self):
+        self.log_tab = LogTab(self.log_tab_frame, self, self.logger)
+
+    def build_csv_tools_tab(self):
+        self.csv_tools_tab = CSVToolsTab(self.csv_tools_tab_frame, self, self.csv_tools, self.video_tools,
+                                         self.job_runner)
+
     def create_title_bar(self, parent):
         """Create title bar with enhanced styling"""
         title_frame = self.components.create_glass_frame(parent)
@@ -164,21 +229,26 @@ class StreamlinkDownloader(BaseUI):
         self.root.bind('<Delete>', lambda e: self.handlers.remove_stream())
 
     def update_tree_item(self, name):
-        """Update tree item display for a stream"""
-        if hasattr(self.main_tab, 'tree'):
-            for item in self.main_tab.tree.get_children():
-                if self.main_tab.tree.item(item)['text'] == name:
-                    stream = self.downloader.streams[name]
-                    state = stream['state']
-                    delay = stream['delay']
-                    restart_time = stream.get('restart_seconds', 0)
-                    retry_count = stream.get('retry_count', 0)
-                    self.main_tab.tree.item(item, values=(state, delay, restart_time, retry_count), tags=(state,))
-                    break
-        
-        # Update stream counters
-        if hasattr(self.main_tab, 'update_stream_counters'):
-            self.main_tab.update_stream_counters()
+        """Queue a refresh of a stream's row; the main tab redraws changed rows on its next tick"""
+        if hasattr(self, 'main_tab'):
+            self.main_tab.mark_stream_dirty(name)
+
+    def update_resource_gauges(self):
+        """Refresh the thread/process/fd gauges in the status bar"""
+        try:
+            monitor = self.downloader.resource_monitor
+            snapshot = monitor.snapshot()
+            ratio = monitor.usage_ratio(snapshot)
+            if ratio >= monitor.refuse_ratio:
+                color = AeroStyle.ERROR_COLOR
+            elif ratio >= monitor.warn_ratio:
+                color = AeroStyle.WARNING_COLOR
+            else:
+                color = AeroStyle.SECONDARY_TEXT
+            self.resource_label.config(text=monitor.format_status(snapshot), fg=color)
+        except Exception as e:
+            self.resource_label.config(text=f"Resource monitor error: {e}")
+        self.root.after(2000, self.update_resource_gauges)
 
     def refresh_streams(self):
         """Refresh stream display"""
@@ -0,0 +1,60 @@
+# atomic_file.py
+"""
+atomic_write - replace a file only once its new contents are complete: data
+goes to a temp file in the same folder, is fsynced, then renamed over the
+target, so a crash or cancel leaves either the old file or the new one.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Mode open() gives new files; os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(path, mode='w', **open_kwargs):
+    """
+    Open a temp file next to `path` for writing; on a clean exit it replaces `path`,
+    on an exception it is removed and `path` is left untouched.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=folder)
+    try:
+        with open(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the permissions of the file being replaced,
+        # or give a new file the ones open(path, 'w') would
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_folder(folder)
+
+
+def _fsync_folder(folder):
+    """Persist the rename itself (not supported on Windows)"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
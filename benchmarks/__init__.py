@@ -0,0 +1,4 @@
+"""
+Benchmarks and load-test tooling for Streamlink Downloader.
+Run from the repository root, e.g. python -m benchmarks.bench_scheduler
+"""
@@ -0,0 +1,284 @@
+# benchmarks/bench_micro.py
+"""
+Micro-benchmarks for CSVTools, Logger, catalog search and the download tree.
+Synthetic catalogs are generated once per size and reused between runs.
+
+    python -m benchmarks.bench_micro --rows 10000 1000000
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import shutil
+import statistics
+import string
+import tempfile
+import time
+
+from benchmarks.results import save_results
+
+CSV_COLUMNS = ['name', 'url']
+
+
+def make_catalog(path, rows, duplicate_ratio=0.1, seed=1234):
+    """Write a synthetic name,url catalog plus a scraped-image column for generate_urls"""
+    rnd = random.Random(seed)
+    unique = max(1, int(rows * (1 - duplicate_ratio)))
+    names = [''.join(rnd.choices(string.ascii_letters + string.digits + '_', k=rnd.randint(6, 18)))
+             for _ in range(unique)]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'url', 'image-background src', 'model-list-item-username'])
+        for i in range(rows):
+            name = names[i] if i < unique else rnd.choice(names).upper()
+            fid = rnd.randint(10 ** 7, 10 ** 9)
+            writer.writerow([
+                name,
+                f"https://edge-hls.doppiocdn.org/hls/{fid}/master/{fid}_auto.m3u8",
+                f"https://img.doppiocdn.com/thumbs/{fid // 1000}/{fid}",
+                name
+            ])
+    return path
+
+
+def measure(func, repeat=3, setup=None, teardown=None):
+    """Run func `repeat` times (setup and teardown excluded from timing); returns timing summary"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        try:
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        finally:
+            if teardown:
+                teardown()
+    return {
+        'min_s': round(min(timings), 4),
+        'median_s': round(statistics.median(timings), 4),
+        'repeat': repeat
+    }
+
+
+def quiet():
+    """Silence the print() fallbacks used by the tools while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+# ----------------- CSVTools -----------------
+def bench_csv_tools(rows, workdir, repeat):
+    from csv_tools import CSVTools
+
+    tools = CSVTools(logger=lambda msg: None)
+    fixture = make_catalog(os.path.join(workdir, f"catalog_{rows}.csv"), rows)
+    source = make_catalog(os.path.join(workdir, f"source_{rows}.csv"), max(1, rows // 10), seed=99)
+    work = os.path.join(workdir, 'work.csv')
+    reset = lambda: shutil.copyfile(fixture, work)
+
+    results = {
+        'merge_csvs': measure(lambda: tools.merge_csvs(work, source, CSV_COLUMNS), repeat, reset),
+        'sort_main_csv': measure(lambda: tools.sort_main_csv(work, CSV_COLUMNS), repeat, reset),
+        'remove_duplicates_by_name': measure(
+            lambda: tools.remove_duplicates_by_name(work, CSV_COLUMNS), repeat, reset),
+        'export_cleaned_sorted_csv': measure(
+            lambda: tools.export_cleaned_sorted_csv(fixture, os.path.join(workdir, 'cleaned.csv'), CSV_COLUMNS),
+            repeat),
+    }
+    try:
+        results['generate_urls_from_csv'] = measure(lambda: tools.generate_urls_from_csv(work), repeat, reset)
+    except ImportError as e:
+        results['generate_urls_from_csv'] = {'skipped': str(e)}
+    return results
+
+
+# ----------------- Logger -----------------
+def bench_logger(lines, repeat, workdir):
+    from logger import Logger
+
+    current = {}
+
+    def new_logger(**kwargs):
+        """measure() setup: a Logger with a fresh event database, so runs do not share writers"""
+        def setup():
+            current['runs'] = current.get('runs', 0) + 1
+            event_db = os.path.join(workdir, f"events_{current['runs']}.db")
+            current['logger'] = Logger(event_log_path=event_db, **kwargs)
+        return setup
+
+    def close_logger():
+        logger = current.pop('logger')
+        logger.events.close()
+        logger.stream_files.close()
+
+    def run():
+        logger = current['logger']
+        for i in range(lines):
+            logger.log_streamlink(f"[stream_{i % 300}] [cli][info] Opening stream: 1080p (hls)")
+
+    results = {}
+    timing = measure(run, repeat, new_logger(), close_logger)
+    timing['lines_per_s'] = round(lines / timing['min_s'])
+    results['log_streamlink_no_widget'] = timing
+
+    def run_filtered():
+        logger = current['logger']
+        for i in range(lines):
+            logger.log_stream_output(f"stream_{i % 300}", "[cli][info] Opening stream: 1080p (hls)")
+
+    setup_logger = new_logger()
+
+    def new_filtered_logger():
+        setup_logger()
+        current['logger'].log_filter.set_level('warning')
+
+    timing = measure(run_filtered, repeat, new_filtered_logger, close_logger)
+    timing['lines_per_s'] = round(lines / timing['min_s'])
+    results['log_stream_output_filtered'] = timing
+
+    root = tk_root()
+    if root is None:
+        results['log_streamlink_text_widget'] = {'skipped': 'no display available'}
+        return results
+    try:
+        import tkinter as tk
+        text = tk.Text(root)
+
+        def run_widget():
+            run()
+            current['logger'].flush()
+            root.update()
+
+        timing = measure(run_widget, repeat, new_logger(streamlink_log_widget=text), close_logger)
+        timing['lines_per_s'] = round(lines / timing['min_s'])
+        results['log_streamlink_text_widget'] = timing
+    finally:
+        root.destroy()
+    return results
+
+
+# ----------------- Catalog Search -----------------
+def bench_search(rows, repeat):
+    from stream_index import StreamIndex
+
+    rnd = random.Random(42)
+    items = [{'name': ''.join(rnd.choices(string.ascii_letters + string.digits + '_', k=rnd.randint(6, 18))),
+              'url': f"https://edge-hls.doppiocdn.org/hls/{i}/master/{i}_auto.m3u8"} for i in range(rows)]
+    # Typing a name one key at a time (debounced UI filters fewer of these), then backspacing
+    typed = items[rows // 2]['name'][:6]
+    queries = [typed[:n] for n in range(1, len(typed) + 1)] + [typed[:n] for n in range(len(typed) - 1, 0, -1)]
+
+    index = StreamIndex()
+    results = {'build': measure(lambda: index.build(items), repeat)}
+
+    def typing():
+        index.cache.clear()
+        for query in queries:
+            index.search(query)
+
+    def scans():
+        for query in queries:
+            index.cache.clear()
+            index.search(query)
+
+    results['typing'] = measure(typing, repeat)
+    results['typing_without_narrowing'] = measure(scans, repeat)
+    results['queries'] = len(queries)
+    return results
+
+
+# ----------------- Download Tree -----------------
+def bench_tree_updates(rows, updates, repeat):
+    root_probe = tk_root()
+    if root_probe is None:
+        return {'skipped': 'no display available'}
+    root_probe.destroy()
+
+    from app import StreamlinkDownloader
+
+    with quiet():
+        app = StreamlinkDownloader()
+        app.root.withdraw()
+        for i in range(rows):
+            name = f"stream_{i:05d}"
+            if app.downloader.add_stream(name, f"https://edge-hls.doppiocdn.org/hls/{i}/master/{i}_auto.m3u8"):
+                app.main_tab.add_stream_row(name, 1)
+        app.root.update()
+
+    # Spread updates over the list (late rows were the expensive case for the old linear scan)
+    step = max(1, rows // updates)
+    names = [f"stream_{i:05d}" for i in range(rows - 1, -1, -step)][:updates]
+
+    def run():
+        for name in names:
+            app.downloader.streams[name]['restart_seconds'] += 1
+            app.update_tree_item(name)
+        app.main_tab.flush_dirty_streams()
+        app.root.update()
+
+    try:
+        with quiet():
+            timing = measure(run, repeat)
+        timing['updates'] = len(names)
+        timing['per_update_ms'] = round(timing['min_s'] / len(names) * 1000, 3)
+        return timing
+    finally:
+        app.root.destroy()
+
+
+def tk_root():
+    """A withdrawn Tk root, or None when no display is available (e.g. CI without Xvfb)"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for CSV tools, logger, search and tree updates")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 1000000], help="catalog sizes")
+    parser.add_argument('--log-lines', type=int, default=100000)
+    parser.add_argument('--tree-rows', type=int, default=5000)
+    parser.add_argument('--tree-updates', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', choices=['csv', 'logger', 'search', 'tree'], nargs='+',
+                        default=['csv', 'logger', 'search', 'tree'])
+    parser.add_argument('--output', help="results file (default: benchmarks/results/...)")
+    args = parser.parse_args()
+
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='streamlink_bench_')
+    try:
+        if 'csv' in args.only:
+            for rows in args.rows:
+                print(f"CSVTools on {rows} rows...")
+                results[f"csv_tools_{rows}"] = bench_csv_tools(rows, workdir, args.repeat)
+                print(f"  {results[f'csv_tools_{rows}']}")
+        if 'logger' in args.only:
+            print(f"Logger.log_streamlink with {args.log_lines} lines...")
+            results['logger'] = bench_logger(args.log_lines, args.repeat, workdir)
+            print(f"  {results['logger']}")
+        if 'search' in args.only:
+            for rows in args.rows:
+                print(f"StreamIndex search on {rows} rows...")
+                results[f"search_{rows}"] = bench_search(rows, args.repeat)
+                print(f"  {results[f'search_{rows}']}")
+        if 'tree' in args.only:
+            print(f"update_tree_item on {args.tree_rows} rows...")
+            results['tree_updates'] = bench_tree_updates(args.tree_rows, args.tree_updates, args.repeat)
+            print(f"  {results['tree_updates']}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    path = save_results('micro', results, args.output)
+    print(f"Results saved to {path}")
+
+
+if __name__ == '__main__':
+    main()
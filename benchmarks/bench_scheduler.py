@@ -0,0 +1,216 @@
+# benchmarks/bench_scheduler.py
+"""
+Load test for DownloaderCore using the simulated streamlink/ffmpeg tools.
+Measures thread count, CPU, restart latency and UI-callback rate per fleet size.
+
+    python -m benchmarks.bench_scheduler --streams 100 1000 5000 --duration 60
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks.results import RESULTS_DIR, save_results
+from benchmarks.sim_harness import SimulatorHarness
+from downloader import DownloaderCore
+from profiler import SamplingProfiler
+
+SCENARIOS = {
+    # Every stream records steadily and exits cleanly after a while
+    'steady': {
+        'streamlink': {'duration': 20, 'rate': 32 * 1024, 'log_interval': 2.0}
+    },
+    # A third of the starts fail early, like an HLS edge that keeps dropping
+    'flapping': {
+        'streamlink': {'duration': 15, 'rate': 32 * 1024, 'flap': 0.33, 'log_interval': 1.0}
+    },
+    # Processes stop producing output and ignore SIGTERM
+    'hanging': {
+        'streamlink': {'hang': True, 'ignore_term': True}
+    },
+    # Every start fails right away (host outage)
+    'outage': {
+        'streamlink': {'duration': 0.5, 'exit_code': 1, 'startup': 0.2}
+    }
+}
+
+
+class CallbackRecorder:
+    """Stands in for Logger and the UI: counts callbacks and records state changes"""
+
+    def __init__(self, core_ref):
+        self.core_ref = core_ref
+        self.lock = threading.Lock()
+        self.log_calls = 0
+        self.streamlink_calls = 0
+        self.ui_calls = 0
+        self.last_state = {}
+        self.exited_at = {}
+        self.restart_latencies = []
+
+    def log_to_console(self, message):
+        with self.lock:
+            self.log_calls += 1
+
+    def log_streamlink(self, message, *args, **kwargs):
+        with self.lock:
+            self.streamlink_calls += 1
+
+    def update_tree_item(self, name):
+        core = self.core_ref()
+        state = core.streams[name]['state'] if core and name in core.streams else None
+        now = time.perf_counter()
+        with self.lock:
+            self.ui_calls += 1
+            previous = self.last_state.get(name)
+            if state == previous:
+                return
+            self.last_state[name] = state
+            if previous == 'Running':
+                self.exited_at[name] = now
+            elif state == 'Running' and name in self.exited_at:
+                self.restart_latencies.append(now - self.exited_at.pop(name))
+
+
+class BenchDownloaderCore(DownloaderCore):
+    """DownloaderCore with a fixed, short error-retry delay so restarts happen within a run"""
+
+    retry_delay = 2
+
+    def calculate_retry_delay(self, name):
+        return self.retry_delay
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)
+
+
+def child_cpu_seconds():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_fleet(stream_count, duration, scenario_name, retry_delay, sample_interval,
+              with_checks=False, compression=False):
+    """Run one fleet size against one scenario and return its metrics"""
+    harness = SimulatorHarness(SCENARIOS[scenario_name])
+    harness.start()
+    try:
+        core = None
+        recorder = CallbackRecorder(lambda: core)
+        core = BenchDownloaderCore(logger=recorder, ui_updater=recorder.update_tree_item)
+        core.retry_delay = retry_delay
+        core.output_folder = harness.output_dir
+        core.compression_enabled = compression
+
+        for i in range(stream_count):
+            core.add_stream(f"sim_{i:05d}", f"https://sim-{i % 10}.example.invalid/hls/{i}/master.m3u8",
+                            delay=0.05)
+
+        baseline_threads = threading.active_count()
+        cpu_start = time.process_time()
+        children_start = child_cpu_seconds()
+        started = time.perf_counter()
+
+        for name in list(core.streams):
+            if with_checks:
+                core.start_stream(name)
+            else:
+                core._start_stream_internal(name)
+        startup_seconds = time.perf_counter() - started
+
+        thread_samples = []
+        running_samples = []
+        deadline = started + duration
+        while time.perf_counter() < deadline:
+            time.sleep(sample_interval)
+            thread_samples.append(threading.active_count())
+            running_samples.append(sum(1 for s in core.streams.values() if s['state'] == 'Running'))
+
+        elapsed = time.perf_counter() - started
+        with recorder.lock:
+            ui_calls = recorder.ui_calls
+            log_calls = recorder.log_calls + recorder.streamlink_calls
+            latencies = list(recorder.restart_latencies)
+
+        stop_started = time.perf_counter()
+        for name in list(core.streams):
+            core.stop_stream(name)
+        shutdown_seconds = time.perf_counter() - stop_started
+
+        children_end = child_cpu_seconds()
+        return {
+            'scenario': scenario_name,
+            'streams': stream_count,
+            'duration_s': round(elapsed, 2),
+            'startup_s': round(startup_seconds, 3),
+            'shutdown_s': round(shutdown_seconds, 3),
+            'threads_baseline': baseline_threads,
+            'threads_peak': max(thread_samples, default=baseline_threads),
+            'threads_mean': round(statistics.mean(thread_samples), 1) if thread_samples else None,
+            'running_mean': round(statistics.mean(running_samples), 1) if running_samples else None,
+            'cpu_parent_s': round(time.process_time() - cpu_start, 3),
+            'cpu_children_s': round(children_end - children_start, 3) if children_end is not None else None,
+            'ui_callbacks_per_s': round(ui_calls / elapsed, 1),
+            'log_callbacks_per_s': round(log_calls / elapsed, 1),
+            'restarts': len(latencies),
+            'restart_latency_p50_s': percentile(latencies, 50),
+            'restart_latency_p95_s': percentile(latencies, 95),
+            'restart_latency_max_s': round(max(latencies), 3) if latencies else None,
+            'configured_retry_delay_s': retry_delay
+        }
+    finally:
+        harness.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DownloaderCore load test with simulated tools")
+    parser.add_argument('--streams', type=int, nargs='+', default=[100, 1000, 5000],
+                        help="fleet sizes to run")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), nargs='+', default=['flapping'])
+    parser.add_argument('--duration', type=float, default=60, help="seconds per run")
+    parser.add_argument('--retry-delay', type=int, default=2, help="error retry delay in seconds")
+    parser.add_argument('--sample-interval', type=float, default=1.0)
+    parser.add_argument('--with-checks', action='store_true',
+                        help="go through start_stream() including the streamlink --version check")
+    parser.add_argument('--compression', action='store_true', help="run the streamlink | ffmpeg pipeline")
+    parser.add_argument('--profile', action='store_true',
+                        help="run the sampling profiler and write reports to benchmarks/results/profiles")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/...)")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        profiler = SamplingProfiler(output_dir=os.path.join(RESULTS_DIR, 'profiles'))
+        profiler.start()
+
+    results = []
+    for scenario_name in args.scenario:
+        for count in args.streams:
+            print(f"Running {scenario_name} with {count} streams for {args.duration}s...")
+            result = run_fleet(count, args.duration, scenario_name, args.retry_delay,
+                               args.sample_interval, args.with_checks, args.compression)
+            print("  " + ", ".join(f"{k}={v}" for k, v in result.items()))
+            results.append(result)
+
+    if profiler:
+        profiler.stop()
+
+    path = save_results('scheduler', results, args.output)
+    print(f"Results saved to {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/fake_stream_tools.py
+"""
+Scriptable stand-ins for the streamlink and ffmpeg executables.
+Invoked through the shims created by SimulatorHarness as
+    python fake_stream_tools.py <streamlink|ffmpeg> [args...]
+Behaviour comes from the JSON scenario file named by STREAMLINK_SIM_CONFIG.
+"""
+
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+
+DEFAULTS = {
+    'streamlink': {
+        'startup': 0.5,       # seconds before the first byte is written
+        'duration': 10.0,     # seconds of output before a normal exit
+        'rate': 64 * 1024,    # bytes per second written to the output
+        'exit_code': 0,       # exit code after a normal run
+        'log_interval': 2.0,  # seconds between periodic log lines
+        'flap': 0.0,          # probability (0-1) of failing early with fail_code
+        'fail_code': 1,
+        'hang': False,        # stop writing and never exit on its own
+        'ignore_term': False  # ignore SIGTERM so callers must kill()
+    },
+    'ffmpeg': {
+        'startup': 0.1,
+        'duration': 10.0,
+        'rate': 32 * 1024,
+        'exit_code': 0,
+        'log_interval': 0.5,
+        'flap': 0.0,
+        'fail_code': 1,
+        'hang': False,
+        'ignore_term': False
+    }
+}
+
+
+def load_config(tool, url=''):
+    """Merge tool defaults, scenario settings and the first matching URL override"""
+    config = dict(DEFAULTS[tool])
+    path = os.environ.get('STREAMLINK_SIM_CONFIG')
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            scenario = json.load(f)
+        config.update(scenario.get(tool, {}))
+        for pattern, override in scenario.get('overrides', {}).items():
+            if url and pattern in url:
+                config.update(override.get(tool, {}))
+                break
+    return config
+
+
+def emit(stream, line):
+    stream.write(line + '\n')
+    stream.flush()
+
+
+def drain(stream):
+    """Read and discard a binary stream until EOF"""
+    while stream.read(65536):
+        pass
+
+
+def run_stream(config, sink, log, progress_line):
+    """Write bytes at the configured rate, logging periodically, then exit"""
+    if config['ignore_term'] and hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    time.sleep(config['startup'])
+
+    duration = config['duration']
+    exit_code = config['exit_code']
+    if config['flap'] and random.random() < config['flap']:
+        duration = random.uniform(0, duration)
+        exit_code = config['fail_code']
+
+    chunk = b'\0' * max(1, int(config['rate'] / 10))
+    started = time.time()
+    next_log = started
+    written = 0
+    while config['hang'] or time.time() - started < duration:
+        if config['hang']:
+            time.sleep(1)
+            continue
+        if sink is not None:
+            try:
+                sink.write(chunk)
+                sink.flush()
+            except (BrokenPipeError, OSError):
+                return 1
+        written += len(chunk)
+        now = time.time()
+        if now >= next_log:
+            emit(log, progress_line(written, now - started))
+            next_log = now + config['log_interval']
+        time.sleep(0.1)
+
+    if exit_code != 0:
+        emit(log, "[stream.hls][error] Failed to reload playlist: Unable to open URL")
+    return exit_code
+
+
+def streamlink_main(args):
+    if '--version' in args:
+        emit(sys.stdout, "streamlink 6.5.0 (simulated)")
+        return 0
+    if '--can-handle-url' in args:
+        return 0
+
+    to_stdout = '--stdout' in args
+    output = args[args.index('-o') + 1] if '-o' in args else None
+    positional = [a for a in args if a.startswith('http') or a.startswith('file:')]
+    url = positional[0] if positional else ''
+    config = load_config('streamlink', url)
+
+    log = sys.stderr if to_stdout else sys.stdout
+    emit(log, f"[cli][info] Found matching plugin hls for URL {url}")
+    emit(log, "[cli][info] Available streams: 160p (worst), 360p, 480p, 720p, 1080p (best)")
+    emit(log, "[cli][info] Opening stream: 1080p (hls)")
+
+    if to_stdout:
+        sink = sys.stdout.buffer
+    else:
+        emit(log, f"[cli][info] Writing output to\n{output}")
+        sink = open(output, 'wb') if output else None
+
+    try:
+        return run_stream(
+            config, sink, log,
+            lambda written, elapsed: f"[download] Written {written / 1048576:.1f} MiB "
+                                     f"({elapsed:.0f}s @ {written / max(elapsed, 0.001) / 1024:.0f} KiB/s)"
+        )
+    finally:
+        if sink is not None and not to_stdout:
+            sink.close()
+
+
+def ffmpeg_main(args):
+    if '-version' in args:
+        emit(sys.stdout, "ffmpeg version 6.1-simulated Copyright (c) 2000-2023 the FFmpeg developers")
+        return 0
+
+    config = load_config('ffmpeg')
+    output = args[-1] if args else None
+    if 'pipe:0' in args:
+        # Drain the piped input so the upstream streamlink never blocks on a full pipe
+        threading.Thread(target=drain, args=(sys.stdin.buffer,), daemon=True).start()
+    emit(sys.stderr, "Input #0, mpegts, from 'pipe:0':")
+    emit(sys.stderr, "  Duration: N/A, start: 1.400000, bitrate: N/A")
+    emit(sys.stderr, f"Output #0, mp4, to '{output}':")
+
+    sink = open(output, 'wb') if output and output != '-' else None
+    try:
+        return run_stream(
+            config, sink, sys.stderr,
+            lambda written, elapsed: f"frame={int(elapsed * 30):5d} fps= 30 q=28.0 "
+                                     f"size={written // 1024:8d}kB time={time.strftime('%H:%M:%S', time.gmtime(elapsed))}.00 "
+                                     f"bitrate={written * 8 / max(elapsed, 0.001) / 1000:.1f}kbits/s speed=1.00x"
+        )
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('streamlink', 'ffmpeg'):
+        print("usage: fake_stream_tools.py <streamlink|ffmpeg> [args...]", file=sys.stderr)
+        return 2
+    tool, args = sys.argv[1], sys.argv[2:]
+    try:
+        return streamlink_main(args) if tool == 'streamlink' else ffmpeg_main(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# benchmarks/results.py
+"""
+Helpers for storing benchmark results as JSON so runs can be compared across commits.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def git_revision():
+    """Short hash of the checked-out commit, or 'unknown' outside a git tree"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=10,
+                                cwd=os.path.dirname(RESULTS_DIR))
+        return result.stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+def save_results(kind, results, output=None):
+    """Write results with run metadata; returns the file path"""
+    revision = git_revision()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{kind}_{timestamp}_{revision}.json")
+
+    payload = {
+        'kind': kind,
+        'timestamp': timestamp,
+        'revision': revision,
+        'python': sys.version.split()[0],
+        'platform': f"{platform.system()} {platform.release()}",
+        'results': results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    return output
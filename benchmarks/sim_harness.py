@@ -0,0 +1,90 @@
+# benchmarks/sim_harness.py
+"""
+SimulatorHarness - puts the fake streamlink/ffmpeg executables on PATH so
+DownloaderCore can be driven at scale without real streams.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+FAKE_TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_stream_tools.py')
+
+
+class SimulatorHarness:
+    def __init__(self, scenario=None, workdir=None):
+        """
+        :param scenario: dict with 'streamlink', 'ffmpeg' and optional 'overrides' sections
+                         (see fake_stream_tools.DEFAULTS for the keys)
+        :param workdir: directory for shims, scenario file and recordings (temp dir if None)
+        """
+        self.scenario = scenario or {}
+        self.workdir = workdir
+        self._owns_workdir = workdir is None
+        self._saved_env = {}
+
+    @property
+    def bin_dir(self):
+        return os.path.join(self.workdir, 'bin')
+
+    @property
+    def output_dir(self):
+        return os.path.join(self.workdir, 'recordings')
+
+    @property
+    def config_path(self):
+        return os.path.join(self.workdir, 'scenario.json')
+
+    def start(self):
+        """Create the shims and point PATH and STREAMLINK_SIM_CONFIG at them"""
+        if self.workdir is None:
+            self.workdir = tempfile.mkdtemp(prefix='streamlink_sim_')
+        os.makedirs(self.bin_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        for tool in ('streamlink', 'ffmpeg'):
+            self._write_shim(tool)
+        self.set_scenario(self.scenario)
+
+        for key in ('PATH', 'STREAMLINK_SIM_CONFIG'):
+            self._saved_env[key] = os.environ.get(key)
+        os.environ['PATH'] = self.bin_dir + os.pathsep + os.environ.get('PATH', '')
+        os.environ['STREAMLINK_SIM_CONFIG'] = self.config_path
+        return self
+
+    def stop(self):
+        """Restore the environment and remove the work directory if we created it"""
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env.clear()
+        if self._owns_workdir and self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+    def set_scenario(self, scenario):
+        """Replace the scenario; already running fake processes keep their settings"""
+        self.scenario = scenario
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(scenario, f, indent=2)
+
+    def _write_shim(self, tool):
+        if os.name == 'nt':
+            path = os.path.join(self.bin_dir, f"{tool}.cmd")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f'@"{sys.executable}" "{FAKE_TOOLS}" {tool} %*\r\n')
+        else:
+            path = os.path.join(self.bin_dir, tool)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_TOOLS}" {tool} "$@"\n')
+            os.chmod(path, 0o755)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,158 @@
+# catalog_cache.py
+"""
+CatalogCache - keeps parsed catalog columns in a binary, column-per-block
+file keyed by the CSV's path, size and mtime. A cached catalog is read back
+through mmap with one UTF-8 decode and one split per column, instead of
+parsing every CSV row again.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+from atomic_file import atomic_write
+
+DEFAULT_FOLDER = os.path.join(os.path.expanduser("~"), ".streamlink_downloader_cache", "catalogs")
+MAGIC = b'CATCOL02'
+# magic, CSV size, CSV mtime_ns, row count, column count
+HEADER = struct.Struct('<8sQqQI')
+# name length, data length, separator - followed by the UTF-8 name and the column data
+COLUMN = struct.Struct('<IQB')
+# Values are joined with the first of these that none of them contains; a
+# column containing both is simply not cached
+SEPARATORS = ('\x00', '\n')
+
+
+class CatalogCache:
+    def __init__(self, folder=DEFAULT_FOLDER, max_entries=8, logger=None):
+        """
+        :param folder: where cache files are kept
+        :param max_entries: cached catalogs kept; the least recently used are removed
+        :param logger: function for logging messages e.g. print or UI log
+        """
+        self.folder = folder
+        self.max_entries = max(1, max_entries)
+        self.log = logger if logger else print
+
+    def cache_path(self, csv_path):
+        key = hashlib.blake2b(os.path.abspath(csv_path).encode('utf-8', 'surrogatepass'), digest_size=16)
+        return os.path.join(self.folder, key.hexdigest() + '.catcol')
+
+    # ----------------- Reading -----------------
+    def load(self, csv_path, columns):
+        """{column: list of values} for the CSV as it is now, or None if not cached or stale"""
+        path = self.cache_path(csv_path)
+        try:
+            stat = os.stat(csv_path)
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                result = self._read(data, stat, columns)
+            if result is not None:
+                os.utime(path)  # pruning keeps the most recently used catalogs
+            return result
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _read(self, data, stat, columns):
+        magic, size, mtime_ns, rows, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+        offset = HEADER.size
+        blocks = {}
+        for _ in range(count):
+            name_length, data_length, separator = COLUMN.unpack_from(data, offset)
+            offset += COLUMN.size
+            name = str(data[offset:offset + name_length], 'utf-8')
+            offset += name_length
+            blocks[name] = (offset, data_length, chr(separator))
+            offset += data_length
+        if any(column not in blocks for column in columns):
+            return None
+
+        result = {}
+        with memoryview(data) as view:
+            for column in columns:
+                start, length, separator = blocks[column]
+                # Decoded straight from the mapped pages, without an intermediate bytes copy
+                with view[start:start + length] as block:
+                    values = str(block, 'utf-8', 'surrogatepass').split(separator) if rows else []
+                if len(values) != rows:
+                    return None
+                result[column] = values
+        return result
+
+    # ----------------- Writing -----------------
+    def writer(self, csv_path, columns, stat=None):
+        """
+        CatalogCacheWriter for the given column names, filled batch by batch while a CSV is parsed.
+        :param stat: os.stat of the CSV taken before it was read, so a file changed meanwhile is not cached
+        """
+        return CatalogCacheWriter(self, csv_path, columns, stat or os.stat(csv_path))
+
+    def save(self, csv_path, columns, stat=None):
+        """Cache {column: list of values} for a CSV; returns False if it could not be cached"""
+        writer = self.writer(csv_path, list(columns), stat)
+        writer.add(columns)
+        return writer.commit()
+
+    def _prune(self):
+        try:
+            entries = [os.path.join(self.folder, name) for name in os.listdir(self.folder) if name.endswith('.catcol')]
+            entries.sort(key=os.path.getmtime, reverse=True)
+            for path in entries[self.max_entries:]:
+                os.remove(path)
+        except OSError as e:
+            self.log(f"Could not prune catalog cache: {e}")
+
+
+class CatalogCacheWriter:
+    """
+    Collects cached columns as encoded chunks (which the garbage collector does
+    not scan, unlike lists of values kept alongside the loaded catalog).
+    """
+
+    def __init__(self, cache, csv_path, columns, stat):
+        self.cache = cache
+        self.csv_path = csv_path
+        self.stat = stat
+        self.rows = 0
+        self.columns = {name: [None, []] for name in columns}  # name -> [separator, encoded chunks]
+        self.failed = False
+
+    def add(self, columns):
+        """Append a batch of {column: values} (entries for other columns are ignored)"""
+        count = len(columns[next(iter(self.columns))])
+        if self.failed or not count:
+            return
+        for name, entry in self.columns.items():
+            separator, chunks = entry
+            # The first batch picks the column's separator; later batches must not contain it
+            for candidate in ((separator,) if separator else SEPARATORS):
+                text = candidate.join(columns[name])
+                if text.count(candidate) == count - 1:
+                    break
+            else:
+                self.failed = True  # leave this catalog uncached
+                return
+            if chunks:
+                chunks.append(candidate.encode('utf-8'))
+            chunks.append(text.encode('utf-8', 'surrogatepass'))
+            entry[0] = candidate
+        self.rows += count
+
+    def commit(self):
+        """Write the cache file if the CSV is unchanged; returns True if it was written"""
+        stat = self.stat
+        current = os.stat(self.csv_path)
+        if self.failed or (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return False
+        os.makedirs(self.cache.folder, exist_ok=True)
+        with atomic_write(self.cache.cache_path(self.csv_path), 'wb') as f:
+            f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, self.rows, len(self.columns)))
+            for name, (separator, chunks) in self.columns.items():
+                encoded = name.encode('utf-8')
+                f.write(COLUMN.pack(len(encoded), sum(map(len, chunks)), ord(separator or SEPARATORS[0])))
+                f.write(encoded)
+                f.writelines(chunks)
+        self.cache._prune()
+        return True
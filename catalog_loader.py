@@ -0,0 +1,186 @@
+# catalog_loader.py
+"""
+CatalogLoader - reads the name and url columns of a stream catalog CSV on a
+worker thread and hands rows over in batches through a queue, so the UI can
+pump them in with after() while the window stays responsive. With a
+CatalogCache, an unchanged catalog is read from its columnar cache instead.
+Search keys can be built on the worker too, so the UI thread only adopts them.
+CatalogRows - the loaded catalog, stored as one list per column.
+"""
+
+import csv
+import os
+import queue
+import threading
+
+# Batch (and cache) entry holding the rows' search keys; bump the suffix when their format changes
+SEARCH_KEYS = '#search-keys-1'
+
+
+class CatalogRows:
+    """
+    Catalog rows kept column-wise: loading appends whole column slices and
+    creates no per-row objects; a row is handed out as a small dict on access.
+    """
+
+    def __init__(self, columns=('name', 'url')):
+        self.columns = {column: [] for column in columns}
+        self._first = self.columns[columns[0]]
+
+    def __len__(self):
+        return len(self._first)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [dict(zip(self.columns, values))
+                    for values in zip(*(values[index] for values in self.columns.values()))]
+        return {column: values[index] for column, values in self.columns.items()}
+
+    def __iter__(self):
+        return (dict(zip(self.columns, values)) for values in zip(*self.columns.values()))
+
+    def column(self, name):
+        """The list of values of one column (not a copy)"""
+        return self.columns[name]
+
+    def append(self, row):
+        for column, values in self.columns.items():
+            values.append(row.get(column, ''))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def extend_columns(self, batch):
+        """Append a batch of {column: values} as handed over by CatalogLoader (other entries are ignored)"""
+        for column, values in self.columns.items():
+            values.extend(batch[column])
+
+    def clear(self):
+        for values in self.columns.values():
+            values.clear()
+
+
+class CatalogLoader:
+    def __init__(self, path, batch_rows=20000, columns=('name', 'url'), cache=None, search_keys=None):
+        """
+        :param path: catalog CSV file
+        :param batch_rows: rows handed over per batch
+        :param columns: header names read from each row; rows with an empty value are skipped
+        :param cache: optional CatalogCache tried before parsing and filled after a complete parse
+        :param search_keys: optional function({column: values}) -> list of search keys, run on the
+            worker for each batch; the keys are handed over as batch[SEARCH_KEYS] and cached too
+        """
+        self.path = path
+        self.batch_rows = max(1, batch_rows)
+        self.columns = columns
+        self.cache = cache
+        self.search_keys = search_keys
+        self.from_cache = False
+
+        self.queue = queue.SimpleQueue()
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.finished = False
+        self.error = None
+
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def progress(self):
+        """Fraction of the file read so far (0.0 - 1.0)"""
+        if self.finished and not self.error:
+            return 1.0
+        return self.bytes_read / self.total_bytes if self.total_bytes else 0.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='catalog-loader', daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop reading after the current batch (rows already handed over stay loaded)"""
+        self._cancel_event.set()
+
+    def get_batch(self):
+        """Next {column: values} batch (plus SEARCH_KEYS if built), or None if nothing is waiting (done once `finished` is also set)"""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _run(self):
+        try:
+            stat = os.stat(self.path)
+            self.total_bytes = stat.st_size
+            stored = tuple(self.columns) + ((SEARCH_KEYS,) if self.search_keys is not None else ())
+            if self.cache is not None:
+                cached = self.cache.load(self.path, stored)
+                if cached is not None:
+                    self.from_cache = True
+                    self._hand_over_columns(cached)
+                    return
+            cache_writer = self.cache.writer(self.path, stored, stat) if self.cache is not None else None
+
+            with open(self.path, newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                # Last occurrence wins, as with csv.DictReader
+                positions = {column: i for i, column in enumerate(header)}
+                missing = [column for column in self.columns if column not in positions]
+                if missing:
+                    raise ValueError(f"Missing column(s): {', '.join(missing)}")
+                indices = [positions[column] for column in self.columns]
+                width = max(indices) + 1
+
+                batch = []
+                for row in reader:
+                    if len(row) < width:
+                        continue
+                    values = [row[i] for i in indices]
+                    if all(values):
+                        batch.append(values)
+                        if len(batch) >= self.batch_rows:
+                            self._hand_over(batch, f, cache_writer)
+                            batch = []
+                            if self._cancel_event.is_set():
+                                break
+                if batch and not self._cancel_event.is_set():
+                    self._hand_over(batch, f, cache_writer)
+
+            if cache_writer is not None and not self._cancel_event.is_set():
+                try:
+                    cache_writer.commit()
+                except OSError as e:
+                    self.cache.log(f"Could not cache catalog {self.path}: {e}")
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+
+    def _hand_over(self, batch, f, cache_writer):
+        columns = {column: list(values) for column, values in zip(self.columns, zip(*batch))}
+        if self.search_keys is not None:
+            columns[SEARCH_KEYS] = self.search_keys(columns)
+        if cache_writer is not None:
+            cache_writer.add(columns)
+        self.rows_read += len(batch)
+        self.bytes_read = f.buffer.tell()
+        self.queue.put(columns)
+
+    def _hand_over_columns(self, data):
+        """Hand cached columns over in the same batches a parse would produce (list slices only)"""
+        total = len(data[self.columns[0]])
+        for start in range(0, total, self.batch_rows):
+            end = min(total, start + self.batch_rows)
+            self.queue.put({column: values[start:end] for column, values in data.items()})
+            self.rows_read = end
+            self.bytes_read = self.total_bytes * end // total
+            if self._cancel_event.is_set():
+                break
@@ -0,0 +1,246 @@
+# circuit_breaker.py
+"""
+CircuitBreaker - per-host (and global) outage detection for stream retries.
+When the failure rate across streams on a host crosses a threshold the breaker
+opens, holds every retry for that host, probes recovery with a single canary
+stream and then releases the waiting streams in stages.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+GLOBAL_KEY = '*'
+
+
+class CircuitBreaker:
+    def __init__(self, logger=None, failure_threshold=0.6, min_streams=5, window=120,
+                 cooldown=60, max_cooldown=900, canary_timeout=180, release_batch=10,
+                 release_interval=5):
+        """
+        :param logger: function for logging messages e.g. print or UI log
+        :param failure_threshold: failing share of reporting streams (0-1) that opens the breaker
+        :param min_streams: minimum number of streams reporting in the window before it can open
+        :param window: seconds a stream's last result counts towards the failure rate
+        :param cooldown: seconds the breaker stays open before a canary probe
+        :param max_cooldown: upper bound for the cooldown after repeated failed probes
+        :param canary_timeout: seconds a canary may take to report before the probe counts as failed
+        :param release_batch: streams released per stage once the host recovers
+        :param release_interval: seconds between release stages
+        """
+        self.log = logger if logger else print
+        self.failure_threshold = failure_threshold
+        self.min_streams = min_streams
+        self.window = window
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.canary_timeout = canary_timeout
+        self.release_batch = release_batch
+        self.release_interval = release_interval
+
+        self.lock = threading.Lock()
+        self.circuits = {}
+        self.admitted = set()
+
+    def _circuit(self, key):
+        """Get or create the state record for a host key"""
+        circuit = self.circuits.get(key)
+        if circuit is None:
+            circuit = {
+                'state': 'closed',
+                'results': {},            # stream name -> (timestamp, ok)
+                'waiting': OrderedDict(), # stream name -> retry callback
+                'canary': None,
+                'cooldown': self.cooldown,
+                'opened_at': None,
+                'timer': None
+            }
+            self.circuits[key] = circuit
+        return circuit
+
+    def _failure_rate(self, circuit, now):
+        """Share of streams whose latest result in the window was a failure"""
+        results = circuit['results']
+        for name in [n for n, (ts, _) in results.items() if now - ts > self.window]:
+            del results[name]
+        if len(results) < self.min_streams:
+            return 0.0
+        failed = sum(1 for _, ok in results.values() if not ok)
+        return failed / len(results)
+
+    # ----------------- Result Reporting -----------------
+    def record_result(self, host, name, ok):
+        """Record a stream outcome (ok=True for a healthy stream, False for a failure)"""
+        callbacks = []
+        now = time.time()
+        with self.lock:
+            for key in (host, GLOBAL_KEY):
+                circuit = self._circuit(key)
+                circuit['results'][name] = (now, ok)
+
+                if circuit['state'] == 'half_open' and circuit['canary'] == name:
+                    if ok:
+                        self._close(key, circuit)
+                        callbacks.extend(self._release_stage(key, circuit))
+                    else:
+                        circuit['cooldown'] = min(circuit['cooldown'] * 2, self.max_cooldown)
+                        self._open(key, circuit, now, reason="canary failed")
+                elif circuit['state'] == 'closed' and not ok:
+                    rate = self._failure_rate(circuit, now)
+                    if rate >= self.failure_threshold:
+                        self._open(key, circuit, now, reason=f"failure rate {rate:.0%}")
+
+        self._run_callbacks(callbacks)
+
+    # ----------------- Retry Gate -----------------
+    def request_retry(self, host, name, callback):
+        """
+        Ask whether a stream may retry now. Returns True if it may start; otherwise
+        the stream is held and callback(name) is invoked once it is released.
+        """
+        with self.lock:
+            for key in (GLOBAL_KEY, host):
+                circuit = self._circuit(key)
+                if (key, name) in self.admitted:
+                    self.admitted.discard((key, name))
+                    continue
+                if circuit['state'] == 'closed':
+                    continue
+                if circuit['state'] == 'half_open' and circuit['canary'] is None:
+                    self._set_canary(key, circuit, name)
+                    continue
+                if circuit['canary'] == name:
+                    continue
+                circuit['waiting'][name] = callback
+                return False
+
+            return True
+
+    def cancel(self, name):
+        """Forget a stream that was stopped or removed while held"""
+        callbacks = []
+        with self.lock:
+            for key, circuit in self.circuits.items():
+                self.admitted.discard((key, name))
+                circuit['waiting'].pop(name, None)
+                circuit['results'].pop(name, None)
+                if circuit['canary'] == name:
+                    circuit['canary'] = None
+                    callbacks.extend(self._pick_canary(key, circuit))
+        self._run_callbacks(callbacks)
+
+    def is_open(self, host):
+        """Check whether retries for a host are currently held"""
+        with self.lock:
+            for key in (GLOBAL_KEY, host):
+                circuit = self.circuits.get(key)
+                if circuit and circuit['state'] != 'closed':
+                    return True
+            return False
+
+    def get_status(self):
+        """Snapshot of every known circuit: state, failure rate and held streams"""
+        now = time.time()
+        with self.lock:
+            return {
+                key: {
+                    'state': circuit['state'],
+                    'failure_rate': self._failure_rate(circuit, now),
+                    'waiting': len(circuit['waiting']),
+                    'canary': circuit['canary'],
+                    'cooldown': circuit['cooldown']
+                }
+                for key, circuit in self.circuits.items()
+            }
+
+    # ----------------- State Transitions (lock held) -----------------
+    def _open(self, key, circuit, now, reason):
+        """Open the breaker and schedule a canary probe after the cooldown"""
+        circuit['state'] = 'open'
+        circuit['opened_at'] = now
+        circuit['canary'] = None
+        self.log(f"Circuit breaker [{self._label(key)}] opened ({reason}); "
+                 f"holding retries for {circuit['cooldown']}s")
+        self._schedule(circuit, circuit['cooldown'], lambda: self._probe(key))
+
+    def _close(self, key, circuit):
+        """Close the breaker after a successful canary"""
+        circuit['state'] = 'closed'
+        circuit['canary'] = None
+        circuit['cooldown'] = self.cooldown
+        circuit['results'] = {n: r for n, r in circuit['results'].items() if r[1]}
+        self.log(f"Circuit breaker [{self._label(key)}] closed; "
+                 f"releasing {len(circuit['waiting'])} held streams")
+
+    def _probe(self, key):
+        """Cooldown elapsed - move to half-open and admit one canary"""
+        with self.lock:
+            circuit = self._circuit(key)
+            if circuit['state'] != 'open':
+                return
+            circuit['state'] = 'half_open'
+            callbacks = self._pick_canary(key, circuit)
+        self._run_callbacks(callbacks)
+
+    def _pick_canary(self, key, circuit):
+        """Admit the longest-waiting stream as canary; returns callbacks to run"""
+        if circuit['state'] != 'half_open' or not circuit['waiting']:
+            return []
+        name, callback = circuit['waiting'].popitem(last=False)
+        self._set_canary(key, circuit, name)
+        self.admitted.add((key, name))
+        return [(callback, name)]
+
+    def _set_canary(self, key, circuit, name):
+        """Mark a stream as the probe for a half-open circuit"""
+        circuit['canary'] = name
+        self.log(f"Circuit breaker [{self._label(key)}]: probing with canary {name}")
+        self._schedule(circuit, self.canary_timeout, lambda: self._canary_timeout(key, name))
+
+    def _canary_timeout(self, key, name):
+        """Treat a canary that never reported as a failed probe"""
+        with self.lock:
+            circuit = self._circuit(key)
+            if circuit['state'] != 'half_open' or circuit['canary'] != name:
+                return
+            circuit['cooldown'] = min(circuit['cooldown'] * 2, self.max_cooldown)
+            self._open(key, circuit, time.time(), reason=f"canary {name} timed out")
+
+    def _release_stage(self, key, circuit):
+        """Admit the next batch of held streams and schedule the following stage"""
+        if circuit['state'] != 'closed':
+            return []
+        callbacks = []
+        while circuit['waiting'] and len(callbacks) < self.release_batch:
+            name, callback = circuit['waiting'].popitem(last=False)
+            self.admitted.add((key, name))
+            callbacks.append((callback, name))
+        if circuit['waiting']:
+            self._schedule(circuit, self.release_interval, lambda: self._next_stage(key))
+        return callbacks
+
+    def _next_stage(self, key):
+        """Timer entry point for staged release"""
+        with self.lock:
+            callbacks = self._release_stage(key, self._circuit(key))
+        self._run_callbacks(callbacks)
+
+    def _schedule(self, circuit, delay, func):
+        """Replace the circuit's pending timer"""
+        if circuit['timer']:
+            circuit['timer'].cancel()
+        circuit['timer'] = threading.Timer(delay, func)
+        circuit['timer'].name = 'circuit-breaker'
+        circuit['timer'].daemon = True
+        circuit['timer'].start()
+
+    def _run_callbacks(self, callbacks):
+        """Invoke retry callbacks outside the lock"""
+        for callback, name in callbacks:
+            try:
+                callback(name)
+            except Exception as e:
+                self.log(f"Circuit breaker: error releasing {name}: {e}")
+
+    def _label(self, key):
+        return "all hosts" if key == GLOBAL_KEY else key
@@ -0,0 +1,101 @@
+# csv_key_index.py
+"""
+KeyIndex - compact set of row keys for a large CSV, stored as a sorted array
+of 64-bit hashes (8 bytes per row instead of a tuple of strings). The index
+is saved next to the CSV in a sidecar file stamped with the CSV's size and
+mtime, so later merges load it instead of re-reading the CSV.
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+SIDECAR_SUFFIX = '.keyidx'
+MAGIC = b'CSVKIDX1'
+# magic, CSV size, CSV mtime_ns, digest of the key columns, key count
+HEADER = struct.Struct('<8sQq8sQ')
+KEY_SEPARATOR = '\x00'
+
+
+def key_hash(values):
+    """64-bit hash of a key tuple, stable across runs (unlike hash())"""
+    data = KEY_SEPARATOR.join(values).encode('utf-8', 'surrogatepass')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def sidecar_path(csv_path):
+    return csv_path + SIDECAR_SUFFIX
+
+
+def _columns_digest(columns):
+    return hashlib.blake2b(KEY_SEPARATOR.join(columns).encode('utf-8'), digest_size=8).digest()
+
+
+class KeyIndex:
+    """
+    Membership test for key tuples. Two different keys share a hash with odds
+    of about n^2 / 2^65 (~1 in a million for 5M rows); such a row would be
+    treated as already present.
+    """
+
+    def __init__(self, hashes=None):
+        self.hashes = array('Q', sorted(hashes)) if hashes is not None else array('Q')
+        self.added = set()  # hashes added since the last commit()
+
+    def __len__(self):
+        return len(self.hashes) + len(self.added)
+
+    def __contains__(self, key):
+        h = key_hash(key)
+        if h in self.added:
+            return True
+        i = bisect_left(self.hashes, h)
+        return i < len(self.hashes) and self.hashes[i] == h
+
+    def add(self, key):
+        h = key_hash(key)
+        i = bisect_left(self.hashes, h)
+        if not (i < len(self.hashes) and self.hashes[i] == h):
+            self.added.add(h)
+
+    def commit(self):
+        """Fold added keys into the sorted array (a merge of two sorted runs)"""
+        if self.added:
+            merged = self.hashes.tolist()
+            merged.extend(sorted(self.added))
+            merged.sort()
+            self.hashes = array('Q', merged)
+            self.added.clear()
+
+    # ----------------- Sidecar -----------------
+    @classmethod
+    def load(cls, csv_path, columns):
+        """Index saved for the CSV as it is now, or None if missing or stale"""
+        try:
+            stat = os.stat(csv_path)
+            with open(sidecar_path(csv_path), 'rb') as f:
+                header = f.read(HEADER.size)
+                if len(header) != HEADER.size:
+                    return None
+                magic, size, mtime_ns, digest, count = HEADER.unpack(header)
+                if (magic != MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns
+                        or digest != _columns_digest(columns)):
+                    return None
+                index = cls()
+                index.hashes.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return index
+
+    def save(self, csv_path, columns):
+        """Write the sidecar for the CSV's current size and mtime (atomically)"""
+        self.commit()
+        stat = os.stat(csv_path)
+        path = sidecar_path(csv_path)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, _columns_digest(columns), len(self.hashes)))
+            self.hashes.tofile(f)
+        os.replace(temp_path, path)
@@ -6,155 +6,256 @@ and generating streaming URLs from CSV files.
 
 import os
 import csv
-import pandas as pd
+
+from atomic_file import atomic_write
+from csv_key_index import KeyIndex, key_hash
+from csv_pipeline import CSVPipeline, read_header, tracked
+from external_sort import DEFAULT_MEMORY_BUDGET
+
+# Columns of the catalog export that Generate URLs reads
+USERNAME_COLUMN = 'model-list-item-username'
+IMAGE_COLUMN = 'image-background src'
+THUMBS_URL_PREFIX = 'https://img.doppiocdn.com/thumbs/'
+M3U8_URL_PREFIX = 'https://edge-hls.doppiocdn.org/hls/'
+URL_BLOCK_BYTES = 16 * 1024 * 1024  # CSV bytes per pyarrow batch
+URL_CHUNK_ROWS = 200000             # rows per pandas chunk
+
+
+def _report(progress, message):
+    if progress is not None:
+        progress(message=message)
+
+
+def _ends_with_newline(path):
+    """Whether a file is empty or ends with a line break (so appended rows start on a new line)"""
+    with open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b'\n', b'\r')
+
 
 class CSVTools:
-    def __init__(self, logger=None, status_updater=None):
+    def __init__(self, logger=None, status_updater=None, memory_budget=DEFAULT_MEMORY_BUDGET, temp_dir=None):
         """
         :param logger: function for logging messages e.g. print or UI log
         :param status_updater: function for updating UI status labels
+        :param memory_budget: bytes of rows sorted in memory; larger files use an external merge sort
+        :param temp_dir: folder for sort runs (system temp folder if None)
         """
         self.log = logger if logger else print
         self.update_status = status_updater if status_updater else lambda msg: None
+        self.memory_budget = memory_budget
+        self.temp_dir = temp_dir
+
+    # Every operation takes an optional progress(rows=, bytes_read=, total_bytes=, message=)
+    # callback; a job runner's callback may raise to cancel between rows.
 
-    def merge_csvs(self, main_file, source_file, columns):
-        """Merge unique entries from source to main CSV."""
+    def merge_csvs(self, main_file, source_file, columns, progress=None):
+        """
+        Append source rows whose (columns[0], columns[1]) key is not in the main CSV yet.
+        The main CSV is only streamed to build a hashed key index, which is kept in a
+        sidecar file (main_file + '.keyidx') and reused while the main CSV is unchanged.
+        """
         if not os.path.exists(main_file) or not os.path.exists(source_file):
             raise FileNotFoundError("Both main and source files must exist.")
 
-        with open(main_file, newline='', encoding='utf-8') as mfile:
-            reader = csv.DictReader(mfile)
-            main_data = list(reader)
-            existing = {(r.get(columns[0], ''), r.get(columns[1], '')) for r in main_data}
+        key_columns = tuple(columns[:2])
+        header, index, from_sidecar = self._main_key_index(main_file, key_columns, progress)
+        out_columns = header or list(columns)
 
         with open(source_file, newline='', encoding='utf-8') as sfile:
-            reader = csv.DictReader(sfile)
+            reader = csv.reader(sfile)
+            source_header = next(reader, [])
+            # A missing column reads as empty values, so (as always) no row of that file is merged
+            positions = [source_header.index(c) if c in source_header else None for c in columns]
             new_entries = []
-            for row in reader:
-                key = (row.get(columns[0], ''), row.get(columns[1], ''))
-                if key not in existing and all(row.get(c) for c in columns):
-                    new_entries.append({c: row[c] for c in columns})
-                    existing.add(key)
+            for row in tracked(reader, sfile, progress, "Reading source CSV"):
+                values = [row[i] if i is not None and i < len(row) else '' for i in positions]
+                if not all(values):
+                    continue
+                key = tuple(values[:len(key_columns)])
+                if key not in index:
+                    index.add(key)
+                    by_column = dict(zip(columns, values))
+                    new_entries.append([by_column.get(c, '') for c in out_columns])
 
         if new_entries:
+            _report(progress, f"Appending {len(new_entries)} rows")
+            needs_newline = header is not None and not _ends_with_newline(main_file)
             with open(main_file, 'a', newline='', encoding='utf-8') as mfile:
-                writer = csv.DictWriter(mfile, fieldnames=columns)
-                for row in new_entries:
-                    writer.writerow(row)
+                writer = csv.writer(mfile)
+                if header is None:
+                    writer.writerow(out_columns)
+                elif needs_newline:
+                    mfile.write('\r\n')
+                writer.writerows(new_entries)
             msg = f"{len(new_entries)} new entries added."
         else:
             msg = "No new unique entries found."
 
+        if new_entries or not from_sidecar:
+            try:
+                # The sidecar is stamped with the main CSV's new size and mtime
+                index.save(main_file, key_columns)
+            except OSError as e:
+                self.log(f"Could not save key index for {main_file}: {e}")
+
         self.log(msg)
         self.update_status(msg)
         return msg
 
-    def sort_main_csv(self, main_file, columns):
-        """Sort main CSV by first column (A-Z)."""
+    def _main_key_index(self, main_file, key_columns, progress=None):
+        """(header or None if the file is empty, KeyIndex, whether it came from the sidecar)"""
+        with open(main_file, newline='', encoding='utf-8') as mfile:
+            reader = csv.reader(mfile)
+            header = next(reader, None)
+            index = KeyIndex.load(main_file, key_columns)
+            if index is not None:
+                _report(progress, f"Loaded key index ({len(index):,} keys)")
+                return header, index, True
+
+            # Missing key columns count as empty values, as they always have
+            positions = [header.index(c) if header and c in header else None for c in key_columns]
+            keys = (tuple(row[i] if i is not None and i < len(row) else '' for i in positions)
+                    for row in tracked(reader, mfile, progress, "Indexing main CSV"))
+            return header, KeyIndex(key_hash(key) for key in keys), False
+
+    def pipeline(self, source, progress=None):
+        """CSVPipeline over `source` using this tool's memory budget and temp folder"""
+        return CSVPipeline(source, progress=progress, memory_budget=self.memory_budget, temp_dir=self.temp_dir)
+
+    def sort_main_csv(self, main_file, columns, progress=None):
+        """
+        Sort main CSV by first column (A-Z). Files above the memory budget are sorted
+        in runs spilled to temp files and merged; the result replaces the file atomically.
+        """
         if not os.path.exists(main_file):
             raise FileNotFoundError("Main file does not exist.")
 
-        with open(main_file, newline='', encoding='utf-8') as mfile:
-            reader = csv.DictReader(mfile)
-            data = list(reader)
-            if not reader.fieldnames or columns[0] not in reader.fieldnames:
-                raise ValueError(f"Column '{columns[0]}' not found.")
-        
-        data.sort(key=lambda x: x.get(columns[0], "").lower())
-
-        with open(main_file, 'w', newline='', encoding='utf-8') as mfile:
-            writer = csv.DictWriter(mfile, fieldnames=reader.fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+        self.pipeline(main_file, progress).sort(columns[0]).write(main_file)
 
         msg = f"Main CSV sorted by '{columns[0]}'."
         self.log(msg)
         self.update_status(msg)
         return msg
 
-    def remove_duplicates_by_name(self, main_file, columns):
+    def remove_duplicates_by_name(self, main_file, columns, progress=None):
         """Remove duplicates by first column value."""
         if not os.path.exists(main_file):
             raise FileNotFoundError("Main file does not exist.")
 
-        with open(main_file, newline='', encoding='utf-8') as mfile:
-            reader = csv.DictReader(mfile)
-            rows = list(reader)
-
-        seen = set()
-        unique_rows = []
-        for row in rows:
-            name_val = row.get(columns[0], '').strip().lower()
-            if name_val and name_val not in seen:
-                seen.add(name_val)
-                unique_rows.append(row)
-
-        with open(main_file, 'w', newline='', encoding='utf-8') as mfile:
-            writer = csv.DictWriter(mfile, fieldnames=reader.fieldnames)
-            writer.writeheader()
-            writer.writerows(unique_rows)
-
-        removed = len(rows) - len(unique_rows)
-        msg = f"Removed {removed} duplicate entries."
+        stats = self.pipeline(main_file, progress).dedupe(columns[0]).write(main_file)
+
+        msg = f"Removed {stats['duplicates']} duplicate entries."
         self.log(msg)
         self.update_status(msg)
         return msg
 
-    def export_cleaned_sorted_csv(self, main_file, save_path, columns):
-        """Export cleaned & sorted CSV to a new file."""
+    def dedupe_and_sort_main_csv(self, main_file, columns, progress=None):
+        """Remove duplicates by first column and sort by it, reading and rewriting the file once."""
         if not os.path.exists(main_file):
             raise FileNotFoundError("Main file does not exist.")
 
-        with open(main_file, newline='', encoding='utf-8') as mfile:
-            reader = csv.DictReader(mfile)
-            rows = list(reader)
+        stats = self.pipeline(main_file, progress).dedupe(columns[0]).sort(columns[0]).write(main_file)
 
-        seen = set()
-        cleaned = []
-        for row in rows:
-            name_val = row.get(columns[0], '').strip().lower()
-            if name_val and name_val not in seen:
-                seen.add(name_val)
-                cleaned.append(row)
+        msg = f"Removed {stats['duplicates']} duplicate entries and sorted by '{columns[0]}'."
+        self.log(msg)
+        self.update_status(msg)
+        return msg
 
-        cleaned.sort(key=lambda x: x.get(columns[0], '').lower())
+    def export_cleaned_sorted_csv(self, main_file, save_path, columns, progress=None):
+        """Export cleaned & sorted CSV to a new file."""
+        if not os.path.exists(main_file):
+            raise FileNotFoundError("Main file does not exist.")
 
-        with open(save_path, 'w', newline='', encoding='utf-8') as newfile:
-            writer = csv.DictWriter(newfile, fieldnames=reader.fieldnames)
-            writer.writeheader()
-            writer.writerows(cleaned)
+        self.pipeline(main_file, progress).dedupe(columns[0]).sort(columns[0]).write(save_path)
 
         msg = f"Exported cleaned & sorted data to: {save_path}"
         self.log(msg)
         self.update_status(msg)
         return msg
 
-    def generate_urls_from_csv(self, filepath):
-        """Generate URL columns from image links in CSV."""
-        def extract_id(url): return url.strip().split("/")[-1]
-        def build_thumbs_url(fid): return f"https://img.doppiocdn.com/thumbs/{fid}/{fid}"
-        def build_m3u8_url(fid): return f"https://edge-hls.doppiocdn.org/hls/{fid}/master/{fid}_auto.m3u8"
-
+    def generate_urls_from_csv(self, filepath, progress=None):
+        """
+        Generate URL columns from image links in CSV. Only the username and image columns
+        are read, in blocks that are transformed with vectorized string operations (pyarrow
+        compute if installed, else pandas) and appended to the output, so memory stays bounded.
+        """
         if not os.path.exists(filepath):
             raise FileNotFoundError("CSV file not found.")
 
-        df = pd.read_csv(filepath)
-        if 'image-background src' not in df.columns:
-            raise ValueError("Column 'image-background src' not found.")
-
-        df['file_id'] = df['image-background src'].apply(extract_id)
-        df['thumbs_url'] = df['file_id'].apply(build_thumbs_url)
-        df['m3u8_url'] = df['file_id'].apply(build_m3u8_url)
-
-        df.rename(columns={
-            'model-list-item-username': 'name',
-            'm3u8_url': 'url'
-        }, inplace=True)
+        header = read_header(filepath)
+        if IMAGE_COLUMN not in header:
+            raise ValueError(f"Column '{IMAGE_COLUMN}' not found.")
+        usecols = [c for c in (USERNAME_COLUMN, IMAGE_COLUMN) if c in header]
 
         output_path = filepath.rsplit(".", 1)[0] + "_with_urls.csv"
-        df.to_csv(output_path, index=False)
+        _report(progress, "Reading")
+        # Both libraries take a noticeable part of a second to import; only this tool needs them
+        try:
+            import pyarrow.csv
+        except ImportError:
+            self._generate_urls_pandas(filepath, output_path, usecols, progress)
+        else:
+            self._generate_urls_arrow(filepath, output_path, usecols, progress)
 
         msg = f"URLs generated and saved as: {output_path}"
         self.log(msg)
         self.update_status(msg)
         return output_path
+
+    def _generate_urls_arrow(self, filepath, output_path, usecols, progress=None):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pcsv
+
+        # Quoted cells may span lines (and so block boundaries) in scraped exports
+        reader = pcsv.open_csv(
+            filepath,
+            read_options=pcsv.ReadOptions(block_size=URL_BLOCK_BYTES),
+            parse_options=pcsv.ParseOptions(newlines_in_values=True),
+            convert_options=pcsv.ConvertOptions(include_columns=usecols,
+                                                column_types={c: pa.string() for c in usecols}))
+        names = ['name' if c == USERNAME_COLUMN else c for c in usecols] + ['file_id', 'thumbs_url', 'url']
+        rows = 0
+        with atomic_write(output_path, 'wb') as out:
+            writer = None
+            for batch in reader:
+                # Last path segment of the image link, e.g. .../thumbs/<id> -> <id>
+                file_id = pc.replace_substring_regex(pc.utf8_trim_whitespace(batch.column(IMAGE_COLUMN)), r'^.*/', '')
+                thumbs_url = pc.binary_join_element_wise(THUMBS_URL_PREFIX, file_id, '/', file_id, '')
+                url = pc.binary_join_element_wise(M3U8_URL_PREFIX, file_id, '/master/', file_id, '_auto.m3u8', '')
+                columns = [batch.column(c) for c in usecols] + [file_id, thumbs_url, url]
+                result = pa.record_batch(columns, names=names)
+                if writer is None:
+                    writer = pcsv.CSVWriter(out, result.schema)
+                writer.write_batch(result)
+                rows += batch.num_rows
+                if progress is not None:
+                    progress(rows=rows, message="Building URLs")
+            if writer is None:
+                out.write((','.join(f'"{name}"' for name in names) + '\n').encode('utf-8'))
+            else:
+                writer.close()
+
+    def _generate_urls_pandas(self, filepath, output_path, usecols, progress=None):
+        import pandas as pd
+
+        rows = 0
+        # Written like the pyarrow path: columns in usecols order, every value quoted, empty cells as ""
+        with pd.read_csv(filepath, usecols=usecols, dtype=str, keep_default_na=False,
+                         chunksize=URL_CHUNK_ROWS) as chunks, \
+                atomic_write(output_path, newline='', encoding='utf-8') as out:
+            for number, df in enumerate(chunks):
+                df = df[usecols]
+                file_id = df[IMAGE_COLUMN].str.strip().str.rsplit('/', n=1).str[-1]
+                df['file_id'] = file_id
+                df['thumbs_url'] = THUMBS_URL_PREFIX + file_id + '/' + file_id
+                df['url'] = M3U8_URL_PREFIX + file_id + '/master/' + file_id + '_auto.m3u8'
+                df.rename(columns={USERNAME_COLUMN: 'name'}, inplace=True)
+
+                df.to_csv(out, index=False, header=number == 0, quoting=csv.QUOTE_ALL, lineterminator='\n')
+                rows += len(df)
+                if progress is not None:
+                    progress(rows=rows, message="Building URLs")
@@ -9,16 +9,23 @@ import subprocess
 import threading
 import time
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from circuit_breaker import CircuitBreaker
+from resource_monitor import ResourceMonitor
 
 class DownloaderCore:
     def __init__(self, logger=None, ui_updater=None, status_callback=None):
         """
-        :param logger: Logger instance or object with log_to_console() & log_streamlink() methods
+        :param logger: Logger instance or object with log_to_console() & log_streamlink() methods (register_stream_log() optional)
         :param ui_updater: function(name) to refresh UI treeview item
         :param status_callback: function(message) to update status bar
         """
         self.log = logger.log_to_console if logger else print
-        self.log_streamlink = logger.log_streamlink if logger else print
+        self.log_streamlink = logger.log_streamlink if logger else lambda message, stream=None, source=None: print(message)
+        self.register_stream_log = getattr(logger, 'register_stream_log', None) or (lambda name, folder: None)
+        self.log_stream_output = getattr(logger, 'log_stream_output', None) or (
+            lambda name, line, source='streamlink': self.log_streamlink(f"[{name}] {line}", stream=name, source=source))
         self.update_tree_item = ui_updater if ui_updater else lambda name: None
         self.update_status = status_callback if status_callback else lambda msg: None
 
@@ -33,6 +40,17 @@ class DownloaderCore:
         self.compression_crf = 23  # 0-51, lower = better quality, higher = smaller file
         self.compression_audio_bitrate = "128k"  # Audio bitrate for compression
 
+        # Outage detection shared by all streams on a host
+        self.circuit_breaker = CircuitBreaker(logger=self.log)
+        self.healthy_after = 30  # seconds a process must stay up to count as healthy
+
+        # Thread / process / fd gauges used to refuse starts before OS limits are hit
+        self.resource_monitor = ResourceMonitor(self, logger=self.log)
+
+        # Failed runs since startup (sampled by the dashboard)
+        self.failures = 0
+        self.failures_lock = threading.Lock()
+
     def add_stream(self, name, url, delay=1, test_url_callback=None):
         """Add a stream to the active downloads list"""
         if name in self.streams:
@@ -53,7 +71,8 @@ class DownloaderCore:
             'restart_seconds': 0,
             'retry_count': 0,
             'last_error_time': None,
-            'backoff_level': 0
+            'backoff_level': 0,
+            'stop_requested': False
         }
         self.log(f"Added stream: {name}")
         return True
@@ -72,22 +91,29 @@ class DownloaderCore:
         if self.compression_enabled and not self.check_ffmpeg_available():
             self.log("Compression enabled but FFmpeg not available. Please install FFmpeg.")
             return
+        allowed, message = self.resource_monitor.check_capacity()
+        if not allowed:
+            self.log(f"{message}: {name}")
+            self.update_status(message)
+            return
         self._start_stream_internal(name)
 
     def stop_stream(self, name):
         """Stop a running stream"""
         self.log(f"Stopping stream: {name}")
+        self.streams[name]['stop_requested'] = True
 
         # Cancel restart
         if self.streams[name]['restart_timer']:
             self.streams[name]['restart_timer'].cancel() if hasattr(self.streams[name]['restart_timer'], 'cancel') \
                 else None
             self.streams[name]['restart_timer'] = None
+        self.circuit_breaker.cancel(name)
 
         proc = self.streams[name]['process']
         if proc:
             try:
-                self.log_streamlink(f"[{name}] Terminating process...")
+                self.log_streamlink(f"[{name}] Terminating process...", stream=name)
                 
                 # Stop streamlink process if compression is enabled
                 if self.compression_enabled and 'streamlink_proc' in self.streams[name]:
@@ -99,19 +125,19 @@ class DownloaderCore:
                         streamlink_proc.kill()
                         streamlink_proc.wait()
                     except Exception as e:
-                        self.log_streamlink(f"[{name}] Error stopping streamlink: {e}")
+                        self.log_streamlink(f"[{name}] Error stopping streamlink: {e}", stream=name)
                 
                 # Stop main process
                 proc.terminate()
                 try:
                     proc.wait(timeout=5)
                 except subprocess.TimeoutExpired:
-                    self.log_streamlink(f"[{name}] Force killing process...")
+                    self.log_streamlink(f"[{name}] Force killing process...", stream=name)
                     proc.kill()
                     proc.wait()
-                self.log_streamlink(f"[{name}] Process stopped")
+                self.log_streamlink(f"[{name}] Process stopped", stream=name)
             except Exception as e:
-                self.log_streamlink(f"[{name}] Error stopping process: {e}")
+                self.log_streamlink(f"[{name}] Error stopping process: {e}", stream=name)
 
         self.streams[name]['state'] = 'Stopped'
         self.streams[name]['process'] = None
@@ -122,7 +148,9 @@ class DownloaderCore:
     def restart_stream(self, name):
         """Restart a stream after stopping it"""
         self.stop_stream(name)
-        threading.Timer(2, lambda: self._start_stream_internal(name)).start()
+        timer = threading.Timer(2, lambda: self._start_stream_internal(name))
+        timer.name = f"restart-timer:{name}"
+        timer.start()
 
     def set_delay(self, name, delay):
         """Set restart delay for a stream in minutes"""
@@ -139,6 +167,8 @@ class DownloaderCore:
 
     def _start_stream_internal(self, name):
         """Actual start & monitoring logic"""
+        self.streams[name]['stop_requested'] = False
+
         def run():
             try:
                 url = self.streams[name]['url']
@@ -149,12 +179,14 @@ class DownloaderCore:
                 folder = os.path.join(self.output_folder, safe_name)
                 os.makedirs(folder, exist_ok=True)
                 output = os.path.join(folder, f"{safe_name}_{timestamp}.mp4")
+                self.streams[name]['output'] = output
+                self.register_stream_log(name, folder)
 
                 self.log(f"Starting stream: {name} -> {output}")
-                self.log_streamlink(f"[{name}] Starting download with quality: {quality}")
+                self.log_streamlink(f"[{name}] Starting download with quality: {quality}", stream=name)
 
                 if self.compression_enabled:
-                    self.log_streamlink(f"[{name}] Compression enabled: preset={self.compression_preset}, crf={self.compression_crf}")
+                    self.log_streamlink(f"[{name}] Compression enabled: preset={self.compression_preset}, crf={self.compression_crf}", stream=name)
                     # Use FFmpeg for real-time compression
                     cmd = [
                         'streamlink', '--loglevel', 'info', '--force',
@@ -162,21 +194,22 @@ class DownloaderCore:
                         '--stdout', url, quality
                     ]
                     # Pipe to FFmpeg for compression
+                    # Banner off, stats on: they are logged (and sampled) as ffmpeg output
                     ffmpeg_cmd = [
-                        'ffmpeg', '-i', 'pipe:0',
+                        'ffmpeg', '-hide_banner', '-loglevel', 'info', '-stats', '-i', 'pipe:0',
                         '-c:v', 'libx264', '-preset', self.compression_preset,
                         '-crf', str(self.compression_crf),
                         '-c:a', 'aac', '-b:a', self.compression_audio_bitrate,
                         '-y', output
                     ]
-                    self.log_streamlink(f"[{name}] FFmpeg command: {' '.join(ffmpeg_cmd)}")
+                    self.log_streamlink(f"[{name}] FFmpeg command: {' '.join(ffmpeg_cmd)}", stream=name)
                 else:
                     # Standard download without compression
-                cmd = [
-                    'streamlink', '--loglevel', 'info', '--force',
-                    '--retry-streams', '3', '--retry-max', '3',
-                    url, quality, '-o', output
-                ]
+                    cmd = [
+                        'streamlink', '--loglevel', 'info', '--force',
+                        '--retry-streams', '3', '--retry-max', '3',
+                        url, quality, '-o', output
+                    ]
 
                 if self.compression_enabled:
                     # Create piped process: streamlink | ffmpeg
@@ -189,11 +222,14 @@ class DownloaderCore:
                         universal_newlines=True
                     )
                     
+                    # ffmpeg writes the recording to a file and its log and stats to stderr; merged
+                    # into stdout they are read by log_output (text mode turns the \r-terminated
+                    # stats updates into lines) and the pipe never fills up
                     ffmpeg_proc = subprocess.Popen(
                         ffmpeg_cmd,
                         stdin=streamlink_proc.stdout,
                         stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
                         text=True,
                         bufsize=1,
                         universal_newlines=True
@@ -206,77 +242,126 @@ class DownloaderCore:
                     proc = ffmpeg_proc
                     self.streams[name]['streamlink_proc'] = streamlink_proc
                 else:
-                proc = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
-                )
+                    proc = subprocess.Popen(
+                        cmd,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
+                        text=True,
+                        bufsize=1,
+                        universal_newlines=True
+                    )
 
                 self.streams[name]['process'] = proc
                 self.streams[name]['state'] = 'Running'
                 self.update_tree_item(name)
+                self._schedule_health_report(name, proc)
+
+                # In compression mode the monitored process is ffmpeg
+                source = 'ffmpeg' if self.compression_enabled else 'streamlink'
+
+                def log_streamlink_stderr(pipe):
+                    # streamlink's own log in compression mode; read as it comes so its pipe never fills
+                    try:
+                        for line in pipe:
+                            self.log_stream_output(name, f"[Streamlink] {line.strip()}", 'streamlink')
+                    except (OSError, ValueError) as e:
+                        self.log_streamlink(f"[{name}] Logging error: {e}", stream=name)
+
+                if self.compression_enabled and 'streamlink_proc' in self.streams[name]:
+                    threading.Thread(target=log_streamlink_stderr,
+                                     args=(self.streams[name]['streamlink_proc'].stderr,),
+                                     name=f"stream-log-streamlink:{name}", daemon=True).start()
 
                 def log_output():
                     try:
                         while proc.poll() is None:
                             line = proc.stdout.readline()
                             if line:
-                                self.log_streamlink(f"[{name}] {line.strip()}")
+                                self.log_stream_output(name, line.strip(), source)
                             else:
                                 time.sleep(0.1)
                         
-                        # Log stderr for compression mode
-                        if self.compression_enabled and hasattr(self.streams[name], 'streamlink_proc'):
-                            streamlink_proc = self.streams[name]['streamlink_proc']
-                            if streamlink_proc.stderr:
-                                streamlink_stderr = streamlink_proc.stderr.read()
-                                if streamlink_stderr:
-                                    for line in streamlink_stderr.splitlines():
-                                        self.log_streamlink(f"[{name}] [Streamlink] {line.strip()}")
-                        
                         # flush remaining output
                         remaining_output = proc.stdout.read()
                         if remaining_output:
                             for line in remaining_output.splitlines():
-                                self.log_streamlink(f"[{name}] {line.strip()}")
+                                self.log_stream_output(name, line.strip(), source)
                     except Exception as e:
-                        self.log_streamlink(f"[{name}] Logging error: {e}")
+                        self.log_streamlink(f"[{name}] Logging error: {e}", stream=name)
 
-                threading.Thread(target=log_output, daemon=True).start()
+                threading.Thread(target=log_output, name=f"stream-log:{name}", daemon=True).start()
 
                 return_code = proc.wait()
+                if self.streams[name].get('stop_requested'):
+                    # stop_stream() terminated the process and resets the state itself
+                    return
+
+                self.circuit_breaker.record_result(self.get_stream_host(name), name, return_code == 0)
+                self.streams[name]['state'] = 'Stopped'
+                self.streams[name]['process'] = None
+                self.update_tree_item(name)
+
                 if return_code == 0:
-                    self.log_streamlink(f"[{name}] Download completed successfully")
+                    self.log_streamlink(f"[{name}] Download completed successfully", stream=name)
                     self.log(f"Download completed: {name}")
                     # Reset retry count on successful completion
                     self.reset_retry_count(name)
                 else:
-                    self.log_streamlink(f"[{name}] Download failed - code: {return_code}")
+                    self.record_failure()
+                    self.log_streamlink(f"[{name}] Download failed - code: {return_code}", stream=name)
                     self.log(f"Download failed: {name} (code: {return_code})")
                     # Schedule error retry with progressive backoff
                     if self.streams[name]['delay'] > 0:
                         self.schedule_restart(name, is_error_retry=True)
 
-                self.streams[name]['state'] = 'Stopped'
-                self.streams[name]['process'] = None
-                self.update_tree_item(name)
-
                 # Only schedule normal restart if not already scheduled for error retry
                 if self.streams[name]['delay'] > 0 and return_code == 0:
                     self.schedule_restart(name)
 
             except Exception as e:
+                self.record_failure()
                 err = f"Error starting stream {name}: {e}"
                 self.log(err)
-                self.log_streamlink(f"[{name}] {err}")
+                self.log_streamlink(f"[{name}] {err}", stream=name)
                 self.streams[name]['state'] = 'Stopped'
                 self.streams[name]['process'] = None
                 self.update_tree_item(name)
 
-        threading.Thread(target=run, daemon=True).start()
+        threading.Thread(target=run, name=f"stream-run:{name}", daemon=True).start()
+
+    def record_failure(self):
+        with self.failures_lock:
+            self.failures += 1
+
+    def get_stream_host(self, name):
+        """Host part of a stream URL, used to group streams for the circuit breaker"""
+        try:
+            return urlsplit(self.streams[name]['url']).hostname or ''
+        except (KeyError, ValueError):
+            return ''
+
+    def _schedule_health_report(self, name, proc):
+        """Report the stream healthy to the circuit breaker once it has stayed up"""
+        def check():
+            if name in self.streams and self.streams[name]['process'] is proc and proc.poll() is None:
+                self.circuit_breaker.record_result(self.get_stream_host(name), name, True)
+
+        timer = threading.Timer(self.healthy_after, check)
+        timer.name = f"health-check:{name}"
+        timer.daemon = True
+        timer.start()
+
+    def _retry_through_breaker(self, name):
+        """Start a pending retry, or hold it while the stream's host circuit is open"""
+        if name not in self.streams or self.streams[name]['state'] not in ('Restarting', 'Held'):
+            return
+        host = self.get_stream_host(name)
+        if self.circuit_breaker.request_retry(host, name, self._retry_through_breaker):
+            self._start_stream_internal(name)
+        else:
+            self.streams[name]['state'] = 'Held'
+            self.streams[name]['restart_seconds'] = 0
+            self.update_tree_item(name)
 
     def calculate_retry_delay(self, name):
         """Calculate dynamic retry delay based on error pattern"""
@@ -315,7 +400,7 @@ class DownloaderCore:
             self.log(f"Scheduling error retry for {name} in {delay_seconds}s (attempt {self.streams[name]['retry_count']})")
         else:
             # Normal scheduled restart
-        delay_seconds = self.streams[name]['delay'] * 60
+            delay_seconds = self.streams[name]['delay'] * 60
             self.log(f"Scheduling normal restart for {name} in {delay_seconds}s")
         
         self.streams[name]['restart_seconds'] = delay_seconds
@@ -328,9 +413,10 @@ class DownloaderCore:
             self.streams[name]['restart_seconds'] -= 1
             self.update_tree_item(name)
             if self.streams[name]['restart_seconds'] <= 0:
-                self._start_stream_internal(name)
+                self._retry_through_breaker(name)
             else:
                 self.streams[name]['restart_timer'] = threading.Timer(1, countdown)
+                self.streams[name]['restart_timer'].name = f"restart-timer:{name}"
                 self.streams[name]['restart_timer'].start()
 
         countdown()
@@ -370,9 +456,9 @@ class DownloaderCore:
         try:
             if os.path.exists(output_file):
                 size = self.get_file_size(output_file)
-                self.log_streamlink(f"[{name}] Current file size: {size}")
+                self.log_streamlink(f"[{name}] Current file size: {size}", stream=name)
         except Exception as e:
-            self.log_streamlink(f"[{name}] Progress error: {e}")
+            self.log_streamlink(f"[{name}] Progress error: {e}", stream=name)
 
     def get_file_size(self, file_path):
         """Human-readable file size"""
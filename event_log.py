@@ -0,0 +1,266 @@
+# event_log.py
+"""
+EventLog - structured log records (timestamp, stream, source, level, message)
+kept in an SQLite database with indexes on stream, level and id, so the Log
+tab can filter large histories without scanning text and page through them
+by id (keyset paging) rather than OFFSET.
+"""
+
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from datetime import datetime
+
+LEVELS = ('debug', 'info', 'warning', 'error')
+
+# streamlink: "[cli][info] ...", "[stream.hls][warning] ..."; ffmpeg/other: keywords
+BRACKET_LEVEL = re.compile(r'\[[\w.]+\]\[(debug|info|warning|error|critical)\]', re.IGNORECASE)
+ERROR_WORDS = re.compile(r'\b(error|failed|failure|fatal|invalid)\b', re.IGNORECASE)
+WARNING_WORDS = re.compile(r'\b(warning|retry|retrying|timeout|timed out)\b', re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    stream TEXT,
+    source TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+DROP INDEX IF EXISTS idx_events_stream_level_ts;
+DROP INDEX IF EXISTS idx_events_level_ts;
+CREATE INDEX IF NOT EXISTS idx_events_stream_level_id ON events(stream, level, id);
+CREATE INDEX IF NOT EXISTS idx_events_level_id ON events(level, id);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+"""
+ID_BATCH = 500  # ids per "id IN (...)" lookup, below SQLite's parameter limit
+
+
+def detect_level(message):
+    """Best-effort level of a log message"""
+    match = BRACKET_LEVEL.search(message)
+    if match:
+        level = match.group(1).lower()
+        return 'error' if level == 'critical' else level
+    if ERROR_WORDS.search(message):
+        return 'error'
+    if WARNING_WORDS.search(message):
+        return 'warning'
+    return 'info'
+
+
+def format_event(row):
+    """One display line for a (ts, stream, source, level, message) row"""
+    ts, stream, source, level, message = row
+    stamp = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+    prefix = f"[{stream}] " if stream else ""
+    return f"[{stamp}] {prefix}[{source}][{level}] {message}"
+
+
+class EventLog:
+    def __init__(self, path=None, logger=None, retention_days=14, flush_interval=0.5):
+        """
+        :param path: SQLite file (defaults to ~/.streamlink_downloader_events.db)
+        :param logger: function for logging messages e.g. print or UI log
+        :param retention_days: events older than this are purged when the database is opened
+        :param flush_interval: seconds the writer waits to batch records before committing
+        """
+        self.path = path or os.path.join(os.path.expanduser("~"), ".streamlink_downloader_events.db")
+        self.log = logger if logger else print
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self._read_conn = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._ready = threading.Event()
+        self.failed = False
+
+    # ----------------- Writing (any thread) -----------------
+    def record(self, message, stream=None, source='app', level=None, ts=None):
+        """Queue a structured record; the level is detected from the message if not given"""
+        if self.failed:
+            return
+        self.queue.put((ts or time.time(), stream, source, level or detect_level(message), message))
+        if self._thread is None:
+            self._ensure_thread()
+
+    def flush(self, timeout=5.0):
+        """Block until everything recorded so far is committed"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit pending records and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self.queue.put(None)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self._thread is None:
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self):
+        try:
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            if self.retention_days:
+                conn.execute("DELETE FROM events WHERE ts < ?", (time.time() - self.retention_days * 86400,))
+            conn.commit()
+        except sqlite3.Error as e:
+            self.failed = True
+            self._ready.set()
+            self.log(f"Error opening event log {self.path}: {e}")
+            return
+        self._ready.set()
+
+        while True:
+            try:
+                items = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+                continue
+            try:
+                while True:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            rows = [item for item in items if isinstance(item, tuple)]
+            if rows:
+                try:
+                    conn.executemany(
+                        "INSERT INTO events (ts, stream, source, level, message) VALUES (?, ?, ?, ?, ?)", rows)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    self.log(f"Error writing event log: {e}")
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+            if self._stop_event.is_set() and self.queue.empty():
+                break
+        conn.close()
+
+    # ----------------- Query API -----------------
+    def _where(self, stream=None, level=None, source=None, since=None, until=None, contains=None):
+        """SQL filter; `level` is a minimum severity (e.g. 'warning' also matches errors)"""
+        clauses, params = [], []
+        if stream is not None:
+            clauses.append("stream = ?")
+            params.append(stream)
+        if level is not None:
+            levels = LEVELS[LEVELS.index(level):]
+            clauses.append(f"level IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if contains:
+            clauses.append("message LIKE ? ESCAPE '\\'")
+            escaped = contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _read(self, sql, params):
+        if self._thread is not None:
+            self._ready.wait(5)
+        if self.failed or not os.path.exists(self.path):
+            return []
+        with self.lock:
+            if self._read_conn is None:
+                self._read_conn = self._connect()
+            try:
+                return self._read_conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError:
+                return []  # schema not created yet
+
+    def query(self, limit=1000, after_id=0, **filters):
+        """
+        Matching (id, ts, stream, source, level, message) rows with id > after_id, in recorded
+        order; pass the last id of a page to get the next one.
+        Filters: stream, level (minimum), source, since, until (epoch seconds), contains.
+        """
+        where, params = self._where(**filters)
+        where = f"{where} AND id > ?" if where else " WHERE id > ?"
+        return self._read(f"SELECT id, ts, stream, source, level, message FROM events{where} "
+                          f"ORDER BY id LIMIT ?", params + [after_id, limit])
+
+    def ids(self, **filters):
+        """Ids of all rows matching the query() filters, in recorded order (read from the indexes)"""
+        where, params = self._where(**filters)
+        return array('q', (row[0] for row in self._read(f"SELECT id FROM events{where} ORDER BY id", params)))
+
+    def rows(self, ids):
+        """(ts, stream, source, level, message) rows for ids in ascending order, looked up by primary key"""
+        rows = []
+        for start in range(0, len(ids), ID_BATCH):
+            batch = list(ids[start:start + ID_BATCH])
+            rows.extend(self._read(f"SELECT ts, stream, source, level, message FROM events "
+                                   f"WHERE id IN ({', '.join('?' * len(batch))}) ORDER BY id", batch))
+        return rows
+
+    def count(self, **filters):
+        """Number of rows matching the same filters as query()"""
+        where, params = self._where(**filters)
+        rows = self._read(f"SELECT COUNT(*) FROM events{where}", params)
+        return rows[0][0] if rows else 0
+
+    def streams(self):
+        """Names of all streams with recorded events"""
+        rows = self._read("SELECT DISTINCT stream FROM events WHERE stream IS NOT NULL ORDER BY stream", [])
+        return [row[0] for row in rows]
+
+
+class EventQueryStore:
+    """
+    Read-only, LogStore-like view of an EventLog query (for VirtualLogView paging).
+    The matching ids are read once, so a page at any position is fetched by primary
+    key in time proportional to its size. Creating one flushes the writer and reads
+    the index; do it off the Tk thread.
+    """
+
+    def __init__(self, events, **filters):
+        self.events = events
+        self.filters = filters
+        self.lock = threading.RLock()
+        events.flush()
+        self.ids = events.ids(**filters)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get_range(self, start, count):
+        start = max(0, start)
+        ids = self.ids[start:start + max(0, count)]
+        return [format_event(row) for row in self.events.rows(ids)] if ids else []
@@ -0,0 +1,118 @@
+# external_sort.py
+"""
+sort_rows - sorts CSV rows (lists of strings) that may not fit in memory.
+Rows are collected until an estimated memory budget is reached, each chunk
+is sorted and spilled to a temp CSV file (a "run"), and the runs are merged
+back with a k-way heap merge. Inputs that fit the budget are sorted in memory.
+Like list.sort, the order of rows with equal keys is preserved.
+"""
+
+import csv
+import heapq
+import os
+import tempfile
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024  # bytes of row data held before spilling a run
+MAX_FAN_IN = 64                            # runs merged at once (each holds an open file)
+
+# Rough CPython cost of a row list and of each str in it, on top of the characters
+ROW_OVERHEAD = 72
+FIELD_OVERHEAD = 57
+
+
+def estimate_row_size(row):
+    return ROW_OVERHEAD + FIELD_OVERHEAD * len(row) + sum(map(len, row))
+
+
+def sort_rows(rows, key, memory_budget=DEFAULT_MEMORY_BUDGET, temp_dir=None, fan_in=MAX_FAN_IN, on_spill=None):
+    """
+    Yield rows in key order.
+    :param rows: iterable of row lists
+    :param key: function(row) -> sort key
+    :param memory_budget: estimated bytes of rows held in memory before a sorted run is spilled
+    :param temp_dir: folder for run files (system temp folder if None)
+    :param fan_in: maximum runs merged in one pass; more runs are merged in several passes
+    :param on_spill: optional function(run count, rows spilled so far) called after each spill
+    """
+    runs = []
+    created = []  # every run file, removed however the sort ends
+    try:
+        chunk = []
+        size = 0
+        spilled = 0
+        for row in rows:
+            chunk.append(row)
+            size += estimate_row_size(row)
+            if size >= memory_budget:
+                chunk.sort(key=key)
+                runs.append(_write_run(chunk, temp_dir, created))
+                spilled += len(chunk)
+                chunk = []
+                size = 0
+                if on_spill is not None:
+                    on_spill(len(runs), spilled)
+
+        chunk.sort(key=key)
+        if not runs:
+            yield from chunk
+            return
+        if chunk:
+            runs.append(_write_run(chunk, temp_dir, created))
+        del chunk
+
+        # Merging neighbouring runs keeps rows with equal keys in input order
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                files = _open_runs(group)
+                try:
+                    merged.append(_write_run(heapq.merge(*map(csv.reader, files), key=key), temp_dir, created))
+                finally:
+                    _close_runs(files)
+                for path in group:
+                    _remove(path)
+            runs = merged
+
+        files = _open_runs(runs)
+        try:
+            yield from heapq.merge(*map(csv.reader, files), key=key)
+        finally:
+            _close_runs(files)
+    finally:
+        for path in created:
+            _remove(path)
+
+
+def _write_run(rows, temp_dir, created):
+    fd, path = tempfile.mkstemp(prefix='sort-run-', suffix='.csv', dir=temp_dir)
+    created.append(path)
+    with open(fd, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+def _open_runs(paths):
+    files = []
+    try:
+        for path in paths:
+            files.append(open(path, newline='', encoding='utf-8'))
+    except BaseException:
+        _close_runs(files)
+        raise
+    return files
+
+
+def _close_runs(files):
+    for f in files:
+        f.close()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,159 @@
+# fleet_metrics.py
+"""
+FleetMetrics - samples DownloaderCore on a fixed interval (recording streams,
+ingest rate, failures per minute, disk fill rate) into fixed-size ring
+buffers, so the dashboard draws a bounded history no matter how many streams
+are running.
+"""
+
+import os
+import shutil
+import threading
+import time
+from array import array
+
+# (key, title, unit) of each sampled series, in dashboard order
+SERIES = (
+    ('recording', 'Recording', 'streams'),
+    ('ingest_mbps', 'Ingest', 'Mbps'),
+    ('failures_per_min', 'Failures', '/min'),
+    ('disk_mb_s', 'Disk fill', 'MB/s'),
+)
+
+
+class RingBuffer:
+    """Last `capacity` float samples, oldest first"""
+
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.data = array('d', bytes(8 * self.capacity))
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        end = (self.start + self.count) % self.capacity
+        self.data[end] = value
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def values(self):
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.data[self.start:end].tolist()
+        return self.data[self.start:].tolist() + self.data[:end - self.capacity].tolist()
+
+    @property
+    def latest(self):
+        return self.data[(self.start + self.count - 1) % self.capacity] if self.count else 0.0
+
+
+class FleetMetrics:
+    def __init__(self, downloader, interval=2.0, history=300, logger=None):
+        """
+        :param downloader: DownloaderCore whose streams are sampled
+        :param interval: seconds between samples
+        :param history: samples kept per series (300 x 2s = 10 minutes)
+        :param logger: function for logging messages e.g. print or UI log
+        """
+        self.downloader = downloader
+        self.interval = interval
+        self.log = logger if logger else print
+
+        self.series = {key: RingBuffer(history) for key, _, _ in SERIES}
+        self.failure_totals = RingBuffer(history)  # DownloaderCore.failures at each sample
+        self.summary = {}   # latest aggregates (state counts, disk free, ...)
+        self.samples = 0    # bumped per sample so the UI only redraws when something changed
+        self.lock = threading.Lock()
+
+        self._sizes = {}    # stream -> (output file, size at the last sample)
+        self._disk_used = None
+        self._last_time = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='metrics-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.log(f"Metrics sampling error: {e}")
+            self._stop_event.wait(self.interval)
+
+    # ----------------- Sampling -----------------
+    def sample(self, now=None):
+        """Take one sample of every series"""
+        now = time.monotonic() if now is None else now
+        elapsed = None if self._last_time is None else max(1e-6, now - self._last_time)
+        self._last_time = now
+
+        states = {'Running': 0, 'Restarting': 0, 'Held': 0, 'Stopped': 0}
+        written = 0
+        sizes = {}
+        for name, stream in list(self.downloader.streams.items()):
+            state = stream.get('state', 'Stopped')
+            states[state] = states.get(state, 0) + 1
+            output = stream.get('output')
+            if state != 'Running' or not output:
+                continue
+            try:
+                size = os.stat(output).st_size
+            except OSError:
+                continue
+            sizes[name] = (output, size)
+            previous = self._sizes.get(name)
+            if previous is not None and previous[0] == output:
+                written += max(0, size - previous[1])
+            elif elapsed is not None:
+                written += size  # file started since the last sample
+        self._sizes = sizes
+
+        disk_rate, disk_free = 0.0, None
+        try:
+            usage = shutil.disk_usage(self.downloader.output_folder)
+            disk_free = usage.free
+            if self._disk_used is not None and elapsed is not None:
+                disk_rate = max(0, usage.used - self._disk_used) / elapsed / 1e6
+            self._disk_used = usage.used
+        except OSError:
+            pass
+
+        failures = getattr(self.downloader, 'failures', 0)
+        with self.lock:
+            self.failure_totals.append(failures)
+            totals = self.failure_totals.values()
+            window = min(len(totals) - 1, max(1, round(60 / self.interval)))
+            per_minute = 0.0
+            if window > 0:
+                per_minute = (totals[-1] - totals[-1 - window]) * 60 / (window * self.interval)
+
+            self.series['recording'].append(states['Running'])
+            self.series['ingest_mbps'].append(written * 8 / elapsed / 1e6 if elapsed else 0.0)
+            self.series['failures_per_min'].append(per_minute)
+            self.series['disk_mb_s'].append(disk_rate)
+            self.summary = {
+                'streams': sum(states.values()),
+                'states': states,
+                'failures_total': failures,
+                'disk_free': disk_free,
+                'seconds_to_full': disk_free / (disk_rate * 1e6) if disk_free is not None and disk_rate > 0 else None,
+            }
+            self.samples += 1
+
+    def snapshot(self):
+        """(sample count, {key: values oldest first}, summary) for drawing"""
+        with self.lock:
+            return self.samples, {key: ring.values() for key, ring in self.series.items()}, dict(self.summary)
@@ -0,0 +1,195 @@
+# job_runner.py
+"""
+JobRunner - runs long CSV/Video tool operations on a small pool of worker
+threads. Jobs report progress through a callback that also raises
+JobCancelled once they are cancelled; the UI polls the runner from after()
+to show progress and to handle finished jobs on the Tk thread.
+"""
+
+import atexit
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+
+class JobCancelled(Exception):
+    """Raised from a job's progress callback after the job was cancelled"""
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_seconds(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class Job:
+    def __init__(self, job_id, title, func, args, kwargs, key=None, on_done=None):
+        self.id = job_id
+        self.title = title
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.on_done = on_done
+
+        self.state = 'queued'   # queued, running, done, failed, cancelled
+        self.status = 'Queued'  # latest progress text
+        self.fraction = None    # 0.0 - 1.0 when the total is known
+        self.result = None
+        self.error = None
+        self.started = None
+        self.ended = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def active(self):
+        return self.state in ('queued', 'running')
+
+    def cancel(self):
+        """Ask the job to stop at its next progress report (queued jobs never start)"""
+        self._cancel_event.set()
+
+    def report(self, rows=None, bytes_read=None, total_bytes=None, seconds=None, message=None):
+        """Progress callback handed to the tools as `progress=`"""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        parts = [message] if message else []
+        if rows is not None:
+            parts.append(f"{rows:,} rows")
+        if bytes_read is not None:
+            if total_bytes:
+                self.fraction = min(1.0, bytes_read / total_bytes)
+                parts.append(f"{format_bytes(bytes_read)} / {format_bytes(total_bytes)} ({self.fraction:.0%})")
+            else:
+                parts.append(format_bytes(bytes_read))
+        if seconds is not None:
+            parts.append(f"{format_seconds(seconds)} processed")
+        if parts:
+            self.status = ", ".join(parts)
+
+
+class JobRunner:
+    def __init__(self, max_workers=2, logger=None, keep_finished=20):
+        """
+        :param max_workers: jobs that may run at the same time
+        :param logger: function for logging messages e.g. print or UI log
+        :param keep_finished: finished jobs kept in `jobs` for display
+        """
+        self.max_workers = max(1, max_workers)
+        self.log = logger if logger else print
+        self.keep_finished = keep_finished
+
+        self.jobs = OrderedDict()        # id -> Job, oldest first
+        self.queue = queue.SimpleQueue()
+        self.finished = queue.SimpleQueue()
+        self.key_locks = {}              # jobs with the same key run one after another
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads = []
+
+    def submit(self, title, func, *args, key=None, on_done=None, **kwargs):
+        """
+        Queue func(*args, progress=job.report, **kwargs).
+        :param key: e.g. the file the job rewrites; jobs sharing a key never overlap
+        :param on_done: called with the job on the thread that calls poll()
+        """
+        job = Job(next(self._ids), title, func, args, kwargs, key, on_done)
+        with self.lock:
+            self.jobs[job.id] = job
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{len(self._threads) + 1}',
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+                if len(self._threads) == 1:
+                    atexit.register(self.cancel_all)
+        self.queue.put(job)
+        self.log(f"Job queued: {title}")
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None and job.active:
+            job.cancel()
+            job.status = 'Cancelling...' if job.state == 'running' else 'Cancelled'
+
+    def cancel_all(self):
+        for job in list(self.jobs.values()):
+            self.cancel(job.id)
+
+    def active_jobs(self):
+        return [job for job in list(self.jobs.values()) if job.active]
+
+    def poll(self):
+        """Run on_done for jobs finished since the last call; returns True while jobs are active"""
+        while True:
+            try:
+                job = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            if job.on_done is not None:
+                try:
+                    job.on_done(job)
+                except Exception as e:
+                    self.log(f"Error handling result of {job.title}: {e}")
+        with self.lock:
+            done = [job_id for job_id, job in self.jobs.items() if not job.active]
+            for job_id in done[:max(0, len(done) - self.keep_finished)]:
+                del self.jobs[job_id]
+        return bool(self.active_jobs())
+
+    # ----------------- Worker Threads -----------------
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            if job.cancelled:
+                self._finish(job, 'cancelled', 'Cancelled')
+                continue
+            if job.key is None:
+                self._run(job)
+                continue
+            with self.lock:
+                key_lock = self.key_locks.setdefault(job.key, threading.Lock())
+            if not key_lock.acquire(blocking=False):
+                job.status = 'Waiting for another job on the same file'
+                key_lock.acquire()
+            try:
+                self._run(job)
+            finally:
+                key_lock.release()
+
+    def _run(self, job):
+        if job.cancelled:
+            self._finish(job, 'cancelled', 'Cancelled')
+            return
+        job.state = 'running'
+        job.status = 'Starting...'
+        job.started = time.monotonic()
+        try:
+            job.result = job.func(*job.args, progress=job.report, **job.kwargs)
+        except JobCancelled:
+            self._finish(job, 'cancelled', 'Cancelled')
+        except Exception as e:
+            job.error = e
+            self._finish(job, 'failed', f"Failed: {e}")
+        else:
+            self._finish(job, 'done', f"Done in {time.monotonic() - job.started:.1f}s")
+
+    def _finish(self, job, state, status):
+        job.state = state
+        job.status = status
+        job.ended = time.monotonic()
+        self.log(f"Job {state}: {job.title}")
+        self.finished.put(job)
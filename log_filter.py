@@ -0,0 +1,197 @@
+# log_filter.py
+"""
+LogFilter - decides at the source whether a process output line is logged at
+all, before any formatting: global and per-stream minimum levels plus sampling
+of periodic progress lines (ffmpeg stats, streamlink download progress).
+LineThrottle - merges repeated lines and caps each stream's line rate.
+"""
+
+import re
+import threading
+import time
+
+from event_log import detect_level
+
+LEVEL_RANK = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+# ffmpeg stats ("frame=  250 fps= 30 ... speed=1x"), -progress key=value pairs and
+# streamlink "[download] Written 12.0 MiB ..." lines
+PROGRESS_LINE = re.compile(
+    r'(?:frame=\s*\d+|size=\s*\S+\s+time=|\[download\]|'
+    r'(?:fps|bitrate|total_size|out_time\w*|speed|progress|dup_frames|drop_frames|stream_\d+_\d+_q)=)'
+)
+
+
+class LogFilter:
+    def __init__(self, level='info', progress_interval=10.0):
+        """
+        :param level: global minimum level ('debug', 'info', 'warning', 'error')
+        :param progress_interval: keep one progress line per stream every N seconds
+                                  (None keeps all, 0 drops all)
+        """
+        self.threshold = LEVEL_RANK[level]
+        self.progress_interval = progress_interval
+        self.stream_thresholds = {}
+        self.last_progress = {}
+        self.passed = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    @property
+    def level(self):
+        return next(name for name, rank in LEVEL_RANK.items() if rank == self.threshold)
+
+    def set_level(self, level):
+        """Change the global minimum level"""
+        self.threshold = LEVEL_RANK[level]
+
+    def set_stream_level(self, stream, level):
+        """Override the minimum level for one stream (None restores the global level)"""
+        if level is None:
+            self.stream_thresholds.pop(stream, None)
+        else:
+            self.stream_thresholds[stream] = LEVEL_RANK[level]
+
+    def get_stream_level(self, stream):
+        rank = self.stream_thresholds.get(stream)
+        return None if rank is None else next(name for name, r in LEVEL_RANK.items() if r == rank)
+
+    def check(self, stream, line):
+        """Level of a line that should be logged, or None if it is filtered out"""
+        threshold = self.stream_thresholds.get(stream, self.threshold)
+
+        if PROGRESS_LINE.match(line):
+            if threshold > LEVEL_RANK['info'] or not self._sample_progress(stream):
+                self.dropped += 1
+                return None
+            self.passed += 1
+            return 'info'
+
+        level = detect_level(line)
+        if LEVEL_RANK[level] < threshold:
+            self.dropped += 1
+            return None
+        self.passed += 1
+        return level
+
+    def _sample_progress(self, stream):
+        if self.progress_interval is None:
+            return True
+        if not self.progress_interval:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_progress.get(stream, float('-inf')) < self.progress_interval:
+                return False
+            self.last_progress[stream] = now
+        return True
+
+
+class LineThrottle:
+    """
+    Per-stream dedup and rate cap: identical consecutive lines within
+    `repeat_window` collapse into one "repeated N times" summary, and a token
+    bucket caps each stream at `rate` lines/second (bursts up to `burst`),
+    counting what it drops.
+    """
+
+    def __init__(self, repeat_window=30.0, rate=20.0, burst=200):
+        """
+        :param repeat_window: seconds over which identical consecutive lines are merged
+        :param rate: sustained lines per second allowed per stream (0 disables the cap)
+        :param burst: lines a quiet stream may emit at once
+        """
+        self.repeat_window = repeat_window
+        self.rate = rate
+        self.burst = burst
+        self.states = {}
+        self.repeats_merged = 0
+        self.rate_dropped = 0
+        self.overflow = {}  # stream -> lines dropped by the rate cap since start
+        self.lock = threading.Lock()
+
+    def process(self, stream, line, level, source='streamlink', now=None):
+        """(line, level) pairs to log for an incoming line - may be empty or include summaries"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            state = self.states.get(stream)
+            if state is None:
+                state = self.states[stream] = {
+                    'last': None, 'level': None, 'repeats': 0, 'since': now, 'source': source,
+                    'tokens': float(self.burst), 'refilled': now, 'dropped': 0, 'dropped_since': now
+                }
+
+            if line == state['last'] and now - state['since'] < self.repeat_window:
+                state['repeats'] += 1
+                self.repeats_merged += 1
+                return []
+
+            out = self._repeat_summary(state)
+            state['last'], state['level'], state['repeats'], state['since'] = line, level, 0, now
+            state['source'] = source  # pending summaries are logged under the source of their lines
+
+            if self.rate:
+                state['tokens'] = min(self.burst, state['tokens'] + (now - state['refilled']) * self.rate)
+                state['refilled'] = now
+                if state['tokens'] < 1:
+                    if not state['dropped']:
+                        state['dropped_since'] = now
+                    state['dropped'] += 1
+                    state['last'] = None  # never shown, so repeats must not be summarised
+                    self.rate_dropped += 1
+                    self.overflow[stream] = self.overflow.get(stream, 0) + 1
+                    return out
+                state['tokens'] -= 1
+
+            if state['dropped'] and state['tokens'] >= 1:
+                state['tokens'] -= 1  # the summary is a line too; under sustained overload expire() reports it
+                out.extend(self._dropped_summary(state))
+            out.append((line, level))
+            return out
+
+    def flush(self, stream):
+        """Pending (source, line, level) summaries for one stream (e.g. before it logs its exit status)"""
+        with self.lock:
+            state = self.states.get(stream)
+            if state is None:
+                return []
+            out = [(state['source'], line, level) for line, level in self._summaries(state)]
+            state['last'] = None
+            return out
+
+    def expire(self, now=None):
+        """(stream, source, line, level) summaries whose repeat window has run out"""
+        now = time.monotonic() if now is None else now
+        out = []
+        with self.lock:
+            for stream, state in self.states.items():
+                if state['repeats'] and now - state['since'] >= self.repeat_window:
+                    out.extend((stream, state['source'], line, level) for line, level in self._repeat_summary(state))
+                    state['since'] = now
+                if state['dropped'] and now - state['dropped_since'] >= self.repeat_window:
+                    out.extend((stream, state['source'], line, level) for line, level in self._dropped_summary(state))
+        return out
+
+    def _summaries(self, state):
+        return self._repeat_summary(state) + self._dropped_summary(state)
+
+    def _repeat_summary(self, state):
+        if not state['repeats']:
+            return []
+        repeats, state['repeats'] = state['repeats'], 0
+        return [(f"Last message repeated {repeats} times", state['level'])]
+
+    def _dropped_summary(self, state):
+        if not state['dropped']:
+            return []
+        dropped, state['dropped'] = state['dropped'], 0
+        return [(f"{dropped} lines dropped (rate limit {self.rate:g} lines/s)", 'warning')]
+
+    def stats(self):
+        """Counters for diagnostics"""
+        with self.lock:
+            return {
+                'repeats_merged': self.repeats_merged,
+                'rate_dropped': self.rate_dropped,
+                'noisiest': sorted(self.overflow.items(), key=lambda item: item[1], reverse=True)[:10]
+            }
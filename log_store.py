@@ -0,0 +1,144 @@
+# log_store.py
+"""
+LogStore - bounded in-memory log buffer that spills older lines to
+compressed chunks on disk, so long sessions keep a fixed memory budget while
+the full history stays available for paging and export.
+"""
+
+import atexit
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from itertools import islice
+
+# Entries may contain newlines (e.g. FFmpeg error output), so chunks use a record separator
+RECORD_SEPARATOR = '\x1e'
+
+
+class LogStore:
+    def __init__(self, name, max_lines=50000, chunk_lines=10000, spill_dir=None):
+        """
+        :param name: prefix for spill files (e.g. 'application', 'streamlink')
+        :param max_lines: line budget kept in memory
+        :param chunk_lines: lines written per compressed chunk when the budget is exceeded
+        :param spill_dir: folder for chunks (a private temp folder, removed at exit, if None)
+        """
+        self.name = name
+        self.max_lines = max(1, max_lines)
+        self.chunk_lines = max(1, min(chunk_lines, self.max_lines))
+        self.spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+
+        self.lock = threading.RLock()
+        self.lines = deque()
+        self.chunks = []       # [(path, line_count)] oldest first
+        self.spilled = 0       # total lines held in chunks
+        self._chunk_seq = 0
+        self._chunk_cache = (None, None)
+
+    def __len__(self):
+        with self.lock:
+            return self.spilled + len(self.lines)
+
+    def __iter__(self):
+        return self.iter_all()
+
+    # ----------------- Writing -----------------
+    def append(self, line):
+        """Add a line, spilling the oldest chunk to disk if over budget; returns its index"""
+        with self.lock:
+            self.lines.append(line)
+            if len(self.lines) > self.max_lines:
+                self._spill()
+            return self.spilled + len(self.lines) - 1
+
+    def extend(self, lines):
+        """Add several lines at once"""
+        with self.lock:
+            self.lines.extend(lines)
+            while len(self.lines) > self.max_lines:
+                self._spill()
+
+    def _spill(self):
+        """Move the oldest chunk_lines lines from memory into a gzip chunk"""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix=f"streamlink_{self.name}_log_")
+            atexit.register(self._remove_spill_dir)
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        count = min(self.chunk_lines, len(self.lines))
+        chunk = [self.lines.popleft() for _ in range(count)]
+        self._chunk_seq += 1
+        path = os.path.join(self.spill_dir, f"{self.name}_{self._chunk_seq:06d}.log.gz")
+        with gzip.open(path, 'wt', encoding='utf-8', compresslevel=3) as f:
+            f.write(RECORD_SEPARATOR.join(chunk))
+        self.chunks.append((path, count))
+        self.spilled += count
+
+    # ----------------- Reading -----------------
+    def _read_chunk(self, path):
+        cached_path, cached_lines = self._chunk_cache
+        if cached_path == path:
+            return cached_lines
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+            lines = f.read().split(RECORD_SEPARATOR)
+        self._chunk_cache = (path, lines)
+        return lines
+
+    def get_range(self, start, count):
+        """Lines [start, start+count) of the full history, oldest line is index 0"""
+        with self.lock:
+            total = self.spilled + len(self.lines)
+            start = max(0, start)
+            end = min(total, start + max(0, count))
+            result = []
+            offset = 0
+            for path, chunk_count in self.chunks:
+                if offset + chunk_count > start and offset < end:
+                    lines = self._read_chunk(path)
+                    result.extend(lines[max(0, start - offset):end - offset])
+                offset += chunk_count
+                if offset >= end:
+                    return result
+            if end > offset:
+                result.extend(islice(self.lines, max(0, start - offset), end - offset))
+            return result
+
+    def tail(self, count):
+        """The most recent `count` lines"""
+        total = len(self)
+        return self.get_range(total - count, count)
+
+    def iter_all(self):
+        """Iterate the full history, oldest first (chunks are read one at a time)"""
+        with self.lock:
+            chunks = list(self.chunks)
+            memory = list(self.lines)
+        for path, _ in chunks:
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+                    yield from f.read().split(RECORD_SEPARATOR)
+            except FileNotFoundError:
+                continue  # cleared while exporting
+        yield from memory
+
+    # ----------------- Maintenance -----------------
+    def clear(self):
+        """Drop all lines in memory and on disk"""
+        with self.lock:
+            self.lines.clear()
+            for path, _ in self.chunks:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.chunks.clear()
+            self.spilled = 0
+            self._chunk_cache = (None, None)
+
+    def _remove_spill_dir(self):
+        if self._owns_spill_dir and self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
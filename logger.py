@@ -4,81 +4,260 @@ Logger - Centralized logging for the Streamlink Downloader application.
 Handles application logs, Streamlink logs, status bar updates, and exporting logs.
 """
 
+import queue
+import time
 import tkinter as tk
 from datetime import datetime
 from tkinter import filedialog, messagebox
 
+from event_log import EventLog
+from log_filter import LineThrottle, LogFilter
+from log_store import LogStore
+from stream_log_writer import StreamLogWriter
+
+# Fallback colors for widgets that don't configure the log tags themselves
+DEFAULT_TAG_COLORS = {'error': 'red', 'success': 'green'}
+
+
+def app_log_tag(line):
+    """Highlight tag for an application log line"""
+    if "Error" in line:
+        return 'error'
+    if "Starting" in line:
+        return 'success'
+    return None
+
 
 class Logger:
-    def __init__(self, status_updater=None, app_log_widget=None, streamlink_log_widget=None):
+    def __init__(self, status_updater=None, app_log_widget=None, streamlink_log_widget=None,
+                 max_log_lines=50000, flush_interval=100, max_batch=20000, event_log_path=None):
         """
         :param status_updater: Function to update status bar label
         :param app_log_widget: Tk Text widget for app logs
         :param streamlink_log_widget: Tk Text widget for streamlink logs
+        :param max_log_lines: lines kept in memory per log; older lines spill to compressed files
+        :param flush_interval: milliseconds between UI flushes of queued log lines
+        :param max_batch: maximum queued records inserted per flush
+        :param event_log_path: SQLite file for structured records (default ~/.streamlink_downloader_events.db)
         """
         self.update_status = status_updater if status_updater else lambda msg: None
         self.app_log_text = app_log_widget
         self.streamlink_log_text = streamlink_log_widget
+        self.auto_scroll = lambda: True
+
+        self.app_logs = LogStore('application', max_lines=max_log_lines)
+        self.streamlink_logs = LogStore('streamlink', max_lines=max_log_lines)
+
+        # Per-stream log files next to the recordings (written by a background thread)
+        self.stream_files = StreamLogWriter(logger=self.log_to_console)
+
+        # Structured records (stream, source, level) for filtered queries
+        self.events = EventLog(path=event_log_path)
+
+        # Level/progress filtering of process output before it is formatted
+        self.log_filter = LogFilter()
+        # Repeated-line merging and per-stream rate cap so one noisy stream can't flood the logs
+        self.throttle = LineThrottle()
+        self._next_expire = 0
+        self._clock = (None, None, None)  # (second, "HH:MM:SS", "YYYY-mm-dd HH:MM:SS")
+
+        # Worker threads only enqueue; the Tk main loop drains on an after() tick
+        self.ui_queue = queue.SimpleQueue()
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.root = None
+        self._tagged_widgets = set()
+        self.views = {}  # 'app' / 'streamlink' -> VirtualLogView
 
-        self.app_logs = []
-        self.streamlink_logs = []
+        widget = app_log_widget or streamlink_log_widget
+        if widget is not None:
+            self.attach(widget)
+
+    def attach(self, root):
+        """Start delivering log lines and status updates through the Tk loop of `root` (main thread only)."""
+        if self.root is None:
+            self.root = root
+            self.root.after(self.flush_interval, self._flush_ui_queue)
+
+    def set_log_view(self, view, app_log=True):
+        """Render a log through a VirtualLogView instead of appending to its widget directly."""
+        self.views['app' if app_log else 'streamlink'] = view
+
+    def _timestamps(self):
+        """(epoch time, "HH:MM:SS", "YYYY-mm-dd HH:MM:SS"); the strings are formatted once per second."""
+        now = time.time()
+        clock = self._clock
+        second = int(now)
+        if clock[0] != second:
+            dt = datetime.fromtimestamp(second)
+            clock = (second, dt.strftime("%H:%M:%S"), dt.strftime("%Y-%m-%d %H:%M:%S"))
+            self._clock = clock
+        return now, clock[1], clock[2]
 
     # ----------------- General Application Logging -----------------
     def log_to_console(self, message):
         """Log normal application messages with timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        now, timestamp, _ = self._timestamps()
         log_entry = f"[{timestamp}] {message}"
-        self.app_logs.append(log_entry)
+        # Queued under the store lock, so the view receives records in index order
+        with self.app_logs.lock:
+            index = self.app_logs.append(log_entry)
+            if self.root is not None:
+                self.ui_queue.put(('app', (index, log_entry, app_log_tag(message))))
+        self.events.record(message, source='app', ts=now)
 
         # Console print
         print(log_entry)
 
-        # Update status bar
-        self.update_status(message)
-
-        # Update app log text widget if available
-        if self.app_log_text:
-            self.app_log_text.config(state='normal')
+        if self.root is None:
+            self.update_status(message)
+            return
+        self.ui_queue.put(('status', message))
 
-            if "Error" in message:
-                self._insert_colored(self.app_log_text, log_entry, "error", "red")
-            elif "Starting" in message:
-                self._insert_colored(self.app_log_text, log_entry, "success", "green")
-            else:
-                self.app_log_text.insert(tk.END, log_entry + '\n')
-
-            self.app_log_text.see(tk.END)
-            self.app_log_text.config(state='disabled')
+    def post_status(self, message):
+        """Update the status bar from any thread (delivered by the UI pump)."""
+        if self.root is None:
+            self.update_status(message)
+            return
+        self.ui_queue.put(('status', message))
 
     # ----------------- Streamlink Logging -----------------
-    def log_streamlink(self, message):
-        """Log streamlink output messages with timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+    def log_streamlink(self, message, stream=None, source='streamlink', level=None):
+        """
+        Log streamlink output messages with timestamp.
+        With `stream`, the line also goes to the stream's own file and is recorded
+        as a structured event (source is 'streamlink', 'ffmpeg' or 'app').
+        """
+        if stream is not None:
+            # Summaries of merged/dropped output belong before the stream's next own message
+            for summary_source, text, summary_level in self.throttle.flush(stream):
+                self._log_streamlink(f"[{stream}] {text}", stream, summary_source, summary_level)
+        self._log_streamlink(message, stream, source, level)
+
+    def _log_streamlink(self, message, stream, source, level):
+        now, timestamp, full_timestamp = self._timestamps()
         log_entry = f"[{timestamp}] {message}"
-        self.streamlink_logs.append(log_entry)
-
-        # Update UI if available
-        if self.streamlink_log_text:
-            self.streamlink_log_text.config(state='normal')
-            self.streamlink_log_text.insert(tk.END, log_entry + '\n')
-            self.streamlink_log_text.see(tk.END)
-            self.streamlink_log_text.config(state='disabled')
-
-    # ----------------- Internal helper -----------------
-    def _insert_colored(self, widget, text, tag, color):
-        """Insert colored log message into a Text widget."""
-        widget.insert(tk.END, text + '\n')
-        line_start = widget.index("end-2c linestart")
-        line_end = widget.index("end-2c lineend")
-        widget.tag_add(tag, line_start, line_end)
-        widget.tag_config(tag, foreground=color)
+        # Queued under the store lock (before the file and event writes), so records from
+        # concurrent stream threads reach the view in index order
+        with self.streamlink_logs.lock:
+            index = self.streamlink_logs.append(log_entry)
+            if self.root is not None:
+                self.ui_queue.put(('streamlink', (index, log_entry, None)))
+
+        if stream is not None:
+            self.stream_files.write(stream, f"[{full_timestamp}] {message}")
+            prefix = f"[{stream}] "
+            text = message[len(prefix):] if message.startswith(prefix) else message
+            self.events.record(text, stream=stream, source=source, level=level, ts=now)
+        else:
+            self.events.record(message, source=source, level=level, ts=now)
+
+    def log_stream_output(self, stream, line, source='streamlink'):
+        """
+        Log one line of streamlink/ffmpeg output for `stream`.
+        Lines below the stream's (or global) level and surplus progress lines are
+        dropped here, before any formatting or storage; repeats are then merged and
+        the stream's line rate capped.
+        """
+        self._expire_due()
+        level = self.log_filter.check(stream, line)
+        if level is None:
+            return
+        for text, text_level in self.throttle.process(stream, line, level, source):
+            self._log_streamlink(f"[{stream}] {text}", stream, source, text_level)
+
+    def expire_repeats(self):
+        """Log "repeated N times" / "lines dropped" summaries whose window has run out."""
+        for stream, source, text, level in self.throttle.expire():
+            self._log_streamlink(f"[{stream}] {text}", stream, source, level)
+
+    def _expire_due(self):
+        """Run expire_repeats() at most once a second; driven by both stream output and the UI pump"""
+        now = time.monotonic()
+        if now >= self._next_expire:
+            self._next_expire = now + 1
+            self.expire_repeats()
+
+    def register_stream_log(self, name, folder):
+        """Write this stream's streamlink output to `folder/<name>.log` from now on."""
+        safe_name = ''.join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip() or 'stream'
+        self.stream_files.register(name, folder, f"{safe_name}.log")
+
+    # ----------------- UI Pump (Tk main thread) -----------------
+    def _flush_ui_queue(self):
+        """after() tick: drain one batch and reschedule, sooner while there is a backlog."""
+        self._expire_due()
+        try:
+            backlog = self._drain_ui_queue()
+        except tk.TclError:
+            return  # window destroyed
+        self.root.after(1 if backlog else self.flush_interval, self._flush_ui_queue)
+
+    def flush(self):
+        """Deliver everything queued so far right away (main thread only)."""
+        while self._drain_ui_queue():
+            pass
+
+    def _drain_ui_queue(self):
+        """Insert up to max_batch queued records with one call per widget; returns True if more remain."""
+        batches = {'app': [], 'streamlink': []}
+        status = None
+        try:
+            for _ in range(self.max_batch):
+                kind, payload = self.ui_queue.get_nowait()
+                if kind == 'status':
+                    status = payload
+                else:
+                    batches[kind].append(payload)
+        except queue.Empty:
+            pass
+
+        for kind, widget in (('app', self.app_log_text), ('streamlink', self.streamlink_log_text)):
+            records = batches[kind]
+            if not records:
+                continue
+            if kind in self.views:
+                self.views[kind].append(records)
+            elif widget:
+                self._insert_batch(widget, records)
+        if status is not None:
+            self.update_status(status)
+        return not self.ui_queue.empty()
+
+    def _insert_batch(self, widget, records):
+        """Insert (index, entry, tag) records in a single Text.insert, merging runs with the same tag."""
+        if widget not in self._tagged_widgets:
+            for tag, color in DEFAULT_TAG_COLORS.items():
+                if not widget.tag_cget(tag, 'foreground'):
+                    widget.tag_configure(tag, foreground=color)
+            self._tagged_widgets.add(widget)
+
+        args = []
+        run_tag, run = None, []
+        for _, entry, tag in records:
+            if run and tag != run_tag:
+                args += ['\n'.join(run) + '\n', run_tag or ()]
+                run = []
+            run_tag = tag
+            run.append(entry)
+        args += ['\n'.join(run) + '\n', run_tag or ()]
+
+        widget.config(state='normal')
+        widget.insert(tk.END, *args)
+        if self.auto_scroll():
+            widget.see(tk.END)
+        widget.config(state='disabled')
 
     # ----------------- Clear Logs -----------------
     def clear_logs(self, app_log=True, streamlink_log=True):
         """Clear logs from memory and UI."""
+        if self.root is not None:
+            self.flush()  # lines queued before the clear must not land after it
         if app_log:
             self.app_logs.clear()
-            if self.app_log_text:
+            if 'app' in self.views:
+                self.views['app'].reset()
+            elif self.app_log_text:
                 self.app_log_text.config(state='normal')
                 self.app_log_text.delete(1.0, tk.END)
                 self.app_log_text.config(state='disabled')
@@ -86,12 +265,24 @@ class Logger:
 
         if streamlink_log:
             self.streamlink_logs.clear()
-            if self.streamlink_log_text:
+            if 'streamlink' in self.views:
+                self.views['streamlink'].reset()
+            elif self.streamlink_log_text:
                 self.streamlink_log_text.config(state='normal')
                 self.streamlink_log_text.delete(1.0, tk.END)
                 self.streamlink_log_text.config(state='disabled')
             self.log_to_console("Streamlink log cleared")
 
+    # ----------------- History Paging -----------------
+    def get_log_count(self, app_log=True):
+        """Total number of lines in a log, including those spilled to disk."""
+        return len(self.app_logs if app_log else self.streamlink_logs)
+
+    def get_log_lines(self, start, count, app_log=True):
+        """Page through a log's full history; line 0 is the oldest."""
+        store = self.app_logs if app_log else self.streamlink_logs
+        return store.get_range(start, count)
+
     # ----------------- Export Logs -----------------
     def export_logs(self, app_log=True):
         """Export logs to a file."""
@@ -105,10 +296,13 @@ class Logger:
                 with open(file, 'w', encoding='utf-8') as f:
                     if app_log:
                         f.write("=== Application Log ===\n")
-                        f.write("\n".join(self.app_logs))
+                        logs = self.app_logs
                     else:
                         f.write("=== Streamlink Log ===\n")
-                        f.write("\n".join(self.streamlink_logs))
+                        logs = self.streamlink_logs
+                    # Stream the full history (including spilled chunks) instead of joining it in memory
+                    for line in logs:
+                        f.write(line + "\n")
                 self.log_to_console(f"Log exported to {file}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not export log:\n{e}")
@@ -0,0 +1,229 @@
+# profiler.py
+"""
+SamplingProfiler - low-overhead, runtime-toggleable sampling profiler.
+Samples the stacks of all threads on an interval, tags each sample with the
+subsystem it is spending time in (downloader, logger, catalog, csv tools, ...)
+and writes collapsed stacks (flamegraph.pl / speedscope compatible) plus a
+top-N summary.
+PhaseTimer - wall-clock timing of named phases, used for the startup report.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+# Source file -> subsystem tag; modules in the ui package are 'ui', anything else 'other'
+SUBSYSTEMS = {
+    'downloader.py': 'downloader',
+    'circuit_breaker.py': 'downloader',
+    'fleet_metrics.py': 'metrics',
+    'resource_monitor.py': 'metrics',
+    'logger.py': 'logger',
+    'log_store.py': 'logger',
+    'stream_log_writer.py': 'logger',
+    'event_log.py': 'logger',
+    'log_filter.py': 'logger',
+    'stream_index.py': 'catalog',
+    'catalog_loader.py': 'catalog',
+    'catalog_cache.py': 'catalog',
+    'csv_tools.py': 'csv tools',
+    'csv_key_index.py': 'csv tools',
+    'external_sort.py': 'csv tools',
+    'csv_pipeline.py': 'csv tools',
+    'video_tools.py': 'csv tools',
+    'job_runner.py': 'csv tools',
+    'atomic_file.py': 'file io',
+    'app.py': 'ui',
+    'aero_style.py': 'ui',
+}
+
+THREAD_NUMBER = re.compile(r'\d+')
+
+
+class SamplingProfiler:
+    def __init__(self, logger=None, interval=0.01, output_dir=None, top_n=25):
+        """
+        :param logger: function for logging messages e.g. print or UI log
+        :param interval: seconds between samples
+        :param output_dir: folder for reports (defaults to ~/.streamlink_downloader_profiles)
+        :param top_n: number of functions listed in the summary
+        """
+        self.log = logger if logger else print
+        self.interval = interval
+        self.output_dir = output_dir or os.path.join(os.path.expanduser("~"), ".streamlink_downloader_profiles")
+        self.top_n = top_n
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._labels = {}
+        self._reset()
+
+    def _reset(self):
+        self.stacks = Counter()
+        self.self_time = Counter()
+        self.total_time = Counter()
+        self.threads = Counter()
+        self.subsystems = Counter()
+        self.thread_subsystems = defaultdict(Counter)
+        self.sample_count = 0
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # ----------------- Control -----------------
+    def start(self):
+        """Start sampling all threads; returns False if already running"""
+        if self.running:
+            return False
+        self._reset()
+        self._stop_event.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+        self._thread.start()
+        self.log(f"Profiler started (interval {self.interval * 1000:.0f} ms)")
+        return True
+
+    def stop(self, write_report=True):
+        """Stop sampling; writes the reports and returns their paths (or None)"""
+        if not self.running:
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.stopped_at = time.time()
+        self.log(f"Profiler stopped after {self.sample_count} samples")
+        return self.write_report() if write_report else None
+
+    def toggle(self):
+        """Start if stopped, stop if running; returns the report paths when stopping"""
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    # ----------------- Sampling -----------------
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._record(self._thread_role(names.get(thread_id, str(thread_id))), frame)
+            self.sample_count += 1
+
+    def _record(self, thread_name, frame):
+        labels = []
+        subsystem = None
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                filename = code.co_filename
+                base = os.path.basename(filename)
+                tag = SUBSYSTEMS.get(base)
+                if tag is None and os.path.basename(os.path.dirname(filename)) == 'ui':
+                    tag = 'ui'
+                label = (f"{code.co_name} ({base}:{code.co_firstlineno})", tag)
+                self._labels[code] = label
+            labels.append(label[0])
+            if subsystem is None and label[1]:
+                subsystem = label[1]
+            frame = frame.f_back
+
+        subsystem = subsystem or 'other'
+        labels.reverse()
+        self.stacks[';'.join([subsystem, thread_name] + labels)] += 1
+        self.self_time[labels[-1]] += 1
+        for label in set(labels):
+            self.total_time[label] += 1
+        self.threads[thread_name] += 1
+        self.subsystems[subsystem] += 1
+        self.thread_subsystems[thread_name][subsystem] += 1
+
+    def _thread_role(self, name):
+        """Fold per-stream/numbered thread names so threads of the same role aggregate"""
+        if ':' in name:
+            name = name.split(':', 1)[0]
+        return THREAD_NUMBER.sub('N', name)
+
+    # ----------------- Reports -----------------
+    def write_report(self):
+        """Write collapsed stacks and a text summary; returns (collapsed_path, summary_path)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        collapsed_path = os.path.join(self.output_dir, f"profile_{stamp}.collapsed")
+        summary_path = os.path.join(self.output_dir, f"profile_{stamp}_summary.txt")
+
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+
+        self.log(f"Profile written to {collapsed_path}")
+        return collapsed_path, summary_path
+
+    def summary(self):
+        """Human-readable top-N summary by subsystem, thread and function"""
+        duration = (self.stopped_at or time.time()) - (self.started_at or time.time())
+        total = sum(self.threads.values()) or 1
+        lines = [
+            "=== Sampling Profile ===",
+            f"Duration: {duration:.1f}s, samples: {self.sample_count}, "
+            f"thread samples: {sum(self.threads.values())}, interval: {self.interval * 1000:.0f} ms",
+            "",
+            "--- By subsystem ---"
+        ]
+        for subsystem, count in self.subsystems.most_common():
+            lines.append(f"{count / total:7.1%}  {subsystem}")
+
+        lines += ["", "--- By thread ---"]
+        for thread_name, count in self.threads.most_common():
+            split = ", ".join(f"{s} {c / count:.0%}" for s, c in self.thread_subsystems[thread_name].most_common(3))
+            lines.append(f"{count / total:7.1%}  {thread_name}  ({split})")
+
+        lines += ["", f"--- Top {self.top_n} functions (self) ---"]
+        for label, count in self.self_time.most_common(self.top_n):
+            lines.append(f"{count / total:7.1%}  {label}")
+
+        lines += ["", f"--- Top {self.top_n} functions (cumulative) ---"]
+        for label, count in self.total_time.most_common(self.top_n):
+            lines.append(f"{count / total:7.1%}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+class PhaseTimer:
+    """Durations of consecutive named phases (e.g. application startup)"""
+
+    def __init__(self, started=None):
+        """
+        :param started: time.perf_counter() value the first phase is measured from (now if None)
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = []  # [(name, seconds)]
+
+    def mark(self, name):
+        """End the current phase under `name` and start the next one"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.started
+
+    def report(self):
+        """One line per phase plus the total, in milliseconds"""
+        width = max((len(name) for name, _ in self.phases), default=5)
+        lines = [f"{name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'total':<{width}}  {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
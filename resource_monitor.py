@@ -0,0 +1,170 @@
+# resource_monitor.py
+"""
+ResourceMonitor - tracks threads (by role), child processes, open file
+descriptors and pipes against OS limits so new streams can be refused before
+a limit is actually hit.
+"""
+
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Threads this process plans for (about 1,300 streams at THREADS_PER_STREAM). It is a
+# per-process budget: past it, scheduling and per-thread stack memory degrade a single
+# process long before the OS refuses a thread
+THREAD_BUDGET = 4096
+
+# Approximate cost of one running stream (compression mode is the worst case)
+THREADS_PER_STREAM = 3   # run, log_output, restart/health timer
+FDS_PER_STREAM = 4       # stdout/stderr pipes held by the parent
+
+
+class ResourceMonitor:
+    def __init__(self, downloader=None, logger=None, max_threads=None, warn_ratio=0.8, refuse_ratio=0.95):
+        """
+        :param downloader: DownloaderCore whose child processes are counted
+        :param logger: function for logging messages e.g. print or UI log
+        :param max_threads: this process's thread budget (defaults to THREAD_BUDGET, capped by RLIMIT_NPROC)
+        :param warn_ratio: usage share of a limit that logs a warning
+        :param refuse_ratio: usage share of a limit at which new starts are refused
+        """
+        self.downloader = downloader
+        self.log = logger if logger else print
+        self.max_threads = max_threads or self._default_thread_limit()
+        self.warn_ratio = warn_ratio
+        self.refuse_ratio = refuse_ratio
+        self._last_warning = 0
+
+    # ----------------- Limits -----------------
+    def _default_thread_limit(self):
+        """
+        THREAD_BUDGET, lowered to RLIMIT_NPROC where that is smaller. RLIMIT_NPROC counts
+        all processes and threads of the user (usually unlimited), so it is only a ceiling
+        for this process, not a measure of its share.
+        """
+        if resource is not None and hasattr(resource, 'RLIMIT_NPROC'):
+            soft, _ = resource.getrlimit(resource.RLIMIT_NPROC)
+            if soft != resource.RLIM_INFINITY and soft > 0:
+                return min(soft, THREAD_BUDGET)
+        return THREAD_BUDGET
+
+    def fd_limit(self):
+        """Soft limit on open file descriptors, or None if unknown"""
+        if resource is None:
+            return None
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        return None if soft == resource.RLIM_INFINITY else soft
+
+    # ----------------- Gauges -----------------
+    def threads_by_role(self):
+        """Live threads grouped by the role prefix of their name (e.g. 'stream-run')"""
+        roles = {}
+        for thread in threading.enumerate():
+            name = thread.name
+            if ':' in name:
+                role = name.split(':', 1)[0]
+            elif name == 'MainThread':
+                role = 'main'
+            elif name.startswith('Thread-'):
+                role = 'other'
+            else:
+                role = name
+            roles[role] = roles.get(role, 0) + 1
+        return roles
+
+    def child_processes(self):
+        """Number of live streamlink/ffmpeg processes owned by the downloader"""
+        if self.downloader is None:
+            return 0
+        count = 0
+        for stream in list(self.downloader.streams.values()):
+            for key in ('process', 'streamlink_proc'):
+                proc = stream.get(key)
+                if proc is not None and proc.poll() is None:
+                    count += 1
+        return count
+
+    def open_fds(self):
+        """(open fd count, pipe fd count); (None, None) where the platform can't tell"""
+        for fd_dir in ('/proc/self/fd', '/dev/fd'):
+            if not os.path.isdir(fd_dir):
+                continue
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+            pipes = 0
+            if sys.platform.startswith('linux'):
+                for fd in fds:
+                    try:
+                        if os.readlink(os.path.join(fd_dir, fd)).startswith('pipe:'):
+                            pipes += 1
+                    except OSError:
+                        pass
+            else:
+                pipes = self.child_processes() * 2
+            return len(fds), pipes
+        return None, None
+
+    def snapshot(self):
+        """Current resource usage and limits as a dict"""
+        roles = self.threads_by_role()
+        fds, pipes = self.open_fds()
+        return {
+            'timestamp': time.time(),
+            'threads': sum(roles.values()),
+            'threads_by_role': roles,
+            'thread_limit': self.max_threads,
+            'child_processes': self.child_processes(),
+            'open_fds': fds,
+            'fd_limit': self.fd_limit(),
+            'pipes': pipes
+        }
+
+    def usage_ratio(self, snapshot=None, extra_streams=0):
+        """Highest usage share across the thread and fd limits, including planned streams"""
+        snap = snapshot or self.snapshot()
+        ratios = [(snap['threads'] + extra_streams * THREADS_PER_STREAM) / self.max_threads]
+        if snap['open_fds'] is not None and snap['fd_limit']:
+            ratios.append((snap['open_fds'] + extra_streams * FDS_PER_STREAM) / snap['fd_limit'])
+        return max(ratios)
+
+    # ----------------- Admission -----------------
+    def check_capacity(self, new_streams=1):
+        """
+        Decide whether new streams may start.
+        Returns (allowed, message); message is None when usage is comfortably below the limits.
+        """
+        snap = self.snapshot()
+        threads_after = snap['threads'] + new_streams * THREADS_PER_STREAM
+        fds_after = None if snap['open_fds'] is None else snap['open_fds'] + new_streams * FDS_PER_STREAM
+        usage = f"threads {threads_after}/{self.max_threads}"
+        if fds_after is not None and snap['fd_limit']:
+            usage += f", fds {fds_after}/{snap['fd_limit']}"
+
+        ratio = self.usage_ratio(snap, new_streams)
+        if ratio >= self.refuse_ratio:
+            return False, f"Resource limit reached ({usage}) - not starting new streams"
+        if ratio >= self.warn_ratio:
+            message = f"Warning: resources running low ({usage})"
+            now = time.time()
+            if now - self._last_warning > 30:
+                self._last_warning = now
+                self.log(message)
+            return True, message
+        return True, None
+
+    def format_status(self, snapshot=None):
+        """Compact one-line gauge text for the status bar"""
+        snap = snapshot or self.snapshot()
+        fds = "?" if snap['open_fds'] is None else snap['open_fds']
+        fd_limit = snap['fd_limit'] or "∞"
+        pipes = "?" if snap['pipes'] is None else snap['pipes']
+        return (f"🧵 {snap['threads']} thr  ⚙️ {snap['child_processes']} proc  "
+                f"📂 {fds}/{fd_limit} fd  🔗 {pipes} pipes")
@@ -0,0 +1,220 @@
+# stream_index.py
+"""
+StreamIndex - substring search over the stream catalog. Names and URLs are
+casefolded once when rows are indexed and joined into corpus segments that
+str.find scans at C speed; results of recent queries are cached so refining
+a query narrows the previous matches instead of rescanning the catalog.
+Sorting by a field uses a per-field rank computed once per catalog.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+
+FIELD_SEPARATOR = '\x00'
+ROW_SEPARATOR = '\n'
+
+
+class SearchResults:
+    """Read-only sequence of catalog items at the given indices (no per-row copies)"""
+
+    def __init__(self, items, indices):
+        self.items = items
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.items[i] for i in self.indices[position]]
+        return self.items[self.indices[position]]
+
+    def __iter__(self):
+        return (self.items[i] for i in self.indices)
+
+
+class StreamIndex:
+    def __init__(self, fields=('name', 'url'), segment_rows=65536, cache_size=16):
+        """
+        :param fields: item keys that are searched
+        :param segment_rows: maximum rows per corpus segment
+        :param cache_size: recent query results kept for narrowing and backspacing
+        """
+        self.fields = fields
+        self.segment_rows = max(1, segment_rows)
+        self.cache_size = max(1, cache_size)
+
+        self.items = []
+        self.keys = []       # casefolded "name\0url" per row
+        self.segments = []   # [(first row, corpus text, start offset of each row)]
+        self.cache = OrderedDict()  # query -> (rows covered, matching indices)
+        self.orders = {}     # field -> (rows in catalog order sorted by the field, rank of each row)
+
+    def __len__(self):
+        return len(self.keys)
+
+    # ----------------- Indexing -----------------
+    def build(self, items):
+        """Index a new catalog (e.g. after loading a CSV)"""
+        self.items = items
+        self.keys = []
+        self.segments = []
+        self.cache.clear()
+        self.orders.clear()
+        self.sync()
+
+    def sync(self, keys=None):
+        """
+        Index rows appended to the catalog since the last call
+        :param keys: their casefolded keys if already computed by keys_for() (e.g. on a loader thread)
+        """
+        if len(self.items) < len(self.keys):
+            self.build(self.items)  # rows were removed - start over
+            return
+        start = len(self.keys)
+        if start == len(self.items):
+            return
+        if keys is None or len(keys) != len(self.items) - start:
+            keys = self.keys_for(self._new_columns(start))
+
+        # Appended rows get their own segments, so indexing a batch costs only that batch;
+        # a small last segment (e.g. manually added links) is rebuilt together with them
+        if self.segments and len(self.segments[-1][2]) < min(1024, self.segment_rows):
+            start = self.segments.pop()[0]
+            keys = self.keys[start:] + keys
+            del self.keys[start:]
+        for offset in range(0, len(keys), self.segment_rows):
+            self._add_segment(start + offset, keys[offset:offset + self.segment_rows])
+
+    def keys_for(self, columns):
+        """Casefolded search keys (fields joined by FIELD_SEPARATOR) for {field: values}; safe on any thread"""
+        rows = list(map(FIELD_SEPARATOR.join, zip(*(columns[field] for field in self.fields))))
+        text = ROW_SEPARATOR.join(rows)
+        if text.count(ROW_SEPARATOR) != len(rows) - 1:
+            text = ROW_SEPARATOR.join(row.replace(ROW_SEPARATOR, ' ') for row in rows)
+        return text.casefold().split(ROW_SEPARATOR) if rows else []
+
+    def _new_columns(self, start):
+        column = getattr(self.items, 'column', None)
+        if column is not None:
+            # Column-wise catalog (CatalogRows): take the values without touching rows
+            return {field: column(field)[start:] for field in self.fields}
+        new_items = self.items[start:]
+        return {field: [str(item.get(field, '')) for item in new_items] for field in self.fields}
+
+    def _add_segment(self, first, keys):
+        """Join a block of keys into one corpus text and record where each row starts"""
+        text = ROW_SEPARATOR.join(keys) + ROW_SEPARATOR
+        starts = array('q', accumulate(map((1).__add__, map(len, keys)), initial=0))
+        starts.pop()
+        self.keys.extend(keys)
+        self.segments.append((first, text, starts))
+
+    # ----------------- Searching -----------------
+    def search(self, query):
+        """Indices of rows whose name or URL contains `query` (case-insensitive), in catalog order"""
+        query = query.casefold().replace(FIELD_SEPARATOR, '').replace(ROW_SEPARATOR, '')
+        self.sync()
+        total = len(self.keys)
+        if not query:
+            return range(total)
+
+        if query in self.cache:
+            covered, matches = self.cache[query]
+            if covered < total:
+                # Same query after rows were appended: extend in place, so views of it stay current
+                matches.extend(self._scan(query, covered, total))
+                self.cache[query] = (total, matches)
+            self.cache.move_to_end(query)
+            return matches
+
+        covered, matches = self._narrowest(query)
+        if matches is None or len(matches) * 4 > covered:
+            # Nothing to narrow, or the earlier query matched so much that a fresh scan is cheaper
+            matches = self._scan(query, 0, total)
+        else:
+            keys = self.keys
+            matches = [i for i in matches if query in keys[i]]
+            matches.extend(self._scan(query, covered, total))
+
+        self.cache[query] = (total, matches)
+        self.cache.move_to_end(query)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return matches
+
+    def results(self, query, sort=None):
+        """
+        Matching items as a sequence suitable for VirtualTreeList.set_items
+        :param sort: optional (field, reverse) to order the matches by
+        """
+        if sort is None:
+            return self.items if not query else SearchResults(self.items, self.search(query))
+        field, reverse = sort
+        if not query:
+            self.sync()
+            order = self._order(field)[0]
+            return SearchResults(self.items, order[::-1] if reverse else order)
+        return SearchResults(self.items, self.sort(self.search(query), field, reverse))
+
+    # ----------------- Sorting -----------------
+    def sort(self, indices, field, reverse=False):
+        """Row indices ordered by a field's casefolded text"""
+        rank = self._order(field)[1]
+        return sorted(indices, key=rank.__getitem__, reverse=reverse)
+
+    def _order(self, field):
+        """(sorted rows, rank per row) for a field, recomputed only when the catalog changed"""
+        total = len(self.keys)
+        cached = self.orders.get(field)
+        if cached is not None and len(cached[0]) == total:
+            return cached
+        position = self.fields.index(field)
+        if position == 0:
+            values = self.keys  # the first field leads each key
+        else:
+            values = [key.split(FIELD_SEPARATOR)[position] for key in self.keys]
+        order = sorted(range(total), key=values.__getitem__)
+        rank = array('q', bytes(8 * total))
+        for place, row in enumerate(order):
+            rank[row] = place
+        self.orders[field] = (order, rank)
+        return order, rank
+
+    def _narrowest(self, query):
+        """(rows covered, matches) of the smallest cached query contained in `query`"""
+        best = (0, None)
+        for cached, (covered, matches) in self.cache.items():
+            if cached in query and (best[1] is None or len(matches) < len(best[1])):
+                best = (covered, matches)
+        return best
+
+    def _scan(self, query, low, high):
+        """Matching rows in [low, high) found through the corpus segments"""
+        out = []
+        for first, text, starts in self.segments:
+            end = first + len(starts)
+            if end <= low or first >= high:
+                continue
+            self._scan_segment(query, text, starts, first, max(low, first) - first, min(high, end) - first, out)
+        return out
+
+    def _scan_segment(self, query, text, starts, first, low, high, out):
+        find = text.find
+        limit = starts[high] if high < len(starts) else len(text)
+        pos = find(query, starts[low], limit)
+        hits = 0
+        while pos != -1:
+            row = bisect_right(starts, pos, low, high) - 1
+            out.append(first + row)
+            hits += 1
+            if hits >= 64 and hits * 16 > row - low:
+                # Common query: testing each remaining key beats hopping between matches
+                keys = self.keys
+                out.extend(i for i in range(first + row + 1, first + high) if query in keys[i])
+                return
+            if row + 1 >= high:
+                return
+            pos = find(query, starts[row + 1], limit)
@@ -0,0 +1,234 @@
+# stream_log_writer.py
+"""
+StreamLogWriter - per-stream log files written by one background thread.
+Recording threads only enqueue lines; the writer batches them per stream,
+keeps a bounded LRU of open handles and rotates files by size or age,
+compressing rotated files with gzip.
+"""
+
+import atexit
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+
+class StreamLogWriter:
+    def __init__(self, logger=None, max_bytes=10 * 1024 * 1024, rotate_interval=None, backup_count=5,
+                 compress=True, max_open_files=64, flush_interval=1.0):
+        """
+        :param logger: function for logging messages e.g. print or UI log
+        :param max_bytes: rotate a stream's file once it reaches this size (0 disables)
+        :param rotate_interval: rotate a stream's file after this many seconds (None disables)
+        :param backup_count: rotated files kept per stream
+        :param compress: gzip rotated files
+        :param max_open_files: open handles kept in the LRU; older ones are closed
+        :param flush_interval: seconds the writer waits to batch lines before flushing
+        """
+        self.log = logger if logger else print
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = max(0, backup_count)
+        self.compress = compress
+        self.max_open_files = max(1, max_open_files)
+        self.flush_interval = flush_interval
+
+        self.queue = queue.SimpleQueue()
+        self.paths = {}               # stream name -> log file path
+        self.handles = OrderedDict()  # stream name -> open file, least recently used first
+        self.file_info = {}           # stream name -> {'size', 'started'}
+        self.lines_written = 0
+        self.rotations = 0
+        self.dropped = 0
+
+        self.lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    # ----------------- Producer Side (any thread) -----------------
+    def register(self, name, folder, filename=None):
+        """Send lines for `name` to `folder/<filename>` (defaults to the stream name + .log)"""
+        path = os.path.join(folder, filename or f"{name}.log")
+        with self.lock:
+            self.paths[name] = path
+        self.queue.put(('register', name, path))
+        self._ensure_thread()
+
+    def write(self, name, line):
+        """Queue a line for a registered stream (never blocks on file I/O)"""
+        if name in self.paths:
+            self.queue.put(('line', name, line))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is on disk"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(('flush', None, done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending lines, close all files and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self.queue.put(('flush', None, None))
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def stats(self):
+        """Counters for diagnostics"""
+        return {
+            'streams': len(self.paths),
+            'open_files': len(self.handles),
+            'queued': self.queue.qsize(),
+            'lines_written': self.lines_written,
+            'rotations': self.rotations,
+            'dropped': self.dropped
+        }
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self._thread is None:
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name='stream-log-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # ----------------- Writer Thread -----------------
+    def _run(self):
+        while True:
+            try:
+                items = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    break
+                continue
+            # Collect whatever else arrived so each file gets one write per batch
+            try:
+                while True:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            waiters = [payload for kind, name, payload in items if kind == 'flush' and payload is not None]
+            try:
+                self._process(items)
+            except Exception as e:
+                # The thread must survive: without it every later line would stay queued forever
+                self.log(f"Stream log writer error: {e}")
+            finally:
+                for done in waiters:
+                    done.set()
+
+            if self._stop_event.is_set() and self.queue.empty():
+                break
+
+        for name in list(self.handles):
+            self._close_handle(name)
+
+    def _process(self, items):
+        batches = OrderedDict()
+        for kind, name, payload in items:
+            if kind == 'line':
+                batches.setdefault(name, []).append(payload)
+            elif kind == 'register':
+                self._retarget(name, payload)
+
+        for name, lines in batches.items():
+            self._write_batch(name, lines)
+        for name, handle in list(self.handles.items()):
+            try:
+                handle.flush()
+            except OSError as e:
+                self.log(f"Error writing log file for {name}: {e}")
+                self._close_handle(name)  # reopened (or reported again) on the next write
+
+    def _retarget(self, name, path):
+        """A stream was (re-)registered, possibly with a new folder"""
+        handle = self.handles.get(name)
+        if handle is not None and handle.name != path:
+            self._close_handle(name)
+            self.file_info.pop(name, None)
+
+    def _close_handle(self, name):
+        handle = self.handles.pop(name)
+        try:
+            handle.close()
+        except OSError as e:
+            self.log(f"Error closing log file for {name}: {e}")
+
+    def _write_batch(self, name, lines):
+        data = "\n".join(lines) + "\n"
+        try:
+            handle = self._get_handle(name)
+            if self._should_rotate(name, len(data)):
+                self._rotate(name)
+                handle = self._get_handle(name)
+            handle.write(data)
+            self.file_info[name]['size'] += len(data.encode('utf-8'))
+            self.lines_written += len(lines)
+        except OSError as e:
+            self.dropped += len(lines)
+            self.log(f"Error writing log file for {name}: {e}")
+
+    def _get_handle(self, name):
+        """Open (or reuse) a stream's file, closing the least recently used handle if needed"""
+        handle = self.handles.get(name)
+        if handle is not None:
+            self.handles.move_to_end(name)
+            return handle
+
+        while len(self.handles) >= self.max_open_files:
+            _, oldest = self.handles.popitem(last=False)
+            oldest.close()
+
+        path = self.paths[name]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle = open(path, 'a', encoding='utf-8')
+        self.handles[name] = handle
+        if name not in self.file_info:
+            self.file_info[name] = {'size': handle.tell(), 'started': time.time()}
+        else:
+            self.file_info[name]['size'] = handle.tell()
+        return handle
+
+    # ----------------- Rotation -----------------
+    def _should_rotate(self, name, incoming):
+        info = self.file_info[name]
+        if info['size'] == 0:
+            return False
+        if self.max_bytes and info['size'] + incoming > self.max_bytes:
+            return True
+        return bool(self.rotate_interval) and time.time() - info['started'] >= self.rotate_interval
+
+    def _rotate(self, name):
+        """name.log -> name.log.1[.gz], shifting older files up and dropping the oldest"""
+        handle = self.handles.pop(name, None)
+        if handle is not None:
+            handle.close()
+        path = self.paths[name]
+        suffix = '.gz' if self.compress else ''
+
+        if self.backup_count == 0:
+            os.remove(path)
+        else:
+            oldest = f"{path}.{self.backup_count}{suffix}"
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{path}.{i}{suffix}"
+                if os.path.exists(src):
+                    os.replace(src, f"{path}.{i + 1}{suffix}")
+            if self.compress:
+                with open(path, 'rb') as src, gzip.open(f"{path}.1.gz", 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(path)
+            else:
+                os.replace(path, f"{path}.1")
+
+        self.file_info[name] = {'size': 0, 'started': time.time()}
+        self.rotations += 1
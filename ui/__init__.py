@@ -6,7 +6,10 @@ Complete module collection with all tabs
 from .ui_base import BaseUI
 from .ui_components import AeroComponents  
 from .ui_main_tab import MainTab
+from .ui_dashboard_tab import DashboardTab
 from .ui_log_tab import LogTab
+from .ui_log_view import VirtualLogView
+from .ui_virtual_list import VirtualTreeList
 from .ui_csv_tools_tab import CSVToolsTab
 from .ui_settings_tab import SettingsTab
 from .ui_handlers import UIHandlers
@@ -15,7 +18,10 @@ __all__ = [
     'BaseUI', 
     'AeroComponents', 
     'MainTab', 
+    'DashboardTab', 
     'LogTab', 
+    'VirtualLogView', 
+    'VirtualTreeList', 
     'CSVToolsTab', 
     'SettingsTab', 
     'UIHandlers'
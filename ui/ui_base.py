@@ -7,6 +7,7 @@ from tkinter import ttk
 import os
 from aero_style import AeroStyle
 from ui.ui_components import AeroComponents
+from catalog_loader import CatalogRows
 
 class BaseUI:
     def __init__(self):
@@ -14,7 +15,7 @@ class BaseUI:
         self.components = AeroComponents()
         
         # Data initialization
-        self.csv_data = []
+        self.csv_data = CatalogRows(('name', 'url'))
         self.output_folder = os.path.join(os.path.expanduser("~"), "Documents", "YTS", "M3U8")
         os.makedirs(self.output_folder, exist_ok=True)
         
@@ -135,6 +136,15 @@ class BaseUI:
         self.status_frame = self.components.create_glass_frame(self.root)
         self.status_frame.pack(side='bottom', fill='x', padx=10, pady=(0, 10))
 
+        # Resource gauges (threads / processes / fds), refreshed periodically
+        self.resource_label = self.components.create_styled_label(
+            self.status_frame,
+            text="",
+            style='secondary',
+            anchor='e'
+        )
+        self.resource_label.pack(side='right', padx=10, pady=5)
+
         self.status_label = self.components.create_styled_label(
             self.status_frame,
             text="Ready",
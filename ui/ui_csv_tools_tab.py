@@ -9,12 +9,17 @@ from aero_style import AeroStyle
 from ui.ui_components import AeroComponents
 
 class CSVToolsTab:
-    def __init__(self, parent, base_ui, csv_tools, video_tools):
+    def __init__(self, parent, base_ui, csv_tools, video_tools, job_runner):
         self.parent = parent
         self.base_ui = base_ui
         self.csv_tools = csv_tools
         self.video_tools = video_tools
+        self.job_runner = job_runner
         self.components = AeroComponents()
+
+        # Operations run as jobs; the pump polls the runner while any are queued or running
+        self.job_poll_interval = 250  # ms
+        self._job_pump_running = False
         
         # Variables for file paths
         self.main_file_path = tk.StringVar()
@@ -181,6 +186,10 @@ class CSVToolsTab:
             ops_row2, "💾 Export Cleaned", self.export_cleaned_csv, 'primary'
         ).pack(side='left', padx=5)
 
+        self.components.create_gradient_button(
+            ops_row2, "✨ Dedupe & Sort", self.dedupe_and_sort
+        ).pack(side='left', padx=5)
+
         self.components.create_gradient_button(
             ops_row2, "🔗 Generate URLs", self.generate_urls
         ).pack(side='left', padx=5)
@@ -203,6 +212,7 @@ class CSVToolsTab:
             ("🔤 Sort Main CSV", "Sorts main CSV alphabetically by first column"),
             ("🧹 Remove Duplicates", "Removes duplicate entries based on name column"),
             ("💾 Export Cleaned", "Exports a cleaned and sorted version to new file"),
+            ("✨ Dedupe & Sort", "Removes duplicates and sorts the main CSV in a single pass"),
             ("🔗 Generate URLs", "Generates streaming URLs from image background sources")
         ]
 
@@ -268,7 +278,32 @@ class CSVToolsTab:
             "Ready for CSV/Video operations",
             'secondary'
         )
-        self.csv_status_label.pack(anchor='w', padx=15, pady=(5, 15))
+        self.csv_status_label.pack(anchor='w', padx=15, pady=(5, 10))
+
+        # Queued, running and recently finished jobs
+        jobs_container = tk.Frame(self.status_frame, bg=AeroStyle.GLASS_BACKGROUND)
+        jobs_container.pack(fill='x', padx=15, pady=(0, 5))
+
+        self.jobs_tree = self.components.create_styled_treeview(
+            jobs_container, columns=('Status',)
+        )
+        self.jobs_tree.configure(height=5)
+        self.jobs_tree.heading('#0', text='🧰 Job')
+        self.jobs_tree.heading('Status', text='📈 Progress')
+        self.jobs_tree.column('#0', width=220)
+        self.jobs_tree.column('Status', width=480)
+        self.jobs_tree.pack(fill='x')
+
+        jobs_buttons = tk.Frame(self.status_frame, bg=AeroStyle.GLASS_BACKGROUND)
+        jobs_buttons.pack(fill='x', padx=15, pady=(5, 15))
+
+        self.components.create_gradient_button(
+            jobs_buttons, "✖ Cancel Selected", self.cancel_selected_jobs
+        ).pack(side='left', padx=(0, 5))
+
+        self.components.create_gradient_button(
+            jobs_buttons, "⏹️ Cancel All", self.cancel_all_jobs
+        ).pack(side='left', padx=5)
 
     # Event handlers
     def browse_main_file(self):
@@ -300,8 +335,9 @@ class CSVToolsTab:
                 messagebox.showerror("Error", "Please select both main and source CSV files")
                 return
 
-            result = self.csv_tools.merge_csvs(main_file, source_file, columns)
-            messagebox.showinfo("Success", result)
+            self.start_job(f"Merge {os.path.basename(source_file)} into {os.path.basename(main_file)}",
+                           self.csv_tools.merge_csvs, main_file, source_file, columns,
+                           key=main_file, error_message="Failed to merge CSVs")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to merge CSVs:\n{e}")
@@ -316,8 +352,8 @@ class CSVToolsTab:
                 messagebox.showerror("Error", "Please select main CSV file")
                 return
 
-            result = self.csv_tools.sort_main_csv(main_file, columns)
-            messagebox.showinfo("Success", result)
+            self.start_job(f"Sort {os.path.basename(main_file)}", self.csv_tools.sort_main_csv,
+                           main_file, columns, key=main_file, error_message="Failed to sort CSV")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to sort CSV:\n{e}")
@@ -332,12 +368,30 @@ class CSVToolsTab:
                 messagebox.showerror("Error", "Please select main CSV file")
                 return
 
-            result = self.csv_tools.remove_duplicates_by_name(main_file, columns)
-            messagebox.showinfo("Success", result)
+            self.start_job(f"Remove duplicates from {os.path.basename(main_file)}",
+                           self.csv_tools.remove_duplicates_by_name, main_file, columns,
+                           key=main_file, error_message="Failed to remove duplicates")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to remove duplicates:\n{e}")
 
+    def dedupe_and_sort(self):
+        """Remove duplicates from and sort main CSV in one pass"""
+        try:
+            main_file = self.main_file_path.get()
+            columns = [col.strip() for col in self.columns_to_copy.get().split(',')]
+
+            if not main_file:
+                messagebox.showerror("Error", "Please select main CSV file")
+                return
+
+            self.start_job(f"Dedupe & sort {os.path.basename(main_file)}",
+                           self.csv_tools.dedupe_and_sort_main_csv, main_file, columns,
+                           key=main_file, error_message="Failed to dedupe and sort CSV")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to dedupe and sort CSV:\n{e}")
+
     def export_cleaned_csv(self):
         """Export cleaned and sorted CSV"""
         try:
@@ -355,8 +409,9 @@ class CSVToolsTab:
             )
 
             if save_path:
-                result = self.csv_tools.export_cleaned_sorted_csv(main_file, save_path, columns)
-                messagebox.showinfo("Success", result)
+                self.start_job(f"Export {os.path.basename(save_path)}", self.csv_tools.export_cleaned_sorted_csv,
+                               main_file, save_path, columns, key=main_file,
+                               error_message="Failed to export CSV")
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export CSV:\n{e}")
@@ -370,9 +425,12 @@ class CSVToolsTab:
             )
 
             if file_path:
-                result_path = self.csv_tools.generate_urls_from_csv(file_path)
-                messagebox.showinfo("Success", 
-                    f"URLs generated successfully!\nSaved as: {os.path.basename(result_path)}")
+                self.start_job(f"Generate URLs for {os.path.basename(file_path)}",
+                               self.csv_tools.generate_urls_from_csv, file_path, key=file_path,
+                               error_message="Failed to generate URLs",
+                               on_success=lambda result_path: messagebox.showinfo(
+                                   "Success",
+                                   f"URLs generated successfully!\nSaved as: {os.path.basename(result_path)}"))
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate URLs:\n{e}")
@@ -380,7 +438,10 @@ class CSVToolsTab:
     def merge_videos(self):
         """Merge MP4 videos using video tools"""
         try:
-            self.video_tools.merge_videos()
+            folder = self.video_tools.pick_folder()
+            if folder:
+                self.start_job(f"Merge MP4 files in {os.path.basename(folder)}", self.video_tools.merge_videos,
+                               folder, key=folder, error_message="Failed to merge videos")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to merge videos:\n{e}")
 
@@ -388,3 +449,64 @@ class CSVToolsTab:
         """Update CSV tools status label"""
         if hasattr(self, 'csv_status_label'):
             self.csv_status_label.config(text=message)
+
+    # Jobs
+    def start_job(self, title, func, *args, key=None, error_message="Operation failed", on_success=None):
+        """Queue a tool operation on the worker pool; its result is shown once it finishes"""
+        def on_done(job):
+            if job.state == 'done':
+                self.update_csv_status(f"✅ {job.title}: {job.status}")
+                if on_success is not None:
+                    on_success(job.result)
+                elif job.result:
+                    messagebox.showinfo("Success", job.result)
+            elif job.state == 'failed':
+                self.update_csv_status(f"❌ {job.title}: failed")
+                messagebox.showerror("Error", f"{error_message}:\n{job.error}")
+            else:
+                self.update_csv_status(f"⏹️ {job.title}: cancelled")
+
+        self.job_runner.submit(title, func, *args, key=key, on_done=on_done)
+        if not self._job_pump_running:
+            self._job_pump_running = True
+            self.base_ui.root.after(0, self._poll_jobs)
+
+    def _poll_jobs(self):
+        """after() tick: handle finished jobs and show progress while any are active"""
+        active = self.job_runner.poll()
+        self.refresh_jobs_view()
+
+        running = [job for job in self.job_runner.active_jobs() if job.state == 'running']
+        queued = len(self.job_runner.active_jobs()) - len(running)
+        if running:
+            text = " | ".join(f"⏳ {job.title}: {job.status}" for job in running)
+            if queued:
+                text += f" (+{queued} queued)"
+            self.update_csv_status(text)
+
+        if active:
+            self.base_ui.root.after(self.job_poll_interval, self._poll_jobs)
+        else:
+            self._job_pump_running = False
+
+    def refresh_jobs_view(self):
+        """Sync the jobs list with the runner (one row per job, keyed by job id)"""
+        jobs = self.job_runner.jobs
+        for iid in self.jobs_tree.get_children(''):
+            if int(iid) not in jobs:
+                self.jobs_tree.delete(iid)
+        for job_id, job in list(jobs.items()):
+            iid = str(job_id)
+            if self.jobs_tree.exists(iid):
+                self.jobs_tree.item(iid, values=(job.status,))
+            else:
+                self.jobs_tree.insert('', 'end', iid=iid, text=job.title, values=(job.status,))
+
+    def cancel_selected_jobs(self):
+        for iid in self.jobs_tree.selection():
+            self.job_runner.cancel(int(iid))
+        self.refresh_jobs_view()
+
+    def cancel_all_jobs(self):
+        self.job_runner.cancel_all()
+        self.refresh_jobs_view()
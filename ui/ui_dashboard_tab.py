@@ -0,0 +1,162 @@
+# ui/ui_dashboard_tab.py
+"""
+Dashboard tab - fleet health at a glance: sparklines and current values of the
+FleetMetrics series drawn on one Canvas. Canvas items are created once per
+layout and only their coords/text change, and each sparkline has at most one
+point per pixel, so a redraw costs the same for 10 or 10,000 streams.
+"""
+import tkinter as tk
+from aero_style import AeroStyle
+from ui.ui_components import AeroComponents
+from fleet_metrics import SERIES
+from job_runner import format_bytes, format_seconds
+
+TILE_COLORS = {
+    'recording': AeroStyle.SUCCESS_COLOR,
+    'ingest_mbps': AeroStyle.ACCENT_BLUE,
+    'failures_per_min': AeroStyle.ERROR_COLOR,
+    'disk_mb_s': AeroStyle.WARNING_COLOR,
+}
+
+
+class DashboardTab:
+    def __init__(self, parent, base_ui, metrics, refresh_interval=1000):
+        """
+        :param metrics: FleetMetrics sampled in the background
+        :param refresh_interval: ms between checks for new samples (redraws only while visible)
+        """
+        self.parent = parent
+        self.base_ui = base_ui
+        self.metrics = metrics
+        self.refresh_interval = refresh_interval
+        self.components = AeroComponents()
+
+        self.tiles = {}          # series key -> canvas item ids of its tile
+        self.summary_item = None
+        self.drawn_samples = -1  # sample count shown, so unchanged data is not redrawn
+        self.size = (0, 0)
+
+        self.setup_dashboard_tab()
+        self.refresh()
+
+    def setup_dashboard_tab(self):
+        """Setup the dashboard tab UI"""
+        header = self.components.create_styled_label(self.parent, "📈 Fleet Health", 'subheader')
+        header.pack(anchor='w', padx=15, pady=(15, 5))
+
+        self.canvas = tk.Canvas(self.parent, bg=AeroStyle.GLASS_BACKGROUND, highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        self.canvas.bind('<Configure>', self._on_resize)
+
+    # ----------------- Layout -----------------
+    def _on_resize(self, event):
+        if (event.width, event.height) != self.size:
+            self.size = (event.width, event.height)
+            self.layout()
+            self.draw(force=True)
+
+    def layout(self):
+        """(Re)create the tile items for the current canvas size - 2 x 2 tiles plus a summary line"""
+        canvas = self.canvas
+        canvas.delete('all')
+        self.tiles.clear()
+        width, height = self.size
+        pad, summary_height = 10, 30
+        tile_w = max(60, (width - 3 * pad) // 2)
+        tile_h = max(60, (height - summary_height - 3 * pad) // 2)
+
+        for index, (key, title, unit) in enumerate(SERIES):
+            x = pad + (index % 2) * (tile_w + pad)
+            y = pad + (index // 2) * (tile_h + pad)
+            color = TILE_COLORS[key]
+            canvas.create_rectangle(x, y, x + tile_w, y + tile_h, fill='white', outline=AeroStyle.BORDER_COLOR)
+            canvas.create_text(x + 10, y + 8, anchor='nw', text=f"{title} ({unit})",
+                               fill=AeroStyle.SECONDARY_TEXT, font=('Segoe UI', 9))
+            value = canvas.create_text(x + 10, y + 26, anchor='nw', text='-',
+                                       fill=AeroStyle.TEXT_COLOR, font=('Segoe UI', 16, 'bold'))
+            extent = canvas.create_text(x + tile_w - 10, y + 8, anchor='ne', text='',
+                                        fill=AeroStyle.SECONDARY_TEXT, font=('Segoe UI', 8))
+            # Plot area below the value
+            plot = (x + 10, y + 60, x + tile_w - 10, y + tile_h - 10)
+            canvas.create_line(plot[0], plot[3], plot[2], plot[3], fill=AeroStyle.BORDER_COLOR)
+            line = canvas.create_line(0, 0, 0, 0, fill=color, width=2, state='hidden')
+            self.tiles[key] = {'value': value, 'extent': extent, 'line': line, 'plot': plot}
+
+        self.summary_item = canvas.create_text(pad, height - summary_height // 2, anchor='w', text='',
+                                               fill=AeroStyle.TEXT_COLOR, font=('Segoe UI', 9))
+
+    # ----------------- Drawing -----------------
+    def refresh(self):
+        """after() pump: redraw when the tab is visible and a new sample arrived"""
+        try:
+            if self.canvas.winfo_ismapped():
+                self.draw()
+        finally:
+            self.parent.after(self.refresh_interval, self.refresh)
+
+    def draw(self, force=False):
+        if not self.tiles:
+            return
+        samples, series, summary = self.metrics.snapshot()
+        if samples == self.drawn_samples and not force:
+            return
+        self.drawn_samples = samples
+
+        canvas = self.canvas
+        for key, _, unit in SERIES:
+            tile = self.tiles[key]
+            values = series[key]
+            latest = values[-1] if values else 0.0
+            canvas.itemconfigure(tile['value'], text=self._format(latest, unit))
+            if values:
+                canvas.itemconfigure(tile['extent'], text=f"max {self._format(max(values), unit)}")
+            points = self._sparkline(values, tile['plot'])
+            if points:
+                canvas.coords(tile['line'], *points)
+                canvas.itemconfigure(tile['line'], state='normal')
+            else:
+                canvas.itemconfigure(tile['line'], state='hidden')
+
+        canvas.itemconfigure(self.summary_item, text=self._summary_text(summary))
+
+    @staticmethod
+    def _sparkline(values, plot):
+        """Flat coords list for a line through values, at most one point per pixel column"""
+        left, top, right, bottom = plot
+        width = int(right - left)
+        if len(values) < 2 or width < 2:
+            return None
+        if len(values) > width:
+            # Keep each pixel column's peak so spikes survive downsampling
+            step = len(values) / width
+            values = [max(values[int(i * step):max(int(i * step) + 1, int((i + 1) * step))]) for i in range(width)]
+        high = max(values) or 1.0
+        x_step = (right - left) / (len(values) - 1)
+        points = []
+        for i, value in enumerate(values):
+            points.append(left + i * x_step)
+            points.append(bottom - (bottom - top) * value / high)
+        return points
+
+    @staticmethod
+    def _format(value, unit):
+        if unit == 'streams':
+            return f"{value:.0f}"
+        return f"{value:.1f}" if value < 100 else f"{value:.0f}"
+
+    @staticmethod
+    def _summary_text(summary):
+        if not summary:
+            return "Waiting for the first sample..."
+        states = summary['states']
+        parts = [f"{summary['streams']} streams",
+                 f"{states.get('Running', 0)} running",
+                 f"{states.get('Restarting', 0)} restarting",
+                 f"{states.get('Held', 0)} held",
+                 f"{summary['failures_total']} failures since start"]
+        if summary['disk_free'] is not None:
+            disk = f"{format_bytes(summary['disk_free'])} free"
+            if summary['seconds_to_full'] is not None:
+                disk += f" (full in {format_seconds(summary['seconds_to_full'])})"
+            parts.append(disk)
+        return "   •   ".join(parts)
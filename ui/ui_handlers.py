@@ -24,9 +24,9 @@ class UIHandlers:
             return
 
         self.base_ui.csv_data.append({'name': name, 'url': url})
-        # Update CSV tree if it exists
-        if hasattr(self.base_ui, 'csv_tree'):
-            self.base_ui.csv_tree.insert('', 'end', text=name, values=(url,))
+        # Update the Available Streams list if it exists
+        if hasattr(self.base_ui, 'main_tab'):
+            self.base_ui.main_tab.filter_streams()
         
         self.logger.log_to_console(f"Added manual stream: {name}")
 
@@ -73,10 +73,8 @@ class UIHandlers:
             
             if self.downloader.add_stream(name, url, delay):
                 # Update download tree if it exists
-                if hasattr(self.base_ui, 'tree'):
-                    self.base_ui.tree.insert('', 'end', text=name, 
-                                           values=('Stopped', delay, '0'), 
-                                           tags=('Stopped',))
+                if hasattr(self.base_ui, 'main_tab'):
+                    self.base_ui.main_tab.add_stream_row(name, delay)
                 added_count += 1
 
         if added_count > 0:
@@ -130,7 +128,10 @@ class UIHandlers:
             if name in self.downloader.streams:
                 self.downloader.stop_stream(name)
                 del self.downloader.streams[name]
-                tree_widget.delete(item)
+                if hasattr(self.base_ui, 'main_tab'):
+                    self.base_ui.main_tab.remove_stream_row(name)
+                else:
+                    tree_widget.delete(item)
 
         self.logger.log_to_console(f"Removed {len(selected)} streams")
 
@@ -2,10 +2,14 @@
 """
 Log tab with dual logging system for application and streamlink logs
 """
+import threading
 import tkinter as tk
 from tkinter import ttk
 from aero_style import AeroStyle
 from ui.ui_components import AeroComponents
+from ui.ui_log_view import VirtualLogView
+from logger import app_log_tag
+from event_log import EventQueryStore, LEVELS
 
 class LogTab:
     def __init__(self, parent, base_ui, logger):
@@ -13,12 +17,29 @@ class LogTab:
         self.base_ui = base_ui
         self.logger = logger
         self.components = AeroComponents()
+        self._syncing_auto_scroll = False
+        self._filter_worker = None      # thread building the filtered view, if any
+        self.filter_poll_interval = 50  # ms between checks while it runs
         
         self.setup_log_tab()
         
+        # Only a window of lines lives in the widgets; the rest is paged in from the log stores
+        self.app_log_view = VirtualLogView(self.log_text, self.log_scrollbar, self.logger.app_logs,
+                                           tagger=app_log_tag, on_follow_change=self.sync_auto_scroll)
+        self.streamlink_log_view = VirtualLogView(self.streamlink_text, self.streamlink_scrollbar,
+                                                  self.logger.streamlink_logs,
+                                                  on_follow_change=self.sync_auto_scroll)
+        self.app_log_view.show_tail()
+        self.streamlink_log_view.show_tail()
+
         # Update logger with UI widgets after creation
         self.logger.app_log_text = self.log_text
         self.logger.streamlink_log_text = self.streamlink_text
+        self.logger.set_log_view(self.app_log_view, app_log=True)
+        self.logger.set_log_view(self.streamlink_log_view, app_log=False)
+
+        self.log_notebook.bind('<<NotebookTabChanged>>', self.sync_auto_scroll, add='+')
+        self.auto_scroll_var.trace_add('write', self.on_auto_scroll_toggled)
 
     def setup_log_tab(self):
         """Setup the log tab UI with dual log display"""
@@ -65,12 +86,12 @@ class LogTab:
                                selectbackground=AeroStyle.ACCENT_LIGHT_BLUE)
 
         # Scrollbar
-        log_scrollbar = ttk.Scrollbar(log_frame, 
-                                     orient='vertical', 
-                                     command=self.log_text.yview)
-        log_scrollbar.pack(side='right', fill='y')
+        self.log_scrollbar = ttk.Scrollbar(log_frame, 
+                                          orient='vertical', 
+                                          command=self.log_text.yview)
+        self.log_scrollbar.pack(side='right', fill='y')
         
-        self.log_text.configure(yscrollcommand=log_scrollbar.set)
+        self.log_text.configure(yscrollcommand=self.log_scrollbar.set)
         self.log_text.pack(side='left', fill='both', expand=True)
 
         # Configure tags for colored logging
@@ -99,6 +120,9 @@ class LogTab:
         )
         info_text.pack(anchor='w', padx=10, pady=8)
 
+        # Filter bar (queries the structured event log)
+        self.create_log_filter_bar()
+
         # Log display frame
         streamlink_frame = tk.Frame(self.streamlink_log_frame, bg=AeroStyle.GLASS_BACKGROUND)
         streamlink_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
@@ -115,12 +139,12 @@ class LogTab:
                                       insertbackground='white')
 
         # Scrollbar
-        streamlink_scrollbar = ttk.Scrollbar(streamlink_frame,
-                                           orient='vertical',
-                                           command=self.streamlink_text.yview)
-        streamlink_scrollbar.pack(side='right', fill='y')
+        self.streamlink_scrollbar = ttk.Scrollbar(streamlink_frame,
+                                                 orient='vertical',
+                                                 command=self.streamlink_text.yview)
+        self.streamlink_scrollbar.pack(side='right', fill='y')
         
-        self.streamlink_text.configure(yscrollcommand=streamlink_scrollbar.set)
+        self.streamlink_text.configure(yscrollcommand=self.streamlink_scrollbar.set)
         self.streamlink_text.pack(side='left', fill='both', expand=True)
 
         # Configure tags for different message types
@@ -128,6 +152,45 @@ class LogTab:
         self.streamlink_text.tag_configure('error', foreground='#ff4444')   # Red for errors
         self.streamlink_text.tag_configure('info', foreground='#ffff00')    # Yellow for info
 
+    def create_log_filter_bar(self):
+        """Create stream/level filter controls for the streamlink log"""
+        filter_frame = tk.Frame(self.streamlink_log_frame, bg=AeroStyle.GLASS_BACKGROUND)
+        filter_frame.pack(fill='x', padx=15, pady=(0, 10))
+
+        self.components.create_styled_label(filter_frame, "Stream:").pack(side='left')
+        self.filter_stream_var = tk.StringVar(value='All')
+        self.filter_stream_combo = ttk.Combobox(filter_frame,
+                                                textvariable=self.filter_stream_var,
+                                                values=['All'],
+                                                width=28,
+                                                style='Aero.TCombobox',
+                                                state='readonly',
+                                                postcommand=self.refresh_filter_streams)
+        self.filter_stream_combo.pack(side='left', padx=(5, 15))
+
+        self.components.create_styled_label(filter_frame, "Level:").pack(side='left')
+        self.filter_level_var = tk.StringVar(value='All')
+        level_combo = ttk.Combobox(filter_frame,
+                                   textvariable=self.filter_level_var,
+                                   values=['All'] + list(reversed(LEVELS)),
+                                   width=10,
+                                   style='Aero.TCombobox',
+                                   state='readonly')
+        level_combo.pack(side='left', padx=(5, 15))
+
+        filter_btn = self.components.create_gradient_button(
+            filter_frame, "🔍 Filter", self.apply_log_filter, 'primary'
+        )
+        filter_btn.pack(side='left', padx=5)
+
+        live_btn = self.components.create_gradient_button(
+            filter_frame, "📡 Show Live", self.clear_log_filter
+        )
+        live_btn.pack(side='left', padx=5)
+
+        self.filter_status = self.components.create_styled_label(filter_frame, "", 'secondary')
+        self.filter_status.pack(side='left', padx=10)
+
     def create_log_controls(self):
         """Create log control buttons"""
         controls_frame = self.components.create_glass_frame(self.parent)
@@ -184,6 +247,88 @@ class LogTab:
                                           font=('Segoe UI', 9))
         auto_scroll_check.pack()
 
+    # Auto-scroll
+    def current_log_view(self):
+        """View of the log sub-tab currently shown"""
+        if self.log_notebook.index('current') == 0:
+            return self.app_log_view
+        return self.streamlink_log_view
+
+    def sync_auto_scroll(self, *args):
+        """Reflect the visible view's follow state in the checkbox (scrolling up switches it off)"""
+        self._syncing_auto_scroll = True
+        try:
+            self.auto_scroll_var.set(self.current_log_view().following)
+        finally:
+            self._syncing_auto_scroll = False
+
+    def on_auto_scroll_toggled(self, *args):
+        """Checkbox toggled by the user"""
+        if self._syncing_auto_scroll:
+            return
+        if self.auto_scroll_var.get():
+            self.current_log_view().follow()
+        else:
+            self.current_log_view().pause()
+
+    # Filtering
+    def refresh_filter_streams(self):
+        """Fill the stream dropdown from the event log"""
+        self.filter_stream_combo['values'] = ['All'] + self.logger.events.streams()
+
+    def apply_log_filter(self):
+        """Show only events matching the selected stream and minimum level"""
+        stream = self.filter_stream_var.get()
+        level = self.filter_level_var.get()
+        filters = {'stream': None if stream == 'All' else stream,
+                   'level': None if level == 'All' else level}
+        if filters['stream'] is None and filters['level'] is None:
+            self.clear_log_filter()
+            return
+
+        # Flushing the event writer and reading the matching ids can take a while on a busy
+        # database; build the store on a worker and install it from the Tk loop
+        result = {}
+
+        def build():
+            try:
+                result['store'] = EventQueryStore(self.logger.events, **filters)
+            except Exception as e:
+                result['error'] = e
+
+        worker = threading.Thread(target=build, name='log-filter-query', daemon=True)
+        self._filter_worker = worker
+        self.filter_status.config(text="Filtering...")
+        worker.start()
+        self.base_ui.root.after(self.filter_poll_interval, self._install_filtered_store, worker, result)
+
+    def _install_filtered_store(self, worker, result):
+        """after() tick: show the filtered events once the worker has built the store"""
+        if worker is not self._filter_worker:
+            return  # replaced by a newer filter or cleared
+        if worker.is_alive():
+            self.base_ui.root.after(self.filter_poll_interval, self._install_filtered_store, worker, result)
+            return
+        self._filter_worker = None
+        store = result.get('store')
+        if store is None:
+            self.filter_status.config(text="Filter failed")
+            self.logger.log_to_console(f"Error filtering log: {result.get('error')}")
+            return
+        self.streamlink_log_view.set_store(store, live=False)
+        self.filter_status.config(text=f"{len(store):,} matching lines")
+        self.log_notebook.select(self.streamlink_log_frame)
+        self.sync_auto_scroll()
+
+    def clear_log_filter(self):
+        """Back to the live streamlink log"""
+        self._filter_worker = None
+        self.filter_stream_var.set('All')
+        self.filter_level_var.set('All')
+        self.filter_status.config(text="")
+        self.streamlink_log_view.set_store(self.logger.streamlink_logs, live=True)
+        self.streamlink_log_view.follow()
+
     # Event handlers
     def clear_app_log(self):
         """Clear application log only"""
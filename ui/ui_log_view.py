@@ -0,0 +1,201 @@
+# ui/ui_log_view.py
+"""
+Virtualized log view - keeps only a window of lines in a Text widget and
+renders the rest on demand from a LogStore as the user scrolls
+"""
+import tkinter as tk
+from collections import deque
+
+# Events that may move the view; checked once the widget has handled them
+USER_SCROLL_EVENTS = ('<MouseWheel>', '<Button-4>', '<Button-5>', '<B1-Motion>',
+                      '<Prior>', '<Next>', '<Up>', '<Down>', '<Control-Home>', '<Control-End>')
+
+
+class VirtualLogView:
+    def __init__(self, text, scrollbar, store, window_lines=2000, page_lines=500,
+                 tagger=None, on_follow_change=None):
+        """
+        :param text: Tk Text widget showing the window
+        :param scrollbar: its vertical scrollbar (re-wired so drags can page in history)
+        :param store: LogStore holding the full history
+        :param window_lines: maximum log entries kept in the widget
+        :param page_lines: entries loaded per step when scrolling past either edge
+        :param tagger: function returning the tag for a stored line (or None)
+        :param on_follow_change: called with True/False when auto-scroll switches
+        """
+        self.text = text
+        self.store = store
+        self.page_lines = max(1, page_lines)
+        self.window_lines = max(window_lines, self.page_lines * 2)
+        self.tagger = tagger if tagger else lambda line: None
+        self.on_follow_change = on_follow_change if on_follow_change else lambda following: None
+
+        self.first = 0          # store index of the first entry in the widget
+        self.sizes = deque()    # widget lines taken by each rendered entry
+        self.following = True
+        self.live = True        # False while showing a store that doesn't receive live lines
+        self._check_pending = False
+
+        scrollbar.configure(command=self.yview)
+        for sequence in USER_SCROLL_EVENTS:
+            text.bind(sequence, self._on_user_scroll, add='+')
+
+    @property
+    def end(self):
+        """Store index just past the last rendered entry"""
+        return self.first + len(self.sizes)
+
+    # ----------------- Live Lines -----------------
+    def append(self, records):
+        """Render freshly logged (index, entry, tag) records while following the tail"""
+        if not self.live or not self.following:
+            return  # picked up from the store once the user scrolls back down
+        end = self.end
+        # Logger queues records in index order; sorting only guards other producers
+        fresh = sorted((record for record in records if record[0] >= end), key=lambda record: record[0])
+        if not fresh:
+            return
+        if fresh[0][0] != end or fresh[-1][0] != end + len(fresh) - 1:
+            self.show_tail()  # gap (history was being browsed) - jump to the live end
+            return
+        self._insert(tk.END, [(entry, tag) for index, entry, tag in fresh])
+        self._trim_top()
+        self.text.see(tk.END)
+
+    def show_tail(self):
+        """Re-render the window from the most recent lines of the store"""
+        with self.store.lock:
+            total = len(self.store)
+            start = max(0, total - self.window_lines)
+            lines = self.store.get_range(start, total - start)
+        self.reset(start)
+        self._insert(tk.END, [(line, self.tagger(line)) for line in lines])
+        self.text.see(tk.END)
+
+    def set_store(self, store, live=True):
+        """Show another store (e.g. a filtered query) from its newest lines"""
+        self.store = store
+        self.live = live
+        self.show_tail()
+
+    def reset(self, first=0):
+        """Empty the widget (e.g. after the store was cleared)"""
+        self._set_state('normal')
+        self.text.delete('1.0', tk.END)
+        self._set_state('disabled')
+        self.first = first
+        self.sizes.clear()
+
+    # ----------------- Auto-scroll -----------------
+    def follow(self):
+        """Switch auto-scroll on and jump to the live end"""
+        self._set_following(True)
+        if self.end != len(self.store):
+            self.show_tail()
+        else:
+            self.text.see(tk.END)
+
+    def pause(self):
+        """Switch auto-scroll off, keeping the current position"""
+        self._set_following(False)
+
+    def _set_following(self, following):
+        if following != self.following:
+            self.following = following
+            self.on_follow_change(following)
+
+    # ----------------- Scrolling -----------------
+    def yview(self, *args):
+        """Scrollbar command"""
+        self.text.yview(*args)
+        self._check_position()
+
+    def _on_user_scroll(self, event=None):
+        if not self._check_pending:
+            self._check_pending = True
+            self.text.after_idle(self._check_position)
+
+    def _check_position(self):
+        """Page in history at either edge and follow only while the live end is visible"""
+        self._check_pending = False
+        top, bottom = self.text.yview()
+        if top <= 0.0 and self.first > 0:
+            self._load_older()
+        elif bottom >= 1.0 and self.end < len(self.store):
+            self._load_newer()
+        top, bottom = self.text.yview()
+        self._set_following(bottom >= 1.0 and self.end >= len(self.store))
+
+    def _load_older(self):
+        start = max(0, self.first - self.page_lines)
+        lines = self.store.get_range(start, self.first - start)
+        if not lines:
+            return
+        top_line = self._top_line()
+        added = self._insert('1.0', [(line, self.tagger(line)) for line in lines])
+        self.first -= len(lines)
+        self._trim_bottom()
+        self.text.yview(f"{top_line + added}.0")  # keep the same line at the top
+
+    def _load_newer(self):
+        lines = self.store.get_range(self.end, self.page_lines)
+        if not lines:
+            return
+        top_line = self._top_line()
+        self._insert(tk.END, [(line, self.tagger(line)) for line in lines])
+        removed = self._trim_top()
+        self.text.yview(f"{max(1, top_line - removed)}.0")
+
+    def _top_line(self):
+        return int(self.text.index('@0,0').split('.')[0])
+
+    # ----------------- Widget Editing -----------------
+    def _insert(self, index, records):
+        """Insert (entry, tag) records with one Text.insert; returns widget lines added"""
+        sizes = [entry.count('\n') + 1 for entry, _ in records]
+        args = []
+        run_tag, run = None, []
+        for entry, tag in records:
+            if run and tag != run_tag:
+                args += ['\n'.join(run) + '\n', run_tag or ()]
+                run = []
+            run_tag = tag
+            run.append(entry)
+        if run:
+            args += ['\n'.join(run) + '\n', run_tag or ()]
+        if not args:
+            return 0
+
+        self._set_state('normal')
+        self.text.insert(index, *args)
+        self._set_state('disabled')
+        if index == tk.END:
+            self.sizes.extend(sizes)
+        else:
+            self.sizes.extendleft(reversed(sizes))
+        return sum(sizes)
+
+    def _trim_top(self):
+        """Drop entries above the window budget; returns widget lines removed"""
+        excess = len(self.sizes) - self.window_lines
+        if excess <= 0:
+            return 0
+        lines = sum(self.sizes.popleft() for _ in range(excess))
+        self._set_state('normal')
+        self.text.delete('1.0', f"{lines + 1}.0")
+        self._set_state('disabled')
+        self.first += excess
+        return lines
+
+    def _trim_bottom(self):
+        """Drop entries below the window budget after paging in older lines"""
+        excess = len(self.sizes) - self.window_lines
+        if excess <= 0:
+            return
+        kept = sum(self.sizes) - sum(self.sizes.pop() for _ in range(excess))
+        self._set_state('normal')
+        self.text.delete(f"{kept + 1}.0", tk.END)
+        self._set_state('disabled')
+
+    def _set_state(self, state):
+        self.text.config(state=state)
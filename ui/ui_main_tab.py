@@ -5,12 +5,37 @@ Main tab with stream management functionality
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
-import csv
 import json
 import platform
 import subprocess
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
 from aero_style import AeroStyle
 from ui.ui_components import AeroComponents
+from ui.ui_virtual_list import VirtualTreeList
+from stream_index import StreamIndex
+from catalog_loader import CatalogLoader, SEARCH_KEYS
+from catalog_cache import CatalogCache
+from log_filter import LEVEL_RANK
+
+# Download list columns (tree column -> heading) and the order states sort in
+DOWNLOAD_HEADINGS = {'#0': '📁 Name', 'State': '⚡ State', 'Delay': '⏰ Delay (min)',
+                     'Restart': '🔄 Restart (s)', 'Retries': '🔄 Retries'}
+SORT_COLUMNS = tuple(DOWNLOAD_HEADINGS)
+STATE_ORDER = {'Running': 0, 'Restarting': 1, 'Held': 2, 'Stopped': 3}
+
+# Available Streams fields -> (tree column, heading)
+CATALOG_HEADINGS = {'name': ('#0', '📁 Name'), 'url': ('URL', '🔗 URL')}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
 
 class MainTab:
     def __init__(self, parent, base_ui, downloader, logger):
@@ -19,8 +44,39 @@ class MainTab:
         self.downloader = downloader
         self.logger = logger
         self.components = AeroComponents()
+
+        # Download list model: name -> tree iid, displayed state per row and state totals,
+        # plus streams changed by worker threads that the next UI tick will redraw
+        self.stream_items = {}
+        self.row_states = {}
+        self.state_counts = Counter()
+        self.dirty_streams = set()
+        self.dirty_lock = threading.Lock()
+        self.refresh_interval = 200  # ms
+
+        # Download list sort: typed keys per stream, and the sorted keys while a column is active
+        self.row_keys = {}
+        self.sort_column = None
+        self.sort_reverse = False
+        self.sorted_rows = []
+
+        # Catalog search: index built once per load, typing is debounced
+        self.stream_index = StreamIndex()
+        self.stream_index.build(self.base_ui.csv_data)
+        self.search_delay = 150  # ms
+        self._search_job = None
+        self._shown_query = ''
+        self.catalog_sort = None  # (field, reverse) of the Available Streams list
+
+        # Background CSV loading
+        self.csv_loader = None
+        self.load_batch_rows = 20000
+        self.load_interval = 50  # ms between checks while the worker is reading
+        self.load_budget = 40    # ms of batch handling per tick
+        self.catalog_cache = CatalogCache(logger=self.logger.log_to_console)  # unchanged catalogs skip parsing
         
         self.setup_main_tab()
+        self.base_ui.root.after(self.refresh_interval, self._refresh_tick)
 
     def setup_main_tab(self):
         """Setup the main tab UI"""
@@ -57,6 +113,11 @@ class MainTab:
         )
         self.csv_label.pack(side='left', padx=15)
 
+        # Shown only while a CSV is loading
+        self.cancel_load_button = self.components.create_gradient_button(
+            left_controls, "✖ Cancel", self.cancel_csv_load
+        )
+
         # Center controls
         center_controls = tk.Frame(top_controls, bg=AeroStyle.GLASS_BACKGROUND)
         center_controls.pack(side='left', padx=15)
@@ -190,7 +251,7 @@ class MainTab:
             search_controls, "🔍 Search:", 'subheader'
         ).pack(side='left')
 
-        self.base_ui.search_var.trace('w', self.filter_streams)
+        self.base_ui.search_var.trace('w', self.schedule_filter)
         search_entry = self.components.create_styled_entry(
             search_controls, textvariable=self.base_ui.search_var, width=35
         )
@@ -273,18 +334,21 @@ class MainTab:
         self.csv_tree = self.components.create_styled_treeview(
             tree_container, columns=('URL',)
         )
-        self.csv_tree.heading('#0', text='📁 Name')
-        self.csv_tree.heading('URL', text='🔗 URL')
+        for field, (column, text) in CATALOG_HEADINGS.items():
+            self.csv_tree.heading(column, text=text,
+                                  command=lambda field=field: self.sort_catalog_column(field, False))
         self.csv_tree.column('#0', width=300)
         self.csv_tree.column('URL', width=450)
 
         # Scrollbar
-        csv_scrollbar = ttk.Scrollbar(tree_container, orient='vertical', 
-                                     command=self.csv_tree.yview)
+        csv_scrollbar = ttk.Scrollbar(tree_container, orient='vertical')
         csv_scrollbar.pack(side='right', fill='y')
-        self.csv_tree.configure(yscrollcommand=csv_scrollbar.set)
         self.csv_tree.pack(side='left', fill='both', expand=True)
 
+        # Virtual list: only visible rows are Tk items, catalog rows stay in csv_data
+        self.csv_list = VirtualTreeList(self.csv_tree, csv_scrollbar,
+                                        formatter=lambda item: (item['name'], (item['url'],)))
+
         # Bind double-click
         self.csv_tree.bind('<Double-1>', self.on_csv_double_click)
 
@@ -303,16 +367,9 @@ class MainTab:
         )
         
         # Configure headers with sorting
-        self.tree.heading('#0', text='📁 Name', 
-                         command=lambda: self.sort_tree_column('#0', False))
-        self.tree.heading('State', text='⚡ State',
-                         command=lambda: self.sort_tree_column('State', False))
-        self.tree.heading('Delay', text='⏰ Delay (min)',
-                         command=lambda: self.sort_tree_column('Delay', False))
-        self.tree.heading('Restart', text='🔄 Restart (s)',
-                         command=lambda: self.sort_tree_column('Restart', False))
-        self.tree.heading('Retries', text='🔄 Retries',
-                         command=lambda: self.sort_tree_column('Retries', False))
+        for column, text in DOWNLOAD_HEADINGS.items():
+            self.tree.heading(column, text=text,
+                              command=lambda column=column: self.sort_tree_column(column, False))
 
         # Configure columns
         self.tree.column('#0', width=200)
@@ -328,6 +385,8 @@ class MainTab:
                                background=AeroStyle.WARNING_COLOR)
         self.tree.tag_configure('Stopped', foreground='white',
                                background=AeroStyle.ERROR_COLOR)
+        self.tree.tag_configure('Held', foreground='white',
+                               background=AeroStyle.ACCENT_BLUE)
 
         # Scrollbar
         tree_scrollbar = ttk.Scrollbar(tree_container, orient='vertical',
@@ -366,6 +425,135 @@ class MainTab:
         for text, command in menu_items:
             self.context_menu.add_command(label=text, command=command)
 
+    # Download list model
+    def add_stream_row(self, name, delay):
+        """Insert a row for a newly added stream"""
+        iid = self.tree.insert('', 'end', text=name,
+                               values=('Stopped', delay, '0', '0'),
+                               tags=('Stopped',))
+        self.stream_items[name] = iid
+        self.row_states[name] = 'Stopped'
+        self.state_counts['Stopped'] += 1
+        self.row_keys[name] = self._row_key(name, 'Stopped', delay, 0, 0)
+        if self.sort_column is not None:
+            self._place_sorted_row(name)
+        self.update_stream_counters()
+        return iid
+
+    def remove_stream_row(self, name):
+        """Delete a stream's row"""
+        iid = self.stream_items.pop(name, None)
+        if iid is None:
+            return
+        self.tree.delete(iid)
+        self.state_counts[self.row_states.pop(name)] -= 1
+        if self.sort_column is not None:
+            self._unplace_sorted_row(name)
+        del self.row_keys[name]
+        self.update_stream_counters()
+
+    def clear_stream_rows(self):
+        """Delete all rows of the download list"""
+        self.tree.delete(*self.stream_items.values())
+        self.stream_items.clear()
+        self.row_states.clear()
+        self.state_counts.clear()
+        self.row_keys.clear()
+        self.sorted_rows.clear()
+        with self.dirty_lock:
+            self.dirty_streams.clear()
+        self.update_stream_counters()
+
+    def mark_stream_dirty(self, name):
+        """Queue a row refresh; safe to call from any thread"""
+        with self.dirty_lock:
+            self.dirty_streams.add(name)
+
+    def _refresh_tick(self):
+        try:
+            self.flush_dirty_streams()
+        finally:
+            self.base_ui.root.after(self.refresh_interval, self._refresh_tick)
+
+    def flush_dirty_streams(self):
+        """Redraw the rows of streams changed since the last tick (Tk thread only)"""
+        with self.dirty_lock:
+            if not self.dirty_streams:
+                return
+            names, self.dirty_streams = self.dirty_streams, set()
+
+        counts_changed = False
+        for name in names:
+            iid = self.stream_items.get(name)
+            stream = self.downloader.streams.get(name)
+            if iid is None or stream is None:
+                continue
+            state = stream['state']
+            values = (state, stream['delay'], stream.get('restart_seconds', 0), stream.get('retry_count', 0))
+            self.tree.item(iid, values=values, tags=(state,))
+
+            # Keep the active sort by moving just this row if its key changed
+            key = self._row_key(name, *values)
+            if key != self.row_keys[name]:
+                if self.sort_column is not None:
+                    previous = self._unplace_sorted_row(name)
+                    self.row_keys[name] = key
+                    self._place_sorted_row(name, previous)
+                else:
+                    self.row_keys[name] = key
+            previous = self.row_states[name]
+            if previous != state:
+                self.state_counts[previous] -= 1
+                self.state_counts[state] += 1
+                self.row_states[name] = state
+                counts_changed = True
+
+        if counts_changed:
+            self.update_stream_counters()
+
+    # Download list sorting
+    def _row_key(self, name, state, delay, restart, retries):
+        """Typed sort values of a row, in SORT_COLUMNS order"""
+        return (name.casefold(), STATE_ORDER.get(state, len(STATE_ORDER)),
+                _number(delay), _number(restart), _number(retries))
+
+    def _sort_key(self, name):
+        keys = self.row_keys[name]
+        return keys[SORT_COLUMNS.index(self.sort_column)], keys[0], name
+
+    def sort_tree_column(self, col, reverse):
+        """Sort the download list by a column from the cached keys and reorder the tree in one call"""
+        self.sort_column = col
+        self.sort_reverse = reverse
+        self.sorted_rows = sorted(self._sort_key(name) for name in self.stream_items)
+        rows = [self.stream_items[key[-1]] for key in self.sorted_rows]
+        if reverse:
+            rows.reverse()
+        self.tree.set_children('', *rows)
+
+        for column, text in DOWNLOAD_HEADINGS.items():
+            arrow = (' ▼' if reverse else ' ▲') if column == col else ''
+            self.tree.heading(column, text=text + arrow)
+        # Reverse sort next time
+        self.tree.heading(col, command=lambda: self.sort_tree_column(col, not reverse))
+
+    def _unplace_sorted_row(self, name):
+        """Drop a row's key from the sorted keys; returns where it was"""
+        position = bisect_left(self.sorted_rows, self._sort_key(name))
+        del self.sorted_rows[position]
+        return position
+
+    def _place_sorted_row(self, name, previous=None):
+        """Insert a row's key into the sorted keys and move its tree row to match"""
+        key = self._sort_key(name)
+        position = bisect_left(self.sorted_rows, key)
+        self.sorted_rows.insert(position, key)
+        if position == previous:
+            return  # still in the same place
+        if self.sort_reverse:
+            position = len(self.sorted_rows) - 1 - position
+        self.tree.move(self.stream_items[name], '', position)
+
     # Event handlers - These were missing from the original modular structure
     def load_csv(self):
         """Load CSV file with stream data"""
@@ -375,28 +563,63 @@ class MainTab:
         )
 
         if file_path:
+            self.cancel_csv_load()
             self.base_ui.csv_data.clear()
-            self.csv_tree.delete(*self.csv_tree.get_children())
-            
-            try:
-                with open(file_path, newline='', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    for row in reader:
-                        name = row.get('name', '')
-                        url = row.get('url', '')
-                        if name and url:
-                            self.base_ui.csv_data.append({'name': name, 'url': url})
-                            self.csv_tree.insert('', 'end', text=name, values=(url,))
-
-                self.csv_label.config(
-                    text=f"Loaded: {len(self.base_ui.csv_data)} streams from {os.path.basename(file_path)}"
-                )
-                self.logger.log_to_console(f"Loaded {len(self.base_ui.csv_data)} streams from {file_path}")
-                
-            except Exception as e:
-                self.csv_label.config(text="Error loading CSV")
-                self.logger.log_to_console(f"Error loading CSV: {e}")
-                messagebox.showerror("Error", f"Could not load CSV file:\n{e}")
+            self.stream_index.build(self.base_ui.csv_data)
+            self.filter_streams()
+
+            # Parse on a worker; _pump_csv_load moves batches into csv_data on the Tk thread
+            self.csv_loader = CatalogLoader(file_path, batch_rows=self.load_batch_rows,
+                                            cache=self.catalog_cache,
+                                            search_keys=self.stream_index.keys_for).start()
+            self.csv_label.config(text=f"Loading {os.path.basename(file_path)}...")
+            self.cancel_load_button.pack(side='left', after=self.csv_label)
+            self.base_ui.root.after(self.load_interval, self._pump_csv_load, self.csv_loader)
+
+    def cancel_csv_load(self):
+        """Stop a running CSV load; streams read so far stay in the list"""
+        if self.csv_loader is not None:
+            self.csv_loader.cancel()
+
+    def _pump_csv_load(self, loader):
+        """after() tick: take loaded batches for up to load_budget ms, then show progress"""
+        if loader is not self.csv_loader:
+            return  # replaced by a newer load
+        deadline = time.monotonic() + self.load_budget / 1000
+        added = False
+        while time.monotonic() < deadline:
+            batch = loader.get_batch()
+            if batch is None:
+                break
+            self.base_ui.csv_data.extend_columns(batch)
+            # Indexed per batch, so rows are searchable right away; the loader already built the keys
+            self.stream_index.sync(batch.get(SEARCH_KEYS))
+            added = True
+        if added:
+            self.refresh_streams()
+
+        file_name = os.path.basename(loader.path)
+        count = len(self.base_ui.csv_data)
+        if not (loader.finished and loader.queue.empty()):
+            self.csv_label.config(text=f"Loading: {count} streams ({loader.progress:.0%}) from {file_name}")
+            self.base_ui.root.after(1 if added else self.load_interval, self._pump_csv_load, loader)
+            return
+
+        self.csv_loader = None
+        self.cancel_load_button.pack_forget()
+        if self.catalog_sort is not None:
+            self.filter_streams()
+        if loader.error is not None:
+            self.csv_label.config(text="Error loading CSV")
+            self.logger.log_to_console(f"Error loading CSV: {loader.error}")
+            messagebox.showerror("Error", f"Could not load CSV file:\n{loader.error}")
+        elif loader.cancelled:
+            self.csv_label.config(text=f"Cancelled: {count} streams from {file_name}")
+            self.logger.log_to_console(f"Cancelled loading {loader.path} after {count} streams")
+        else:
+            source = " (cached)" if loader.from_cache else ""
+            self.csv_label.config(text=f"Loaded: {count} streams from {file_name}{source}")
+            self.logger.log_to_console(f"Loaded {count} streams from {loader.path}{source}")
 
     def add_manual_link(self):
         """Add a manual stream link"""
@@ -409,7 +632,7 @@ class MainTab:
             return
 
         self.base_ui.csv_data.append({'name': name, 'url': url})
-        self.csv_tree.insert('', 'end', text=name, values=(url,))
+        self.filter_streams()
         self.logger.log_to_console(f"Added manual stream: {name}")
 
     def set_output_folder(self):
@@ -437,35 +660,54 @@ class MainTab:
         except Exception as e:
             self.logger.log_to_console(f"Error opening folder: {e}")
 
+    def schedule_filter(self, *args):
+        """Filter once typing pauses for search_delay ms"""
+        if self._search_job is not None:
+            self.base_ui.root.after_cancel(self._search_job)
+        self._search_job = self.base_ui.root.after(self.search_delay, self.filter_streams)
+
     def filter_streams(self, *args):
         """Filter streams based on search text"""
-        search_text = self.base_ui.search_var.get().lower()
-        
-        # Clear and repopulate tree
-        self.csv_tree.delete(*self.csv_tree.get_children())
-        for item in self.base_ui.csv_data:
-            name = item['name']
-            url = item['url']
-            if search_text in name.lower() or search_text in url.lower():
-                self.csv_tree.insert('', 'end', text=name, values=(url,))
+        if self._search_job is not None:
+            self.base_ui.root.after_cancel(self._search_job)
+            self._search_job = None
+
+        # Point the virtual list at the matching rows (no Tk items are created per row);
+        # the index picks up rows appended to csv_data and narrows refined queries
+        self._shown_query = self.base_ui.search_var.get()
+        self.csv_list.set_items(self.stream_index.results(self._shown_query, self.catalog_sort))
+
+    def refresh_streams(self):
+        """Show rows appended to csv_data without resetting scroll position or selection"""
+        if self.catalog_sort is not None:
+            return  # appended rows would land mid-list; the sorted view is rebuilt when loading ends
+        self.csv_list.refresh(self.stream_index.results(self._shown_query))
+
+    def sort_catalog_column(self, field, reverse):
+        """Sort the Available Streams list by name or URL (the index ranks rows once per catalog)"""
+        self.catalog_sort = (field, reverse)
+        for other, (column, text) in CATALOG_HEADINGS.items():
+            arrow = (' ▼' if reverse else ' ▲') if other == field else ''
+            self.csv_tree.heading(column, text=text + arrow)
+        column = CATALOG_HEADINGS[field][0]
+        self.csv_tree.heading(column, command=lambda: self.sort_catalog_column(field, not reverse))
+        self.filter_streams()
 
     def add_selected(self):
         """Add selected streams to download list"""
-        selected = self.csv_tree.selection()
+        selected = self.csv_list.selected_items()
         if not selected:
             messagebox.showwarning("Warning", "Please select streams to add")
             return
 
         added_count = 0
         for item in selected:
-            name = self.csv_tree.item(item)['text']
-            url = self.csv_tree.item(item)['values'][0]
+            name = item['name']
+            url = item['url']
             delay = float(self.base_ui.default_delay.get())
             
             if self.downloader.add_stream(name, url, delay):
-                self.tree.insert('', 'end', text=name, 
-                               values=('Stopped', delay, '0', '0'), 
-                               tags=('Stopped',))
+                self.add_stream_row(name, delay)
                 added_count += 1
 
         if added_count > 0:
@@ -476,7 +718,7 @@ class MainTab:
                 self.logger.log_to_console("Auto-start enabled - starting streams automatically")
                 # Start all newly added streams
                 for item in selected:
-                    name = self.csv_tree.item(item)['text']
+                    name = item['name']
                     if name in self.downloader.streams:
                         self.downloader.start_stream(name)
 
@@ -486,30 +728,6 @@ class MainTab:
         # based on the checkbox state if needed
         pass
 
-    def sort_tree_column(self, col, reverse):
-        """Sort tree by column"""
-        try:
-            # Get all items from the tree
-            items = [(self.tree.set(item, col), item) for item in self.tree.get_children('')]
-            
-            # Sort items
-            if col == '#0':  # Name column
-                items.sort(key=lambda x: x[0].lower(), reverse=reverse)
-            elif col in ['Delay', 'Restart']:  # Numeric columns
-                items.sort(key=lambda x: float(x[0]) if x[0].replace('.', '').isdigit() else 0, reverse=reverse)
-            else:  # String columns
-                items.sort(key=lambda x: x[0].lower(), reverse=reverse)
-            
-            # Rearrange items in sorted positions
-            for index, (val, item) in enumerate(items):
-                self.tree.move(item, '', index)
-            
-            # Reverse sort next time
-            self.tree.heading(col, command=lambda: self.sort_tree_column(col, not reverse))
-            
-        except Exception as e:
-            self.logger.log_to_console(f"Error sorting column {col}: {e}")
-
     def create_tooltip(self, widget, text):
         """Create a tooltip for a widget"""
         def show_tooltip(event):
@@ -577,7 +795,7 @@ class MainTab:
             if name in self.downloader.streams:
                 self.downloader.stop_stream(name)
                 del self.downloader.streams[name]
-                self.tree.delete(item)
+                self.remove_stream_row(name)
 
         self.logger.log_to_console(f"Removed {len(selected)} streams")
 
@@ -607,6 +825,30 @@ class MainTab:
                 if name in self.downloader.streams:
                     self.downloader.set_delay(name, delay)
 
+    def set_log_level(self):
+        """Override the minimum log level of the selected streams"""
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Warning", "Please select streams to set the log level for")
+            return
+
+        log_filter = self.logger.log_filter
+        level = simpledialog.askstring(
+            "Log Level",
+            "Minimum level (debug, info, warning, error)\n"
+            f"Leave empty to use the global level ({log_filter.level}):",
+            initialvalue=log_filter.get_stream_level(self.tree.item(selected[0])['text']) or ""
+        )
+        if level is None:
+            return
+        level = level.strip().lower() or None
+        if level is not None and level not in LEVEL_RANK:
+            messagebox.showerror("Error", f"Unknown log level: {level}")
+            return
+        for item in selected:
+            log_filter.set_stream_level(self.tree.item(item)['text'], level)
+        self.logger.log_to_console(f"Log level for {len(selected)} stream(s) set to {level or 'global'}")
+
     def save_download_list(self):
         """Save current download list to JSON"""
         file_path = filedialog.asksaveasfilename(
@@ -645,8 +887,7 @@ class MainTab:
                     data = json.load(f)
 
                 # Clear current list
-                for item in self.tree.get_children():
-                    self.tree.delete(item)
+                self.clear_stream_rows()
                 self.downloader.streams.clear()
 
                 # Load new data
@@ -655,31 +896,13 @@ class MainTab:
                     url = item['url']
                     delay = item.get('delay', 1)
                     
-                    self.downloader.add_stream(name, url, delay)
-                    self.tree.insert('', 'end', text=name, 
-                                   values=('Stopped', delay, '0', '0'), 
-                                   tags=('Stopped',))
+                    if self.downloader.add_stream(name, url, delay):
+                        self.add_stream_row(name, delay)
 
                 self.logger.log_to_console(f"Download list loaded from {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Could not load download list:\n{e}")
 
-    def sort_tree_column(self, col, reverse):
-        """Sort tree by column"""
-        data = [(self.tree.set(child, col), child) for child in self.tree.get_children('')]
-        
-        # Handle numeric sorting for delay and restart columns
-        if col in ('Delay', 'Restart'):
-            data.sort(key=lambda x: float(x[0]) if x[0].replace('.', '').isdigit() else 0, reverse=reverse)
-        else:
-            data.sort(reverse=reverse)
-
-        for index, (val, child) in enumerate(data):
-            self.tree.move(child, '', index)
-
-        # Toggle sort direction for next click
-        self.tree.heading(col, command=lambda: self.sort_tree_column(col, not reverse))
-
     def create_context_menus(self):
         """Create context menus for trees"""
         # Context menu for download tree
@@ -687,6 +910,7 @@ class MainTab:
         self.download_context_menu.add_command(label="▶️ Start", command=self.start_stream)
         self.download_context_menu.add_command(label="⏹️ Stop", command=self.stop_stream)
         self.download_context_menu.add_command(label="🔄 Restart", command=self.restart_stream)
+        self.download_context_menu.add_command(label="🔇 Log Level...", command=self.set_log_level)
         self.download_context_menu.add_separator()
         self.download_context_menu.add_command(label="🗑️ Remove", command=self.remove_stream)
         self.download_context_menu.add_separator()
@@ -739,18 +963,18 @@ class MainTab:
 
     def copy_csv_name(self):
         """Copy selected CSV stream name to clipboard"""
-        selected = self.csv_tree.selection()
+        selected = self.csv_list.selected_items()
         if selected:
-            name = self.csv_tree.item(selected[0])['text']
+            name = selected[0]['name']
             self.base_ui.root.clipboard_clear()
             self.base_ui.root.clipboard_append(name)
             self.logger.log_to_console(f"Copied CSV name: {name}")
 
     def copy_csv_url(self):
         """Copy selected CSV stream URL to clipboard"""
-        selected = self.csv_tree.selection()
+        selected = self.csv_list.selected_items()
         if selected:
-            url = self.csv_tree.item(selected[0])['values'][0]
+            url = selected[0]['url']
             self.base_ui.root.clipboard_clear()
             self.base_ui.root.clipboard_append(url)
             self.logger.log_to_console(f"Copied CSV URL: {url}")
@@ -795,11 +1019,8 @@ class MainTab:
 
     def start_all_streams(self):
         """Start all stopped streams"""
-        stopped_streams = []
-        for item in self.tree.get_children():
-            name = self.tree.item(item)['text']
-            if name in self.downloader.streams and self.downloader.streams[name]['state'] == 'Stopped':
-                stopped_streams.append(name)
+        stopped_streams = [name for name in self.stream_items
+                           if name in self.downloader.streams and self.downloader.streams[name]['state'] == 'Stopped']
         
         if not stopped_streams:
             messagebox.showinfo("Info", "No stopped streams to start")
@@ -822,11 +1043,8 @@ class MainTab:
 
     def stop_all_streams(self):
         """Stop all running streams"""
-        running_streams = []
-        for item in self.tree.get_children():
-            name = self.tree.item(item)['text']
-            if name in self.downloader.streams and self.downloader.streams[name]['state'] == 'Running':
-                running_streams.append(name)
+        running_streams = [name for name in self.stream_items
+                           if name in self.downloader.streams and self.downloader.streams[name]['state'] == 'Running']
         
         if not running_streams:
             messagebox.showinfo("Info", "No running streams to stop")
@@ -839,15 +1057,10 @@ class MainTab:
         self.logger.log_to_console(f"Stopped {len(running_streams)} streams")
 
     def update_stream_counters(self):
-        """Update the stream counters in the header"""
+        """Update the stream counters in the header (from the incrementally kept state totals)"""
         try:
-            total_count = len(self.tree.get_children())
-            active_count = 0
-            
-            for item in self.tree.get_children():
-                name = self.tree.item(item)['text']
-                if name in self.downloader.streams and self.downloader.streams[name]['state'] == 'Running':
-                    active_count += 1
+            total_count = len(self.stream_items)
+            active_count = self.state_counts['Running']
             
             if hasattr(self, 'active_count_label'):
                 self.active_count_label.config(text=f"Active: {active_count}")
@@ -858,16 +1071,14 @@ class MainTab:
 
     def on_csv_double_click(self, event):
         """Handle double-click on CSV tree"""
-        selected = self.csv_tree.selection()
-        if selected:
-            name = self.csv_tree.item(selected[0])['text']
-            url = self.csv_tree.item(selected[0])['values'][0]
+        item = self.csv_list.item_at(event.y)
+        if item:
+            name = item['name']
+            url = item['url']
             delay = float(self.base_ui.default_delay.get())
             
             if self.downloader.add_stream(name, url, delay):
-                self.tree.insert('', 'end', text=name, 
-                               values=('Stopped', delay, '0', '0'), 
-                               tags=('Stopped',))
+                self.add_stream_row(name, delay)
 
     def on_tree_double_click(self, event):
         """Handle double-click on download tree"""
@@ -8,9 +8,17 @@ import os
 import json
 from aero_style import AeroStyle
 from ui.ui_components import AeroComponents
+from log_filter import LEVEL_RANK
+
+# Progress line sampling choices -> LogFilter.progress_interval
+PROGRESS_LOG_OPTIONS = {'All': None, 'Every 10s': 10.0, 'Every 60s': 60.0, 'None': 0}
 
 class SettingsTab:
-    def __init__(self, parent, base_ui, logger):
+    def __init__(self, parent, base_ui, logger, defer_ui=False):
+        """
+        Settings are loaded and applied right away; with defer_ui the widgets are
+        only created by build() (e.g. when the tab is first selected).
+        """
         self.parent = parent
         self.base_ui = base_ui
         self.logger = logger
@@ -21,9 +29,23 @@ class SettingsTab:
         self.auto_start = tk.BooleanVar()
         self.minimize_to_tray = tk.BooleanVar()
         self.check_updates = tk.BooleanVar(value=True)
+        self.log_level = tk.StringVar(value='info')
+        self.progress_log = tk.StringVar(value='Every 10s')
+        self.log_level.trace_add('write', self.apply_log_filter)
+        self.progress_log.trace_add('write', self.apply_log_filter)
+        self.download_path_var = tk.StringVar(value=self.base_ui.output_folder)
+        self.streamlink_path_var = tk.StringVar()
+        self.built = False
         
-        self.setup_settings_tab()
         self.load_settings()
+        if not defer_ui:
+            self.build()
+
+    def build(self):
+        """Create the tab's widgets (once)"""
+        if not self.built:
+            self.built = True
+            self.setup_settings_tab()
 
     def setup_settings_tab(self):
         """Setup the settings tab UI"""
@@ -157,7 +179,6 @@ class SettingsTab:
         folder_select_frame = tk.Frame(download_frame, bg=AeroStyle.GLASS_BACKGROUND)
         folder_select_frame.pack(fill='x', pady=5)
 
-        self.download_path_var = tk.StringVar(value=self.base_ui.output_folder)
         download_entry = self.components.create_styled_entry(
             folder_select_frame, textvariable=self.download_path_var, width=50
         )
@@ -178,7 +199,6 @@ class SettingsTab:
         exe_select_frame = tk.Frame(streamlink_frame, bg=AeroStyle.GLASS_BACKGROUND)
         exe_select_frame.pack(fill='x', pady=5)
 
-        self.streamlink_path_var = tk.StringVar()
         streamlink_entry = self.components.create_styled_entry(
             exe_select_frame, textvariable=self.streamlink_path_var, width=50
         )
@@ -228,6 +248,40 @@ class SettingsTab:
             'secondary'
         ).pack(anchor='w')
 
+        # Process output filtering (applied before lines are formatted or stored)
+        log_filter_frame = tk.Frame(advanced_section, bg=AeroStyle.GLASS_BACKGROUND)
+        log_filter_frame.pack(fill='x', padx=15, pady=(0, 10))
+
+        self.components.create_styled_label(log_filter_frame, "Stream log level:").pack(side='left')
+        ttk.Combobox(log_filter_frame,
+                     textvariable=self.log_level,
+                     values=list(LEVEL_RANK),
+                     width=9,
+                     style='Aero.TCombobox',
+                     state='readonly').pack(side='left', padx=(5, 15))
+
+        self.components.create_styled_label(log_filter_frame, "Progress lines:").pack(side='left')
+        ttk.Combobox(log_filter_frame,
+                     textvariable=self.progress_log,
+                     values=list(PROGRESS_LOG_OPTIONS),
+                     width=10,
+                     style='Aero.TCombobox',
+                     state='readonly').pack(side='left', padx=5)
+
+        # Sampling profiler controls
+        profiler_frame = tk.Frame(advanced_section, bg=AeroStyle.GLASS_BACKGROUND)
+        profiler_frame.pack(fill='x', padx=15, pady=(0, 15))
+
+        self.profiler_button = self.components.create_gradient_button(
+            profiler_frame, "🔬 Start Profiler", self.toggle_profiler
+        )
+        self.profiler_button.pack(side='left')
+
+        self.profiler_status = self.components.create_styled_label(
+            profiler_frame, "Samples all threads and writes a flamegraph + summary on stop", 'secondary'
+        )
+        self.profiler_status.pack(side='left', padx=10)
+
     def create_about_section(self, parent):  # Fixed: Added parent parameter
         """Create about section"""
         about_section = self.components.create_glass_frame(parent)
@@ -320,6 +374,34 @@ class SettingsTab:
             # Ignore errors for widgets that don't support color changes
             pass
 
+    def toggle_profiler(self):
+        """Start or stop the sampling profiler"""
+        profiler = getattr(self.base_ui, 'profiler', None)
+        if profiler is None:
+            return
+
+        try:
+            report = profiler.toggle()
+        except Exception as e:
+            self.logger.log_to_console(f"Error toggling profiler: {e}")
+            messagebox.showerror("Error", f"Profiler error:\n{e}")
+            return
+
+        if profiler.running:
+            self.profiler_button.config(text="⏹️ Stop Profiler")
+            self.profiler_status.config(text="Profiling all threads...")
+        else:
+            self.profiler_button.config(text="🔬 Start Profiler")
+            if report:
+                self.profiler_status.config(text=f"Report: {report[1]}")
+                messagebox.showinfo("Profiler", f"Profile written to:\n{report[0]}\n{report[1]}")
+
+    def apply_log_filter(self, *args):
+        """Push the log level / progress sampling choice to the logger's source filter"""
+        log_filter = self.logger.log_filter
+        log_filter.set_level(self.log_level.get())
+        log_filter.progress_interval = PROGRESS_LOG_OPTIONS.get(self.progress_log.get(), 10.0)
+
     def preview_theme(self):
         """Preview current theme"""
         messagebox.showinfo("Theme Preview", "Current theme: Aero Glass Light")
@@ -350,7 +432,9 @@ class SettingsTab:
             'minimize_to_tray': self.minimize_to_tray.get(),
             'check_updates': self.check_updates.get(),
             'download_folder': self.download_path_var.get(),
-            'streamlink_path': self.streamlink_path_var.get()
+            'streamlink_path': self.streamlink_path_var.get(),
+            'log_level': self.log_level.get(),
+            'progress_log': self.progress_log.get()
         }
         
         try:
@@ -376,6 +460,10 @@ class SettingsTab:
                 self.auto_start.set(settings.get('auto_start', False))
                 self.minimize_to_tray.set(settings.get('minimize_to_tray', False))
                 self.check_updates.set(settings.get('check_updates', True))
+                if settings.get('log_level') in LEVEL_RANK:
+                    self.log_level.set(settings['log_level'])
+                if settings.get('progress_log') in PROGRESS_LOG_OPTIONS:
+                    self.progress_log.set(settings['progress_log'])
                 
                 if settings.get('download_folder'):
                     self.download_path_var.set(settings['download_folder'])
@@ -411,6 +499,8 @@ class SettingsTab:
             self.auto_start.set(False)
             self.minimize_to_tray.set(False)
             self.check_updates.set(True)
+            self.log_level.set('info')
+            self.progress_log.set('Every 10s')
             self.download_path_var.set(os.path.join(os.path.expanduser("~"), "Documents", "YTS", "M3U8"))
             self.streamlink_path_var.set("")
             
@@ -0,0 +1,221 @@
+# ui/ui_virtual_list.py
+"""
+Virtual list mode for a Treeview - only the visible rows exist as Tk items
+and are reused while scrolling; items and selection live in the Python model
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTreeList:
+    def __init__(self, tree, scrollbar, formatter, row_height=None):
+        """
+        :param tree: flat ttk.Treeview used as the viewport
+        :param scrollbar: its vertical scrollbar (driven by the model, not the widget)
+        :param formatter: function(item) -> (text, values) for one row
+        :param row_height: pixel height of a row (read from the tree's style if None)
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formatter = formatter
+        self.row_height = row_height or self._style_row_height()
+
+        self.items = []
+        self.first = 0           # model index shown in the top row
+        self.pool = []           # reused Treeview iids, one per visible row
+        self.slots = {}          # iid -> row position
+        self.attached = 0        # pool rows currently shown
+        self.selected = set()    # selected model indices
+        self.anchor = None       # model index shift-selection extends from
+        self.cursor = None       # model index with keyboard focus
+
+        tree.delete(*tree.get_children())
+        tree.configure(yscrollcommand='', selectmode='extended')
+        scrollbar.configure(command=self.yview)
+
+        tree.bind('<Configure>', self._on_resize, add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        tree.bind('<Button-5>', lambda e: self.scroll(3))
+        tree.bind('<ButtonPress-1>', self._on_click)
+        tree.bind('<Control-ButtonPress-1>', lambda e: self._on_click(e, toggle=True))
+        tree.bind('<Shift-ButtonPress-1>', lambda e: self._on_click(e, extend=True))
+        tree.bind('<Up>', lambda e: self._move_cursor(-1))
+        tree.bind('<Down>', lambda e: self._move_cursor(1))
+        tree.bind('<Shift-Up>', lambda e: self._move_cursor(-1, extend=True))
+        tree.bind('<Shift-Down>', lambda e: self._move_cursor(1, extend=True))
+        tree.bind('<Prior>', lambda e: self._move_cursor(-max(1, len(self.pool) - 1)))
+        tree.bind('<Next>', lambda e: self._move_cursor(max(1, len(self.pool) - 1)))
+        tree.bind('<Home>', lambda e: self._move_cursor(-len(self.items)))
+        tree.bind('<End>', lambda e: self._move_cursor(len(self.items)))
+        tree.bind('<Control-a>', self._select_all)
+
+    def _style_row_height(self):
+        style = self.tree.cget('style') or 'Treeview'
+        try:
+            return int(ttk.Style().lookup(style, 'rowheight') or 20)
+        except (ValueError, tk.TclError):
+            return 20
+
+    # ----------------- Model -----------------
+    def set_items(self, items):
+        """Show a new sequence of items (selection is cleared)"""
+        self.items = items
+        self.first = 0
+        self.selected.clear()
+        self.anchor = self.cursor = None
+        self.render()
+
+    def refresh(self, items=None):
+        """
+        Re-render after rows were appended - either in place or as a new sequence that
+        extends the current one (e.g. the same search over a growing catalog) - keeping
+        the scroll position and selection
+        """
+        if items is not None:
+            self.items = items
+        self.render()
+
+    def __len__(self):
+        return len(self.items)
+
+    # ----------------- Selection -----------------
+    def selected_indices(self):
+        return sorted(i for i in self.selected if i < len(self.items))
+
+    def selected_items(self):
+        """Selected items in model order"""
+        return [self.items[i] for i in self.selected_indices()]
+
+    def clear_selection(self):
+        self.selected.clear()
+        self.render()
+
+    def index_at(self, y):
+        """Model index of the row at widget y, or None"""
+        slot = self.slots.get(self.tree.identify_row(y))
+        if slot is None or self.first + slot >= len(self.items):
+            return None
+        return self.first + slot
+
+    def item_at(self, y):
+        index = self.index_at(y)
+        return None if index is None else self.items[index]
+
+    def _on_click(self, event, toggle=False, extend=False):
+        if self.tree.identify_region(event.x, event.y) not in ('tree', 'cell'):
+            return None  # headings, separators: default handling
+        self.tree.focus_set()
+        index = self.index_at(event.y)
+        if index is None:
+            return 'break'
+        if extend and self.anchor is not None:
+            low, high = sorted((self.anchor, index))
+            self.selected = set(range(low, high + 1))
+        elif toggle:
+            self.selected ^= {index}
+            self.anchor = index
+        else:
+            self.selected = {index}
+            self.anchor = index
+        self.cursor = index
+        self.render()
+        return 'break'
+
+    def _move_cursor(self, delta, extend=False):
+        if not self.items:
+            return 'break'
+        start = self.cursor if self.cursor is not None else self.first
+        index = max(0, min(len(self.items) - 1, start + delta))
+        if extend and self.anchor is not None:
+            low, high = sorted((self.anchor, index))
+            self.selected = set(range(low, high + 1))
+        else:
+            self.selected = {index}
+            self.anchor = index
+        self.cursor = index
+        self.see(index)
+        return 'break'
+
+    def _select_all(self, event=None):
+        self.selected = set(range(len(self.items)))
+        self.render()
+        return 'break'
+
+    # ----------------- Scrolling -----------------
+    def yview(self, *args):
+        """Scrollbar command"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            step = len(self.pool) if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self.render()
+
+    def scroll(self, rows):
+        self.first += rows
+        self.render()
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        steps = -event.delta // 120 if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        return self.scroll(steps * 3)
+
+    def see(self, index):
+        """Scroll so the item at model index is visible"""
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + len(self.pool):
+            self.first = index - len(self.pool) + 1
+        self.render()
+
+    # ----------------- Rendering -----------------
+    def _on_resize(self, event):
+        # One row's worth of height is taken by the heading
+        rows = max(1, event.height // self.row_height - 1)
+        if rows != len(self.pool):
+            self._resize_pool(rows)
+            self.render()
+
+    def _resize_pool(self, rows):
+        for slot in range(self.attached, len(self.pool)):
+            self.tree.move(self.pool[slot], '', slot)
+        while len(self.pool) > rows:
+            iid = self.pool.pop()
+            del self.slots[iid]
+            self.tree.delete(iid)
+        while len(self.pool) < rows:
+            iid = self.tree.insert('', 'end')
+            self.slots[iid] = len(self.pool)
+            self.pool.append(iid)
+        self.attached = len(self.pool)
+
+    def render(self):
+        """Fill the pool rows from the model starting at self.first"""
+        total = len(self.items)
+        visible = len(self.pool)
+        self.first = max(0, min(self.first, total - visible))
+
+        shown = min(visible, total - self.first)
+        for slot in range(shown):
+            text, values = self.formatter(self.items[self.first + slot])
+            self.tree.item(self.pool[slot], text=text, values=values)
+        # Rows past the end of the model are detached rather than blanked
+        if shown < self.attached:
+            self.tree.detach(*self.pool[shown:self.attached])
+        elif shown > self.attached:
+            for slot in range(self.attached, shown):
+                self.tree.move(self.pool[slot], '', slot)
+        self.attached = shown
+
+        self.tree.selection_set([self.pool[slot] for slot in range(shown) if self.first + slot in self.selected])
+        if self.cursor is not None and 0 <= self.cursor - self.first < shown:
+            self.tree.focus(self.pool[self.cursor - self.first])
+        self.tree.yview_moveto(0)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -6,24 +6,28 @@ such as merging MP4 files into a single video using FFmpeg.
 
 import os
 import subprocess
+import threading
+from collections import deque
 
 class VideoTools:
-    def __init__(self, logger=None, status_updater=None, file_picker=None, messagebox=None):
+    def __init__(self, logger=None, status_updater=None, file_picker=None):
         """
         :param logger: function for logging messages (e.g., print or UI log)
         :param status_updater: function to update UI status label
         :param file_picker: function to select a folder (UI-specific)
-        :param messagebox: UI messagebox module (optional)
         """
         self.log = logger if logger else print
         self.update_status = status_updater if status_updater else lambda msg: None
         self.pick_folder = file_picker
-        self.mb = messagebox
 
-    def merge_videos(self, folder=None):
+    def merge_videos(self, folder=None, progress=None):
         """
         Merge multiple MP4 files in a folder into a single video using ffmpeg.
         If folder is not provided, and file_picker is set, prompts user for one.
+        Returns a result message (None if no folder was chosen) and raises on errors.
+
+        :param progress: optional callback receiving progress(seconds=..., bytes_read=..., message=...)
+                         from ffmpeg's -progress output; it may raise to cancel the merge
         """
         # Ask for folder if not provided
         if folder is None:
@@ -33,76 +37,91 @@ class VideoTools:
                 raise ValueError("No folder provided and no picker available")
 
         if not folder:
-            return
-
-        try:
-            original_dir = os.getcwd()
-            os.chdir(folder)
+            return None
 
-            mp4_files = [f for f in os.listdir(folder) if f.lower().endswith('.mp4')]
-            if not mp4_files:
-                msg = "No .mp4 files found in the selected folder."
-                self.update_status(msg)
-                if self.mb:
-                    self.mb.showerror("Error", msg)
-                return
+        mp4_files = sorted(f for f in os.listdir(folder) if f.lower().endswith('.mp4'))
+        if not mp4_files:
+            msg = "No .mp4 files found in the selected folder."
+            self.update_status(msg)
+            raise ValueError(msg)
 
-            mp4_files.sort()
-            output_name = os.path.splitext(mp4_files[0])[0] + "_.mp4"
-            self.update_status(f"Found {len(mp4_files)} MP4 files. Starting merge...")
-            self.log(f"Video Tools: Starting merge of {len(mp4_files)} files")
+        output_name = os.path.splitext(mp4_files[0])[0] + "_.mp4"
+        output_path = os.path.join(folder, output_name)
+        list_path = os.path.join(folder, "input.txt")
+        self.update_status(f"Found {len(mp4_files)} MP4 files. Starting merge...")
+        self.log(f"Video Tools: Starting merge of {len(mp4_files)} files")
 
-            # Write input list for ffmpeg
-            with open("input.txt", "w", encoding='utf-8') as f:
-                for file in mp4_files:
-                    f.write(f"file '{file}'\n")
+        # Write input list for ffmpeg (absolute paths, so no working directory change is needed)
+        with open(list_path, "w", encoding='utf-8') as f:
+            for file in mp4_files:
+                escaped = os.path.join(folder, file).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
 
-            # Merge with ffmpeg
-            try:
-                self.update_status("Merging videos with FFmpeg...")
-                subprocess.run(
-                    ["ffmpeg", "-f", "concat", "-safe", "0", "-i", "input.txt", "-c", "copy", output_name],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                msg = f"Videos merged successfully: {output_name}"
-                self.log(f"Video Tools: {msg}")
-                self.update_status(msg)
-                if self.mb:
-                    self.mb.showinfo("Success", msg)
-
-            except subprocess.CalledProcessError as e:
-                err_msg = f"FFmpeg Error: Failed to merge videos.\n{e}"
-                if e.stderr:
-                    err_msg += f"\n\nFFmpeg Output:\n{e.stderr}"
-                self.update_status(err_msg)
-                self.log(f"Video Tools: {err_msg}")
-                if self.mb:
-                    self.mb.showerror("FFmpeg Error", err_msg)
-                return
+        try:
+            self.update_status("Merging videos with FFmpeg...")
+            self._run_ffmpeg(
+                ["ffmpeg", "-nostdin", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy",
+                 "-progress", "pipe:1", "-nostats", output_path],
+                progress
+            )
+        except FileNotFoundError:
+            err_msg = "FFmpeg not found. Please install FFmpeg and ensure it's in your system PATH."
+            self.update_status(err_msg)
+            self.log(f"Video Tools: {err_msg}")
+            raise RuntimeError(err_msg) from None
+        except subprocess.CalledProcessError as e:
+            err_msg = f"FFmpeg Error: Failed to merge videos.\n{e}"
+            if e.stderr:
+                err_msg += f"\n\nFFmpeg Output:\n{e.stderr}"
+            self.update_status(err_msg)
+            self.log(f"Video Tools: {err_msg}")
+            raise RuntimeError(err_msg) from None
+        finally:
+            # Cleanup
+            if os.path.exists(list_path):
+                os.remove(list_path)
 
-            except FileNotFoundError:
-                err_msg = "FFmpeg not found. Please install FFmpeg and ensure it's in your system PATH."
-                self.update_status(err_msg)
-                self.log(f"Video Tools: {err_msg}")
-                if self.mb:
-                    self.mb.showerror("FFmpeg Not Found", err_msg)
-                return
+        msg = f"Videos merged successfully: {output_name}"
+        self.log(f"Video Tools: {msg}")
+        self.update_status(msg)
+        return msg
 
-            except Exception as e:
-                err_msg = f"Unexpected error during video merge: {str(e)}"
-                self.update_status(err_msg)
-                self.log(f"Video Tools: {err_msg}")
-                if self.mb:
-                    self.mb.showerror("Error", err_msg)
-                return
+    def _run_ffmpeg(self, cmd, progress=None):
+        """
+        Run ffmpeg, feeding its -progress key=value output to `progress`.
+        A cancelled merge stops ffmpeg and removes the partial output file.
+        """
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, encoding='utf-8', errors='replace')
+        # Keep only the tail of stderr; concat can warn once per packet
+        stderr_tail = deque(maxlen=50)
+        stderr_reader = threading.Thread(target=lambda: stderr_tail.extend(process.stderr), daemon=True)
+        stderr_reader.start()
 
+        completed = False
+        try:
+            values = {}
+            for line in process.stdout:
+                key, _, value = line.strip().partition('=')
+                values[key] = value
+                if key != 'progress' or progress is None:
+                    continue
+                # One block per update, ending with progress=continue|end
+                seconds = None
+                if values.get('out_time_us', 'N/A').isdigit():
+                    seconds = int(values['out_time_us']) / 1_000_000
+                size = values.get('total_size', '')
+                progress(seconds=seconds, bytes_read=int(size) if size.isdigit() else None,
+                         message="Merging")
+            process.wait()
+            completed = True
         finally:
-            # Cleanup
-            if os.path.exists("input.txt"):
-                os.remove("input.txt")
-            try:
-                os.chdir(original_dir)
-            except Exception:
-                pass
+            if not completed:
+                process.kill()
+                process.wait()
+                if os.path.exists(cmd[-1]):
+                    os.remove(cmd[-1])
+            stderr_reader.join(timeout=5)
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr="".join(stderr_tail))